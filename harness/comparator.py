@@ -100,24 +100,26 @@ class ResultComparator:
                 expected_swhid_sha256=expected_swhid_sha256
             )
         
-        # Get all SWHIDs, grouped by version
-        v1_swhids = [r.swhid for r in supported_results.values() 
-                     if r.swhid and r.version == 1]
-        v2_swhids = [r.swhid for r in supported_results.values() 
-                     if r.swhid and r.version == 2]
-        
-        # Check if all SWHIDs match within each version group
-        v1_match = len(set(v1_swhids)) == 1 if v1_swhids else True  # True if no v1 results
-        v2_match = len(set(v2_swhids)) == 1 if v2_swhids else True  # True if no v2 results
-        
-        all_match = v1_match and v2_match
+        # Check if all SWHIDs match within each version group, stopping at
+        # the first mismatch; a group without results matches
+        first_by_version: Dict[int, str] = {}
+        all_match = True
+        for r in supported_results.values():
+            if not r.swhid or r.version not in (1, 2):
+                continue
+            first = first_by_version.setdefault(r.version, r.swhid)
+            if r.swhid != first:
+                all_match = False
+                break
         
         # Check against expected SWHIDs if provided
         if all_match:
-            if v1_swhids and expected_swhid:
-                all_match = v1_swhids[0] == expected_swhid
-            if v2_swhids and expected_swhid_sha256:
-                all_match = all_match and (v2_swhids[0] == expected_swhid_sha256)
+            v1_swhid = first_by_version.get(1)
+            v2_swhid = first_by_version.get(2)
+            if v1_swhid and expected_swhid:
+                all_match = v1_swhid == expected_swhid
+            if v2_swhid and expected_swhid_sha256:
+                all_match = all_match and (v2_swhid == expected_swhid_sha256)
         
         return ComparisonResult(
             payload_name=payload_name,
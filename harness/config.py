@@ -170,7 +170,7 @@ class HarnessConfig(BaseModel):
         
         with open(config_file, 'r') as f:
             try:
-                raw_config = yaml.safe_load(f)
+                raw_config = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
             except yaml.YAMLError as e:
                 raise ValueError(f"Invalid YAML in configuration file: {e}")
         
@@ -17,8 +17,9 @@ import tarfile
 import shutil
 import platform
 import atexit
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import logging
@@ -44,9 +45,62 @@ from .runner import TestRunner
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# libyaml's dumper is much faster than the pure-Python one when it is built
+_YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# Results files are written in 64KiB chunks
+_RESULTS_BUFFER_SIZE = 1 << 16
+
+
+def _dumps_record(obj: Dict[str, Any]) -> bytes:
+    """Serialize one results record to a JSON line."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            # orjson rejects lone surrogates (undecodable file names); json escapes them
+            pass
+    return json.dumps(obj).encode("utf-8") + b"\n"
+
+
+def write_ndjson_results(results: HarnessResults, output_path) -> None:
+    """Write results as NDJSON, one record per line, without building the whole document."""
+    with open(output_path, 'wb', buffering=_RESULTS_BUFFER_SIZE) as f:
+        f.write(_dumps_record({"type": "run_info", **results.run.model_dump(mode="json")}))
+        for impl in results.implementations:
+            f.write(_dumps_record({"type": "implementation", **impl.model_dump(mode="json")}))
+        for test in results.tests:
+            f.write(_dumps_record({"type": "test_case", **test.model_dump(mode="json")}))
+        f.write(_dumps_record({"type": "aggregates", **results.aggregates.model_dump(mode="json")}))
+
+
+def write_json_results(results: HarnessResults, output_path) -> None:
+    """Write results in the canonical indented JSON format."""
+    data = results.model_dump(mode="json")
+    serialized = None
+    if orjson is not None:
+        try:
+            serialized = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            # orjson rejects lone surrogates (undecodable file names); json escapes them
+            pass
+    if serialized is None:
+        serialized = json.dumps(data, indent=2).encode("utf-8")
+    with open(output_path, 'wb', buffering=_RESULTS_BUFFER_SIZE) as f:
+        f.write(serialized)
+
+
 class SwhidHarness:
     """Main testing harness for SWHID implementations."""
     
+    # Thread pool shared by all tests of a run (set by run_tests)
+    _executor: Optional[ThreadPoolExecutor] = None
+    
     def __init__(self, config_path: str = "config.yaml"):
         self.config_path = config_path
         try:
@@ -93,17 +147,16 @@ class SwhidHarness:
     
     def _load_implementations(self, impl_names: Optional[List[str]] = None) -> Dict[str, SwhidImplementation]:
         """Load implementations using the discovery system."""
-        all_implementations = self.discovery.discover_implementations()
-        
         if impl_names is None:
             # Use all available implementations
-            return all_implementations
+            return self.discovery.discover_implementations()
         
-        # Filter to requested implementations
+        # Only load the requested implementations
         filtered = {}
         for name in impl_names:
-            if name in all_implementations:
-                filtered[name] = all_implementations[name]
+            impl = self.discovery.get_implementation(name)
+            if impl:
+                filtered[name] = impl
             else:
                 logger.warning(f"Implementation '{name}' not found")
         
@@ -143,6 +196,15 @@ class SwhidHarness:
             commit, tag, version, hash_algo
         )
     
+    @contextmanager
+    def _test_executor(self) -> Iterator[ThreadPoolExecutor]:
+        """Yield the run's shared thread pool, or a temporary one outside run_tests."""
+        if self._executor is not None:
+            yield self._executor
+        else:
+            with ThreadPoolExecutor(max_workers=self.config.settings.parallel_tests) as executor:
+                yield executor
+    
     def _discover_git_tests(self, repo_path: str, base_name: str, 
                             discover_branches: bool, discover_tags: bool,
                             expected_config: Optional[Dict[str, Any]] = None) -> List[ComparisonResult]:
@@ -172,7 +234,7 @@ class SwhidHarness:
                     logger.info(f"Testing branch '{branch}' as revision: {test_name}")
                     
                     results = {}
-                    with ThreadPoolExecutor(max_workers=self.config.settings.parallel_tests) as executor:
+                    with self._test_executor() as executor:
                         future_to_impl = {
                             executor.submit(self._run_single_test, impl, actual_repo_path, test_name, 
                                           category="revision", commit=branch): impl
@@ -262,7 +324,7 @@ class SwhidHarness:
                     logger.info(f"Testing annotated tag '{tag}' as release: {test_name}")
                     
                     results = {}
-                    with ThreadPoolExecutor(max_workers=self.config.settings.parallel_tests) as executor:
+                    with self._test_executor() as executor:
                         future_to_impl = {
                             executor.submit(self._run_single_test, impl, actual_repo_path, test_name, 
                                           category="release", tag=tag): impl
@@ -383,6 +445,17 @@ class SwhidHarness:
         if categories is None:
             categories = list(self.config.payloads.keys())
         
+        # One pool for the whole run rather than one per payload
+        with ThreadPoolExecutor(max_workers=self.config.settings.parallel_tests) as self._executor:
+            try:
+                return self._run_categories(categories, payloads, version, hash_algo, test_both_versions)
+            finally:
+                self._executor = None
+    
+    def _run_categories(self, categories: List[str], payloads: Optional[List[str]],
+                        version: Optional[int], hash_algo: Optional[str],
+                        test_both_versions: bool) -> List[ComparisonResult]:
+        """Run the tests of the given categories with the loaded implementations."""
         all_results = []
         
         for category in sorted(categories):  # Deterministic ordering
@@ -536,7 +609,7 @@ class SwhidHarness:
                 
                 # Run tests for all implementations and all versions
                 results = {}
-                with ThreadPoolExecutor(max_workers=self.config.settings.parallel_tests) as executor:
+                with self._test_executor() as executor:
                     futures = []
                     for impl in self.implementations.values():
                         for test_version in test_versions:
@@ -660,6 +733,9 @@ class SwhidHarness:
         # We need to work with the dict representation for YAML serialization
         config_dict = self.config.model_dump(mode='python')
         
+        # Resolve every payload first so the implementation can compute
+        # them all in one batch
+        pending = []
         for category, payloads in config_dict["payloads"].items():
             for payload in payloads:
                 payload_path = payload["path"]
@@ -688,22 +764,36 @@ class SwhidHarness:
                     else:
                         # Fallback to auto-detection for unknown categories
                         obj_type = impl.detect_object_type(payload_path)
-                    
-                    # For revision/release, note that most implementations don't support these yet
-                    # They will be skipped if not supported
-                    
-                    swhid = impl.compute_swhid(payload_path, obj_type)
-                    
-                    # Update the config with expected SWHID
-                    payload["expected_swhid"] = swhid
-                    logger.info(f"Generated expected SWHID for {payload_name}: {swhid}")
-                    
                 except Exception as e:
                     logger.error(f"Error generating expected result for {payload_name}: {e}")
+                    continue
+                
+                # For revision/release, note that most implementations don't support these yet
+                # They will be skipped if not supported
+                pending.append((payload, payload_path, obj_type))
+        
+        try:
+            swhids = impl.compute_swhid_batch([(path, obj_type) for _, path, obj_type in pending])
+        except Exception as e:
+            # Some payload failed; compute one by one to report each error
+            logger.debug(f"Batch computation failed, retrying payloads individually: {e}")
+            swhids = None
+        
+        for i, (payload, payload_path, obj_type) in enumerate(pending):
+            payload_name = payload["name"]
+            try:
+                swhid = swhids[i] if swhids is not None else impl.compute_swhid(payload_path, obj_type)
+                
+                # Update the config with expected SWHID
+                payload["expected_swhid"] = swhid
+                logger.info(f"Generated expected SWHID for {payload_name}: {swhid}")
+                
+            except Exception as e:
+                logger.error(f"Error generating expected result for {payload_name}: {e}")
         
         # Save updated config
         with open(self.config_path, 'w') as f:
-            yaml.dump(config_dict, f, default_flow_style=False)
+            yaml.dump(config_dict, f, Dumper=_YamlDumper, default_flow_style=False)
         
         # Reload config to reflect changes
         self.config = HarnessConfig.load_from_file(self.config_path)
@@ -1103,8 +1193,10 @@ class SwhidHarness:
     def print_summary(self, results: List[ComparisonResult]):
         """Print a summary of test results."""
         total_tests = len(results)
-        successful_tests = sum(1 for r in results if r.all_match)
-        failed_tests = total_tests - successful_tests
+        failed_results = [r for r in results if not r.all_match]
+        failed_tests = len(failed_results)
+        successful_tests = total_tests - failed_tests
+        success_rate = successful_tests / total_tests * 100 if total_tests else 0.0
         
         print("\n" + "=" * 50)
         print("SWHID Testing Harness Summary")
@@ -1112,50 +1204,49 @@ class SwhidHarness:
         print(f"Total Tests: {total_tests}")
         print(f"Successful: {successful_tests}")
         print(f"Failed: {failed_tests}")
-        print(f"Success Rate: {successful_tests/total_tests*100:.1f}%")
+        print(f"Success Rate: {success_rate:.1f}%")
         
         if failed_tests > 0:
             print("\nFailed Tests:")
-            for result in results:
-                if not result.all_match:
-                    print(f"\n  [FAIL] {result.payload_name}")
-                    
-                    # Show expected result if available
-                    if result.expected_swhid:
-                        print(f"    Expected: {result.expected_swhid}")
-                    
-                    # Group results by SWHID
-                    swhid_groups = {}
-                    failed_implementations = []
-                    
-                    for impl_name, test_result in result.results.items():
-                        if test_result.success:
-                            swhid = test_result.swhid
-                            if swhid not in swhid_groups:
-                                swhid_groups[swhid] = []
-                            swhid_groups[swhid].append(impl_name)
-                        else:
-                            failed_implementations.append((impl_name, test_result.error))
-                    
-                    # Show SWHID groups
-                    if len(swhid_groups) > 1:
-                        print(f"    Found {len(swhid_groups)} different SWHID groups:")
-                        for i, (swhid, impls) in enumerate(swhid_groups.items(), 1):
-                            print(f"      Group {i}: {swhid}")
-                            print(f"        Implementations: {', '.join(impls)}")
-                    elif len(swhid_groups) == 1:
-                        swhid = list(swhid_groups.keys())[0]
-                        impls = list(swhid_groups.values())[0]
-                        print(f"    All implementations agree: {swhid}")
-                        print(f"      Implementations: {', '.join(impls)}")
-                        if result.expected_swhid and swhid != result.expected_swhid:
-                            print(f"      But expected: {result.expected_swhid}")
-                    
-                    # Show failed implementations
-                    if failed_implementations:
-                        print(f"    Failed implementations:")
-                        for impl_name, error in failed_implementations:
-                            print(f"      {impl_name}: {error}")
+            for result in failed_results:
+                print(f"\n  [FAIL] {result.payload_name}")
+                
+                # Show expected result if available
+                if result.expected_swhid:
+                    print(f"    Expected: {result.expected_swhid}")
+                
+                # Group results by SWHID
+                swhid_groups = {}
+                failed_implementations = []
+                
+                for impl_name, test_result in result.results.items():
+                    if test_result.success:
+                        swhid = test_result.swhid
+                        if swhid not in swhid_groups:
+                            swhid_groups[swhid] = []
+                        swhid_groups[swhid].append(impl_name)
+                    else:
+                        failed_implementations.append((impl_name, test_result.error))
+                
+                # Show SWHID groups
+                if len(swhid_groups) > 1:
+                    print(f"    Found {len(swhid_groups)} different SWHID groups:")
+                    for i, (swhid, impls) in enumerate(swhid_groups.items(), 1):
+                        print(f"      Group {i}: {swhid}")
+                        print(f"        Implementations: {', '.join(impls)}")
+                elif len(swhid_groups) == 1:
+                    swhid = list(swhid_groups.keys())[0]
+                    impls = list(swhid_groups.values())[0]
+                    print(f"    All implementations agree: {swhid}")
+                    print(f"      Implementations: {', '.join(impls)}")
+                    if result.expected_swhid and swhid != result.expected_swhid:
+                        print(f"      But expected: {result.expected_swhid}")
+                
+                # Show failed implementations
+                if failed_implementations:
+                    print(f"    Failed implementations:")
+                    for impl_name, error in failed_implementations:
+                        print(f"      {impl_name}: {error}")
         
         print("=" * 50)
 
@@ -1202,14 +1293,13 @@ def main():
     
     # Handle list commands
     if args.list_impls:
-        impls = harness.discovery.list_available_implementations()
+        # Discovery only keeps implementations whose is_available() passed,
+        # so don't probe each one (e.g. spawn its binary) a second time
+        impls = harness.discovery.discover_implementations()
         print("Available implementations:")
-        for impl_name in sorted(impls):
-            impl = harness.discovery.get_implementation(impl_name)
-            if impl:
-                info = impl.get_info()
-                available = "[OK]" if impl.is_available() else "[FAIL]"
-                print(f"  {available} {impl_name}: {info.description} (v{info.version})")
+        for impl_name, impl in sorted(impls.items()):
+            info = impl.get_info()
+            print(f"  [OK] {impl_name}: {info.description} (v{info.version})")
         return
     
     if args.list_payloads:
@@ -1271,8 +1361,7 @@ def main():
         
         # Check for failures if fail-fast
         if args.fail_fast:
-            failed = [r for r in results if not r.all_match]
-            if failed:
+            if any(not r.all_match for r in results):
                 logger.error(f"Fail-fast: Stopping after first failure")
                 # Exit with code 1 for mismatch
                 sys.exit(1)
@@ -1290,22 +1379,11 @@ def main():
             try:
                 if args.output_format == "ndjson":
                     # Write NDJSON format (one JSON object per line)
-                    with open(args.dashboard_output, 'w') as f:
-                        # Write run info
-                        f.write(json.dumps({"type": "run_info", **canonical_results.run.model_dump(mode="json")}) + "\n")
-                        # Write implementations
-                        for impl in canonical_results.implementations:
-                            f.write(json.dumps({"type": "implementation", **impl.model_dump(mode="json")}) + "\n")
-                        # Write test cases
-                        for test in canonical_results.tests:
-                            f.write(json.dumps({"type": "test_case", **test.model_dump(mode="json")}) + "\n")
-                        # Write aggregates
-                        f.write(json.dumps({"type": "aggregates", **canonical_results.aggregates.model_dump(mode="json")}) + "\n")
+                    write_ndjson_results(canonical_results, args.dashboard_output)
                     print(f"NDJSON results saved to {args.dashboard_output}")
                 else:
                     # Write canonical JSON format
-                    with open(args.dashboard_output, 'w') as f:
-                        json.dump(canonical_results.model_dump(mode="json"), f, indent=2)
+                    write_json_results(canonical_results, args.dashboard_output)
                     print(f"Canonical results saved to {args.dashboard_output}")
             except Exception as e:
                 logger.error(f"Failed to write results to {args.dashboard_output}: {e}")
@@ -1319,26 +1397,18 @@ def main():
             run_id = canonical_results.run.id
             if args.output_format == "ndjson":
                 output_path = harness.results_dir / f"results_{run_id}.ndjson"
-                with open(output_path, 'w') as f:
-                    f.write(json.dumps({"type": "run_info", **canonical_results.run.model_dump(mode="json")}) + "\n")
-                    for impl in canonical_results.implementations:
-                        f.write(json.dumps({"type": "implementation", **impl.model_dump(mode="json")}) + "\n")
-                    for test in canonical_results.tests:
-                        f.write(json.dumps({"type": "test_case", **test.model_dump(mode="json")}) + "\n")
-                    f.write(json.dumps({"type": "aggregates", **canonical_results.aggregates.model_dump(mode="json")}) + "\n")
+                write_ndjson_results(canonical_results, output_path)
                 print(f"NDJSON results saved to {output_path}")
             else:
                 output_path = harness.results_dir / f"results_{run_id}.json"
-                with open(output_path, 'w') as f:
-                    json.dump(canonical_results.model_dump(mode="json"), f, indent=2)
+                write_json_results(canonical_results, output_path)
                 print(f"Canonical results saved to {output_path}")
             
             # Always show summary
             harness._print_summary(canonical_results)
         
         # Exit code: 0=all pass, 1=mismatch, 2=error
-        failed = sum(1 for r in results if not r.all_match)
-        if failed > 0:
+        if any(not r.all_match for r in results):
             sys.exit(1)  # Mismatch
         sys.exit(0)  # All pass
 
@@ -4,7 +4,7 @@ Plugin system for SWHID implementations.
 
 from .base import (
     SwhidImplementation, ImplementationInfo, SwhidTestResult, ComparisonResult,
-    ErrorCode, ErrorContext, TestMetrics, ImplementationCapabilities
+    ErrorCode, ErrorContext, TestMetrics, MetricsSink, ImplementationCapabilities
 )
 from .discovery import ImplementationDiscovery
 
@@ -16,6 +16,7 @@ __all__ = [
     "ErrorCode",
     "ErrorContext",
     "TestMetrics",
+    "MetricsSink",
     "ImplementationCapabilities",
     "ImplementationDiscovery"
 ]
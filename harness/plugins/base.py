@@ -3,11 +3,13 @@ Base classes and interfaces for SWHID implementations.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List, Union
+from array import array
+from typing import Dict, Any, Optional, List, Tuple, Union
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
 import logging
+import statistics
 
 logger = logging.getLogger(__name__)
 
@@ -82,6 +84,58 @@ class TestMetrics:
             "bytes_out": self.bytes_out
         }
 
+class MetricsSink:
+    """
+    Collects per-call metrics in parallel arrays.
+    
+    Adapters append one sample per request. Keeping each field in its own
+    contiguous array.array makes reductions a single pass over packed
+    numbers instead of an attribute lookup per result object.
+    """
+    
+    def __init__(self):
+        """Initialize empty metric arrays."""
+        self.wall = array('f')  # wall_ms
+        self.cpu = array('f')   # cpu_ms
+        self.rss = array('i')   # max_rss_kb
+    
+    def append(self, wall_ms: float, cpu_ms: float, max_rss_kb: int) -> None:
+        """Record one sample."""
+        self.wall.append(wall_ms)
+        self.cpu.append(cpu_ms)
+        self.rss.append(int(max_rss_kb))
+    
+    def clear(self) -> None:
+        """Drop all samples."""
+        del self.wall[:]
+        del self.cpu[:]
+        del self.rss[:]
+    
+    def __len__(self) -> int:
+        return len(self.wall)
+    
+    @staticmethod
+    def _median_mad(values: array) -> Tuple[float, float]:
+        """Return the median and median absolute deviation of values."""
+        median = statistics.median(values)
+        mad = statistics.median([abs(v - median) for v in values])
+        return median, mad
+    
+    def to_metrics(self) -> TestMetrics:
+        """Summarize the samples as TestMetrics (all zero if there are none)."""
+        if not self.wall:
+            return TestMetrics(samples=0)
+        wall_median, wall_mad = self._median_mad(self.wall)
+        cpu_median, cpu_mad = self._median_mad(self.cpu)
+        return TestMetrics(
+            samples=len(self.wall),
+            wall_ms_median=wall_median,
+            wall_ms_mad=wall_mad,
+            cpu_ms_median=cpu_median,
+            cpu_ms_mad=cpu_mad,
+            max_rss_kb=max(self.rss)
+        )
+
 @dataclass
 class SwhidTestResult:
     """Represents the result of a single test."""
@@ -194,64 +248,136 @@ class SwhidImplementation(ABC):
         # Default implementation - subclasses should override
         raise NotImplementedError("Subclasses must implement compute_swhid")
     
-    def benchmark(self, payload_path: str, iterations: int = 100) -> BenchmarkResult:
-        """Run performance benchmarks (default implementation)."""
+    def compute_swhid_batch(self, items: List[Tuple[str, Optional[str]]]) -> List[str]:
+        """Compute SWHIDs for many payloads.
+        
+        The default implementation calls compute_swhid once per item;
+        adapters override it to amortize per-call overhead over the batch.
+        
+        Args:
+            items: (payload_path, obj_type) pairs
+        
+        Returns:
+            SWHIDs in the same order as items
+        """
+        return [self.compute_swhid(payload_path, obj_type) for payload_path, obj_type in items]
+    
+    def benchmark(self, payload_path: str, iterations: int = 100,
+                  pin_cpu: Optional[int] = None) -> BenchmarkResult:
+        """Run performance benchmarks (default implementation).
+        
+        One untimed call runs first, so starting workers and warming the page
+        cache do not land in the first measurement.
+        
+        If pin_cpu is given (and the platform supports it), the calling
+        thread is pinned to that CPU for the duration, and so are the threads
+        and processes it spawns from now on. This skews absolute numbers but
+        removes cross-core migration jitter, so fewer iterations give a
+        stable comparison.
+        
+        Threads and processes that were already running keep their affinity:
+        persistent workers started before the call (such as a
+        SubprocessAdapter's WorkerPool or the Ruby worker) are not pinned.
+        Workers the warmup call starts are pinned.
+        """
+        import os
+        
+        previous_affinity = None
+        if pin_cpu is not None and hasattr(os, "sched_setaffinity"):
+            try:
+                previous_affinity = os.sched_getaffinity(0)
+                os.sched_setaffinity(0, {pin_cpu})
+            except OSError as e:
+                logger.warning(f"Could not pin benchmark to CPU {pin_cpu}: {e}")
+                previous_affinity = None
+        
+        try:
+            return self._run_benchmark(payload_path, iterations)
+        finally:
+            if previous_affinity is not None:
+                os.sched_setaffinity(0, previous_affinity)
+    
+    def _run_benchmark(self, payload_path: str, iterations: int) -> BenchmarkResult:
+        import math
         import time
-        import statistics
         
-        times = []
+        try:
+            self.compute_swhid(payload_path)
+        except Exception as e:
+            logger.debug(f"Benchmark warmup failed: {e}")
+        
+        # Running (Welford) mean and variance, plus min/max; the samples are
+        # only kept, as compact doubles, for the median
+        count = 0
+        mean_ms = 0.0
+        m2 = 0.0
+        min_ms = math.inf
+        max_ms = -math.inf
+        times_ms = array('d')
         for _ in range(iterations):
-            start = time.perf_counter()
+            start = time.perf_counter_ns()
             try:
                 self.compute_swhid(payload_path)
-                times.append(time.perf_counter() - start)
+                elapsed_ms = (time.perf_counter_ns() - start) / 1e6
             except Exception as e:
                 logger.warning(f"Benchmark iteration failed: {e}")
                 continue
+            
+            count += 1
+            delta = elapsed_ms - mean_ms
+            mean_ms += delta / count
+            m2 += delta * (elapsed_ms - mean_ms)
+            min_ms = min(min_ms, elapsed_ms)
+            max_ms = max(max_ms, elapsed_ms)
+            times_ms.append(elapsed_ms)
         
-        if not times:
+        if not count:
             raise RuntimeError("All benchmark iterations failed")
         
-        # Convert to milliseconds
-        times_ms = [t * 1000 for t in times]
-        
         return BenchmarkResult(
             implementation=self.get_info().name,
             payload_name=payload_path,
-            mean_duration_ms=statistics.mean(times_ms),
+            mean_duration_ms=mean_ms,
             median_duration_ms=statistics.median(times_ms),
-            std_duration_ms=statistics.stdev(times_ms) if len(times_ms) > 1 else 0,
-            min_duration_ms=min(times_ms),
-            max_duration_ms=max(times_ms),
-            iterations=len(times_ms)
+            std_duration_ms=math.sqrt(m2 / (count - 1)) if count > 1 else 0,
+            min_duration_ms=min_ms,
+            max_duration_ms=max_ms,
+            iterations=count
         )
     
     def detect_object_type(self, payload_path: str) -> str:
-        """Detect object type from payload path (default implementation)."""
+        """Detect object type from payload path (default implementation).
+        
+        Each path is stat'ed at most once.
+        """
         import os
-        from pathlib import Path
+        import stat
         
-        path = Path(payload_path)
+        def stat_mode(path: str) -> Optional[int]:
+            """Get the mode of a path (following symlinks), or None if it does not exist."""
+            try:
+                return os.stat(path).st_mode
+            except OSError:
+                return None
         
-        if not path.exists():
+        mode = stat_mode(payload_path)
+        if mode is None:
             raise ValueError(f"Payload does not exist: {payload_path}")
         
-        if path.is_file():
+        if stat.S_ISREG(mode):
             return "content"
-        elif path.is_dir():
+        elif stat.S_ISDIR(mode):
             # Check if it's a Git repository
             # Case 1: Regular Git repo (has .git subdirectory)
-            git_dir = path / ".git"
-            if git_dir.exists():
-                # .git can be a directory or a file (for worktrees/submodules)
-                if git_dir.is_dir() or git_dir.is_file():
-                    return "snapshot"
+            # .git can be a directory or a file (for worktrees/submodules)
+            git_mode = stat_mode(os.path.join(payload_path, ".git"))
+            if git_mode is not None and (stat.S_ISDIR(git_mode) or stat.S_ISREG(git_mode)):
+                return "snapshot"
             
             # Case 2: Bare Git repository (directory itself is the git repo)
             # Check for common git repository indicators
-            if (path / "HEAD").exists() and \
-               (path / "refs").exists() and \
-               (path / "objects").exists():
+            if all(stat_mode(os.path.join(payload_path, name)) is not None
+                   for name in ("HEAD", "refs", "objects")):
                 return "snapshot"
             
             return "directory"
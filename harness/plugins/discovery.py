@@ -20,6 +20,7 @@ class ImplementationDiscovery:
     def __init__(self, implementations_dir: str = "implementations"):
         self.implementations_dir = Path(implementations_dir)
         self._implementations_cache: Dict[str, SwhidImplementation] = {}
+        self._fully_discovered = False
     
     def discover_implementations(self, force_reload: bool = False) -> Dict[str, SwhidImplementation]:
         """
@@ -31,7 +32,7 @@ class ImplementationDiscovery:
         Returns:
             Dictionary mapping implementation names to instances
         """
-        if not force_reload and self._implementations_cache:
+        if not force_reload and self._fully_discovered:
             return self._implementations_cache
         
         implementations = {}
@@ -48,20 +49,32 @@ class ImplementationDiscovery:
             if impl_dir.name.startswith('.'):
                 continue
             
-            try:
-                impl = self._load_implementation(impl_dir)
-                if impl and impl.is_available():
-                    info = impl.get_info()
-                    implementations[info.name] = impl
-                    logger.info(f"Loaded implementation: {info.name} v{info.version}")
-                else:
-                    logger.debug(f"Implementation {impl_dir.name} not available")
-            except Exception as e:
-                logger.warning(f"Failed to load implementation {impl_dir.name}: {e}")
+            # Already loaded on its own by get_implementation()
+            if not force_reload and impl_dir.name in self._implementations_cache:
+                implementations[impl_dir.name] = self._implementations_cache[impl_dir.name]
+                continue
+            
+            impl = self._load_available_implementation(impl_dir)
+            if impl:
+                implementations[impl.get_info().name] = impl
         
         self._implementations_cache = implementations
+        self._fully_discovered = True
         return implementations
     
+    def _load_available_implementation(self, impl_dir: Path) -> Optional[SwhidImplementation]:
+        """Load an implementation, returning None if it fails or is unavailable."""
+        try:
+            impl = self._load_implementation(impl_dir)
+            if impl and impl.is_available():
+                info = impl.get_info()
+                logger.info(f"Loaded implementation: {info.name} v{info.version}")
+                return impl
+            logger.debug(f"Implementation {impl_dir.name} not available")
+        except Exception as e:
+            logger.warning(f"Failed to load implementation {impl_dir.name}: {e}")
+        return None
+    
     def _load_implementation(self, impl_dir: Path) -> Optional[SwhidImplementation]:
         """Load a single implementation from a directory."""
         impl_file = impl_dir / "implementation.py"
@@ -111,9 +124,27 @@ class ImplementationDiscovery:
             return None
     
     def get_implementation(self, name: str) -> Optional[SwhidImplementation]:
-        """Get a specific implementation by name."""
-        implementations = self.discover_implementations()
-        return implementations.get(name)
+        """
+        Get a specific implementation by name.
+        
+        Only the implementation's own directory is imported when it matches
+        the name, so callers that need a single implementation don't pay for
+        importing (or break on) all the others.
+        """
+        if name in self._implementations_cache or self._fully_discovered:
+            return self._implementations_cache.get(name)
+        
+        impl_dir = self.implementations_dir / name
+        if not name.startswith('.') and impl_dir.is_dir():
+            impl = self._load_available_implementation(impl_dir)
+            if impl is None:
+                return None
+            if impl.get_info().name == name:
+                self._implementations_cache[name] = impl
+                return impl
+        
+        # The directory name doesn't match the implementation's name
+        return self.discover_implementations().get(name)
     
     def list_available_implementations(self) -> List[str]:
         """List names of all available implementations."""
@@ -136,3 +167,4 @@ class ImplementationDiscovery:
     def clear_cache(self):
         """Clear the implementations cache."""
         self._implementations_cache.clear()
+        self._fully_discovered = False
@@ -4,18 +4,60 @@ Wrapper script for running implementations in subprocess with JSON protocol.
 
 This script is used by SubprocessAdapter to run implementations in isolation.
 Protocol: JSON over stdin/stdout
+
+Run with ``--serve`` to keep the process alive and answer requests until
+stdin is closed. In serve mode every message is framed as a 4-byte
+little-endian length followed by that many bytes of UTF-8 JSON.
 """
 
+import argparse
 import json
 import sys
 import os
 import importlib
+import resource
+import struct
+import time
 import traceback
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple, Union
 
 # Protocol version
 PROTOCOL_VERSION = "1.0"
 
+# Frame header for serve mode: payload length, little-endian uint32
+_FRAME_HEADER = struct.Struct("<I")
+
+# ru_maxrss is reported in kilobytes on Linux but in bytes on macOS
+_RU_MAXRSS_DIVISOR = 1024 if sys.platform == 'darwin' else 1
+
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize obj to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # orjson rejects lone surrogates (undecodable file names); json escapes them
+            pass
+    return json.dumps(obj).encode("utf-8")
+
+
+def _loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # json also accepts escaped lone surrogates, and reports real errors the same way
+            pass
+    return json.loads(data)
+
 
 def load_implementation(impl_module_path: str, impl_class_name: str = "Implementation"):
     """
@@ -36,15 +78,31 @@ def load_implementation(impl_module_path: str, impl_class_name: str = "Implement
         raise RuntimeError(f"Failed to load implementation {impl_module_path}.{impl_class_name}: {e}")
 
 
+def _metrics_since(usage_before, start: float) -> Dict[str, Any]:
+    """Build the metrics for work started at ``start`` with ``usage_before`` rusage."""
+    wall_ms = (time.perf_counter() - start) * 1000
+    usage_after = resource.getrusage(resource.RUSAGE_SELF)
+    cpu_ms = (
+        (usage_after.ru_utime + usage_after.ru_stime)
+        - (usage_before.ru_utime + usage_before.ru_stime)
+    ) * 1000
+    return {
+        "wall_ms": wall_ms,
+        "cpu_ms": cpu_ms,
+        "max_rss_kb": usage_after.ru_maxrss // _RU_MAXRSS_DIVISOR
+    }
+
+
 def handle_request(request: Dict[str, Any], impl) -> Dict[str, Any]:
     """
     Handle a protocol request.
     
     Request format:
     {
-        "op": "compute" | "capabilities" | "info",
+        "op": "compute" | "compute_batch" | "capabilities" | "info",
         "payload_path": "...",  # for compute
         "obj_type": "...",       # optional for compute
+        "items": [["...", "..."], ...],  # (payload_path, obj_type) pairs for compute_batch
         "impl_module": "...",   # for initialization
         "impl_class": "..."      # optional, defaults to "Implementation"
     }
@@ -53,6 +111,8 @@ def handle_request(request: Dict[str, Any], impl) -> Dict[str, Any]:
     {
         "ok": true/false,
         "swhid": "...",          # for compute
+        "swhids": [...],         # for compute_batch, in item order
+        "metrics": {...},        # for compute/compute_batch (wall_ms, cpu_ms, max_rss_kb)
         "capabilities": {...},   # for capabilities
         "info": {...},           # for info
         "error": {...}           # if ok=false
@@ -71,10 +131,13 @@ def handle_request(request: Dict[str, Any], impl) -> Dict[str, Any]:
             }
         
         try:
+            usage_before = resource.getrusage(resource.RUSAGE_SELF)
+            start = time.perf_counter()
             swhid = impl.compute_swhid(payload_path, obj_type)
             return {
                 "ok": True,
-                "swhid": swhid
+                "swhid": swhid,
+                "metrics": _metrics_since(usage_before, start)
             }
         except Exception as e:
             return {
@@ -86,6 +149,39 @@ def handle_request(request: Dict[str, Any], impl) -> Dict[str, Any]:
                 }
             }
     
+    elif op == "compute_batch":
+        items = request.get("items")
+        
+        if not isinstance(items, list):
+            return {
+                "ok": False,
+                "error": {"message": "Missing items", "code": "INVALID_REQUEST"}
+            }
+        
+        usage_before = resource.getrusage(resource.RUSAGE_SELF)
+        start = time.perf_counter()
+        swhids = []
+        for index, item in enumerate(items):
+            try:
+                payload_path, obj_type = item
+                swhids.append(impl.compute_swhid(payload_path, obj_type))
+            except Exception as e:
+                return {
+                    "ok": False,
+                    "error": {
+                        "message": str(e),
+                        "code": "COMPUTE_ERROR",
+                        "index": index,
+                        "traceback": traceback.format_exc()
+                    }
+                }
+        
+        return {
+            "ok": True,
+            "swhids": swhids,
+            "metrics": _metrics_since(usage_before, start)
+        }
+    
     elif op == "capabilities":
         try:
             caps = impl.get_capabilities()
@@ -133,8 +229,158 @@ def handle_request(request: Dict[str, Any], impl) -> Dict[str, Any]:
         }
 
 
+def apply_limits(max_rss_mb: Optional[int], max_cpu_sec: Optional[int]) -> None:
+    """
+    Apply resource limits to this process.
+    
+    Done here rather than in a preexec_fn so the parent can start the
+    wrapper with vfork/posix_spawn. The CPU limit is a soft limit only, so
+    serve mode can re-arm it before each request (see _arm_cpu_limit).
+    """
+    try:
+        if max_rss_mb is not None:
+            max_rss_bytes = max_rss_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (max_rss_bytes, max_rss_bytes))
+        if max_cpu_sec is not None:
+            _arm_cpu_limit(max_cpu_sec)
+    except (ValueError, OSError) as e:
+        print(f"Could not set resource limits: {e}", file=sys.stderr)
+
+
+def _arm_cpu_limit(max_cpu_sec: int) -> None:
+    """Allow max_cpu_sec more seconds of CPU time from now (SIGXCPU after that)."""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime) + 1
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = used + max_cpu_sec
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _read_exact(stream, n: int) -> bytes:
+    """Read exactly n bytes from a binary stream (fewer only at EOF)."""
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = stream.read(n - len(buf))
+        if not chunk:
+            break
+        buf += chunk
+    return bytes(buf)
+
+
+def _serve_request(request: Dict[str, Any], impls: Dict[Tuple[str, str], Any],
+                   impl_module: str, impl_class: str) -> Dict[str, Any]:
+    """Handle one request in serve mode, loading the implementation on first use."""
+    key = (impl_module, impl_class)
+    impl = impls.get(key)
+    if impl is None:
+        try:
+            impl = impls[key] = load_implementation(impl_module, impl_class)
+        except Exception as e:
+            return {
+                "ok": False,
+                "error": {
+                    "message": str(e),
+                    "code": "LOAD_ERROR"
+                }
+            }
+    
+    try:
+        return handle_request(request, impl)
+    except Exception as e:
+        return {
+            "ok": False,
+            "error": {
+                "message": f"Unexpected error: {e}",
+                "code": "INTERNAL_ERROR",
+                "traceback": traceback.format_exc()
+            }
+        }
+
+
+def serve(max_cpu_sec: Optional[int] = None) -> int:
+    """
+    Serve requests until stdin is closed.
+    
+    Each request on stdin and each response on stdout is one length-prefixed
+    JSON frame. Loaded implementations are kept alive across requests, so
+    interpreter startup and module import are paid only once.
+    
+    Args:
+        max_cpu_sec: CPU time allowed per request (per item for compute_batch)
+    """
+    # Keep the original stdout for the protocol and send anything else the
+    # implementation (or its child processes) prints to stderr instead.
+    protocol_out = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    protocol_in = sys.stdin.buffer
+    
+    impls: Dict[Tuple[str, str], Any] = {}
+    
+    while True:
+        header = _read_exact(protocol_in, _FRAME_HEADER.size)
+        if len(header) < _FRAME_HEADER.size:
+            break
+        (length,) = _FRAME_HEADER.unpack(header)
+        payload = _read_exact(protocol_in, length)
+        if len(payload) < length:
+            break
+        
+        try:
+            request = _loads(payload)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            response = {
+                "ok": False,
+                "error": {
+                    "message": f"Invalid JSON: {e}",
+                    "code": "JSON_ERROR"
+                }
+            }
+        else:
+            impl_module = request.get("impl_module")
+            impl_class = request.get("impl_class", "Implementation")
+            
+            if not impl_module:
+                response = {
+                    "ok": False,
+                    "error": {
+                        "message": "Missing impl_module in request",
+                        "code": "INVALID_REQUEST"
+                    }
+                }
+            else:
+                if max_cpu_sec is not None:
+                    n_items = len(request.get("items") or ()) if request.get("op") == "compute_batch" else 1
+                    _arm_cpu_limit(max_cpu_sec * max(n_items, 1))
+                response = _serve_request(request, impls, impl_module, impl_class)
+        
+        data = _dumps(response)
+        protocol_out.write(_FRAME_HEADER.pack(len(data)) + data)
+        protocol_out.flush()
+    
+    return 0
+
+
 def main():
     """Main entry point for JSON protocol wrapper."""
+    parser = argparse.ArgumentParser(description="SWHID implementation wrapper")
+    parser.add_argument("--serve", action="store_true",
+                        help="Answer length-prefixed requests until stdin is closed")
+    parser.add_argument("--workdir", help="Change to this directory before handling requests")
+    parser.add_argument("--max-rss-mb", type=int, help="Address space limit in MB")
+    parser.add_argument("--max-cpu-sec", type=int,
+                        help="CPU time limit in seconds (per request in serve mode)")
+    args = parser.parse_args()
+    
+    apply_limits(args.max_rss_mb, args.max_cpu_sec)
+    
+    if args.workdir:
+        os.chdir(args.workdir)
+    
+    if args.serve:
+        return serve(args.max_cpu_sec)
+    
     # Read request from stdin
     try:
         request_json = sys.stdin.read()
@@ -5,27 +5,565 @@ This module provides a subprocess-based execution adapter that runs plugins
 out-of-process with resource limits and timeouts for security and stability.
 """
 
+import atexit
+import itertools
 import json
 import subprocess
 import tempfile
 import os
+import queue
+import selectors
 import signal
-import psutil
+import stat
+import threading
 import time
 import resource
+from concurrent.futures import ThreadPoolExecutor
 import shutil
+import struct
+import sys
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Tuple, Union
 import logging
 
-from .base import SwhidImplementation, ImplementationInfo, ImplementationCapabilities, SwhidTestResult, TestMetrics
-from ..utils.subprocess_utils import prepare_subprocess_environment, set_resource_limits, run_with_timeout
+from .base import SwhidImplementation, ImplementationInfo, ImplementationCapabilities, SwhidTestResult, TestMetrics, MetricsSink
+from ..utils.subprocess_utils import (
+    prepare_subprocess_environment, set_resource_limits, run_with_timeout, children_max_rss_kb,
+    self_max_rss_kb, read_pss_kb, read_rss_kb
+)
 
 logger = logging.getLogger(__name__)
 
 # Path to the wrapper script
 _WRAPPER_SCRIPT = Path(__file__).parent / "run_impl.py"
 
+# Resolved once at import: the interpreter running the harness (falling back
+# to a PATH lookup) and the project root put on the workers' PYTHONPATH
+_PYTHON = sys.executable or shutil.which("python3") or shutil.which("python")
+_PROJECT_ROOT = str(Path(__file__).resolve().parents[2])
+
+# Size of each os.read() on a child's pipes
+_READ_CHUNK = 65536
+
+# Frame header on the worker channel: payload length, little-endian uint32
+_FRAME_HEADER = struct.Struct("<I")
+
+
+def _absolute_path(path: str) -> str:
+    """Make a path absolute, skipping the getcwd() call when it already is."""
+    return path if os.path.isabs(path) else os.path.abspath(path)
+
+
+def _open_pidfd(pid: int) -> Optional[int]:
+    """Open a pidfd for a child process, or return None if unsupported (Linux < 5.3)."""
+    if not hasattr(os, "pidfd_open"):
+        return None
+    try:
+        return os.pidfd_open(pid)
+    except OSError:
+        return None
+
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize obj to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # orjson rejects lone surrogates (undecodable file names); json escapes them
+            pass
+    return json.dumps(obj).encode("utf-8")
+
+
+def _loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # json also accepts escaped lone surrogates, and reports real errors the same way
+            pass
+    return json.loads(data)
+
+
+_IS_POSIX = os.name != 'nt'
+
+# Limits are applied from the parent after the spawn where prlimit exists (Linux)
+_USE_PRLIMIT = _IS_POSIX and hasattr(resource, "prlimit")
+
+# Children are started as process group leaders so a kill also reaches
+# anything they spawned (git, an external implementation's helpers, ...)
+_NEW_PROCESS_GROUP: Dict[str, Any] = (
+    {} if not _IS_POSIX
+    else {"process_group": 0} if sys.version_info >= (3, 11)
+    else {"start_new_session": True}
+)
+
+# Popen arguments shared by every child; callers add stderr, env and cwd
+_POPEN_COMMON: Dict[str, Any] = dict(
+    stdin=subprocess.PIPE,
+    stdout=subprocess.PIPE,
+    **_NEW_PROCESS_GROUP
+)
+
+
+def _kill(process: "Union[subprocess.Popen, _SpawnedProcess]", pidfd: Optional[int]) -> None:
+    """
+    Send SIGKILL to a child and its process group.
+    
+    The child itself is signalled through its pidfd when available so the PID
+    cannot have been reused. The group is only signalled while the child is
+    unreaped, which keeps its PGID from being reused as well.
+    """
+    try:
+        if pidfd is not None:
+            signal.pidfd_send_signal(pidfd, signal.SIGKILL)
+        else:
+            process.kill()
+    except OSError:
+        pass
+    if _IS_POSIX and process.returncode is None:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            pass
+
+
+class _RssMonitor(threading.Thread):
+    """
+    Background sampler tracking the peak memory of a running child.
+    
+    Samples PSS (VmRSS where smaps_rollup is unavailable) every ``interval``
+    seconds and kills the child as soon as it goes over ``limit_kb``, so the
+    limit is enforced while the child runs rather than after it exits.
+    """
+    
+    def __init__(self, pid: int, limit_kb: int, kill: Callable[[], None], interval: float = 0.05):
+        super().__init__(name=f"rss-monitor-{pid}", daemon=True)
+        self.pid = pid
+        self.limit_kb = limit_kb
+        self.interval = interval
+        self._kill = kill
+        self._stop_event = threading.Event()
+        
+        self.peak_kb = 0
+        self.killed = False
+        # Without /proc there is nothing to sample; callers fall back to getrusage
+        self.supported = os.path.isdir(f"/proc/{pid}")
+    
+    def run(self):
+        while True:
+            kb = read_pss_kb(self.pid)
+            if kb is None:
+                kb = read_rss_kb(self.pid)
+            if kb is None:
+                # Process is gone
+                return
+            
+            if kb > self.peak_kb:
+                self.peak_kb = kb
+            if kb > self.limit_kb:
+                self.killed = True
+                self._kill()
+                return
+            
+            if self._stop_event.wait(self.interval):
+                return
+    
+    def stop(self) -> None:
+        """Stop sampling and wait for the thread to finish."""
+        self._stop_event.set()
+        self.join()
+
+
+def _make_work_dir(session_dir: str, counter: "itertools.count[int]") -> str:
+    """Create a fresh working directory inside a session directory."""
+    work_dir = os.path.join(session_dir, f"{os.getpid()}_{next(counter)}")
+    os.mkdir(work_dir)
+    return work_dir
+
+
+def _remove_work_dir(work_dir: str) -> None:
+    """Remove a working directory, with a single rmdir when it was left empty."""
+    try:
+        os.rmdir(work_dir)
+    except OSError:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _communicate(
+    process: subprocess.Popen,
+    pidfd: Optional[int],
+    input_bytes: bytes,
+    timeout: float
+) -> Tuple[bytes, bytes]:
+    """
+    Send input to a child and collect its output until it exits.
+    
+    A single-threaded replacement for Popen.communicate(), which starts a
+    drain thread per pipe. stdin is written without blocking from the same
+    select loop that reads stdout/stderr. With a pidfd the wait ends as soon
+    as the child exits, even if a grandchild keeps the pipes open; without
+    one it ends at EOF on the pipes. stderr is returned empty if it was not
+    piped.
+    
+    Raises:
+        subprocess.TimeoutExpired: If the child is still running after timeout
+            (the child has been killed)
+    """
+    deadline = time.monotonic() + timeout
+    
+    stdin_fd = process.stdin.fileno()
+    stdout_fd = process.stdout.fileno()
+    stdout = bytearray()
+    stderr = bytearray()
+    buffers = {stdout_fd: stdout}
+    if process.stderr is not None:
+        buffers[process.stderr.fileno()] = stderr
+    pending = memoryview(input_bytes)
+    
+    with selectors.DefaultSelector() as sel:
+        if pending:
+            os.set_blocking(stdin_fd, False)
+            sel.register(stdin_fd, selectors.EVENT_WRITE)
+        else:
+            process.stdin.close()
+        for fd in buffers:
+            sel.register(fd, selectors.EVENT_READ)
+        if pidfd is not None:
+            sel.register(pidfd, selectors.EVENT_READ)
+        exited = False
+        
+        while sel.get_map():
+            if exited:
+                # Child is gone: take what is already buffered, don't wait for EOF
+                remaining = 0
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    _kill(process, pidfd)
+                    process.wait()
+                    raise subprocess.TimeoutExpired(process.args, timeout)
+            
+            events = sel.select(remaining)
+            if not events and exited:
+                break
+            
+            for key, _ in events:
+                if key.fd == stdin_fd:
+                    try:
+                        pending = pending[os.write(stdin_fd, pending):]
+                    except BlockingIOError:
+                        continue
+                    except BrokenPipeError:
+                        pending = pending[:0]
+                    if not pending:
+                        sel.unregister(stdin_fd)
+                        process.stdin.close()
+                elif key.fd == pidfd:
+                    sel.unregister(pidfd)
+                    exited = True
+                else:
+                    chunk = os.read(key.fd, _READ_CHUNK)
+                    if chunk:
+                        buffers[key.fd] += chunk
+                    else:
+                        sel.unregister(key.fd)
+    
+    if not process.stdin.closed:
+        process.stdin.close()
+    process.wait()
+    return bytes(stdout), bytes(stderr)
+
+
+# Workers are started with posix_spawn where available; Popen is the fallback
+_USE_POSIX_SPAWN = hasattr(os, "posix_spawn")
+
+
+class _SpawnedProcess:
+    """Minimal Popen-like handle for a worker started with os.posix_spawn."""
+    
+    def __init__(self, args: List[str], pid: int, stdin_fd: int, stdout_fd: int):
+        self.args = args
+        self.pid = pid
+        self.stdin = os.fdopen(stdin_fd, "wb")
+        self.stdout = os.fdopen(stdout_fd, "rb")
+        self.returncode: Optional[int] = None
+    
+    def poll(self) -> Optional[int]:
+        """Return the exit code if the process has exited, else None."""
+        if self.returncode is None:
+            try:
+                pid, status = os.waitpid(self.pid, os.WNOHANG)
+            except ChildProcessError:
+                return self.returncode
+            if pid:
+                self.returncode = os.waitstatus_to_exitcode(status)
+        return self.returncode
+    
+    def wait(self, timeout: Optional[float] = None) -> Optional[int]:
+        """Wait for the process to exit."""
+        if timeout is None:
+            if self.returncode is None:
+                try:
+                    _, status = os.waitpid(self.pid, 0)
+                    self.returncode = os.waitstatus_to_exitcode(status)
+                except ChildProcessError:
+                    pass
+            return self.returncode
+        
+        deadline = time.monotonic() + timeout
+        while self.poll() is None:
+            if time.monotonic() >= deadline:
+                raise subprocess.TimeoutExpired(self.args, timeout)
+            time.sleep(0.005)
+        return self.returncode
+    
+    def kill(self) -> None:
+        """Send SIGKILL to the process."""
+        if self.returncode is None:
+            os.kill(self.pid, signal.SIGKILL)
+
+
+def _spawn_worker(
+    cmd: List[str],
+    env: Dict[str, str],
+    work_dir: str
+) -> _SpawnedProcess:
+    """
+    Start a worker with os.posix_spawn.
+    
+    posix_spawn skips copying the parent's page tables, which fork() has to
+    do even when exec follows immediately. It cannot change directory or run
+    Python code in the child, so the worker is told its directory with
+    --workdir and applies its own resource limits.
+    """
+    stdin_r, stdin_w = os.pipe()
+    stdout_r, stdout_w = os.pipe()
+    args = cmd + ["--workdir", work_dir]
+    file_actions = [
+        (os.POSIX_SPAWN_DUP2, stdin_r, 0),
+        (os.POSIX_SPAWN_DUP2, stdout_w, 1),
+        (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0),
+    ]
+    try:
+        pid = os.posix_spawn(args[0], args, env, file_actions=file_actions, setpgroup=0)
+    except OSError:
+        os.close(stdin_w)
+        os.close(stdout_r)
+        raise
+    finally:
+        os.close(stdin_r)
+        os.close(stdout_w)
+    
+    return _SpawnedProcess(args, pid, stdin_w, stdout_r)
+
+
+_WorkerProcess = Union[subprocess.Popen, _SpawnedProcess]
+
+
+class WorkerPool:
+    """
+    Pool of long-lived ``run_impl.py --serve`` worker processes.
+    
+    Each worker answers length-prefixed JSON frames on stdin/stdout, so
+    interpreter startup and implementation import are paid once per worker
+    instead of once per call. Workers are started lazily and respawned after
+    a timeout or crash.
+    """
+    
+    def __init__(
+        self,
+        cmd: List[str],
+        env: Dict[str, str],
+        size: int = 1,
+        max_rss_kb: Optional[int] = None,
+        session_dir: Optional[str] = None
+    ):
+        """
+        Initialize worker pool.
+        
+        Args:
+            cmd: Command starting one worker in serve mode
+            env: Environment for worker processes
+            size: Number of worker processes
+            max_rss_kb: Memory limit, enforced while a request runs
+            session_dir: Directory holding the workers' working directories
+                (defaults to the system temp directory)
+        
+        rlimits are applied by the worker itself (see run_impl.py
+        --max-rss-mb/--max-cpu-sec), so no code runs between fork and exec.
+        """
+        self.cmd = cmd
+        self.env = env
+        self.size = size
+        self.max_rss_kb = max_rss_kb
+        self.session_dir = session_dir or tempfile.gettempdir()
+        self._dir_counter = itertools.count()
+        
+        self._workers: List[Optional[_WorkerProcess]] = [None] * size
+        self._pidfds: List[Optional[int]] = [None] * size
+        self._work_dirs: List[Optional[str]] = [None] * size
+        self._free: "queue.Queue[int]" = queue.Queue()
+        for slot in range(size):
+            self._free.put(slot)
+    
+    def _spawn(self, slot: int) -> "_WorkerProcess":
+        """Start the worker for a slot."""
+        work_dir = _make_work_dir(self.session_dir, self._dir_counter)
+        
+        if _USE_POSIX_SPAWN:
+            process = _spawn_worker(self.cmd, self.env, work_dir)
+        else:
+            process = subprocess.Popen(
+                self.cmd,
+                stderr=subprocess.DEVNULL,
+                env=self.env,
+                cwd=work_dir,
+                **_POPEN_COMMON
+            )
+        self._workers[slot] = process
+        self._pidfds[slot] = _open_pidfd(process.pid)
+        self._work_dirs[slot] = work_dir
+        return process
+    
+    def _discard(self, slot: int) -> None:
+        """Kill the worker for a slot and remove its working directory."""
+        process = self._workers[slot]
+        pidfd = self._pidfds[slot]
+        if process is not None:
+            _kill(process, pidfd)
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                pass
+            for stream in (process.stdin, process.stdout):
+                try:
+                    stream.close()
+                except OSError:
+                    pass
+        if pidfd is not None:
+            os.close(pidfd)
+        
+        work_dir = self._work_dirs[slot]
+        if work_dir is not None:
+            _remove_work_dir(work_dir)
+        
+        self._workers[slot] = None
+        self._pidfds[slot] = None
+        self._work_dirs[slot] = None
+    
+    @staticmethod
+    def _read_frame(process: _WorkerProcess, pidfd: Optional[int], timeout: float) -> Optional[bytes]:
+        """
+        Read one length-prefixed response frame from a worker.
+        
+        Returns:
+            The frame payload, or None on timeout
+        
+        Raises:
+            EOFError: If the worker closed stdout before a full frame arrived
+        """
+        stdout_fd = process.stdout.fileno()
+        buf = bytearray()
+        needed = _FRAME_HEADER.size
+        deadline = time.monotonic() + timeout
+        
+        with selectors.DefaultSelector() as sel:
+            sel.register(stdout_fd, selectors.EVENT_READ)
+            if pidfd is not None:
+                sel.register(pidfd, selectors.EVENT_READ)
+            
+            while len(buf) < needed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                for key, _ in sel.select(remaining):
+                    if key.fd == pidfd:
+                        # Worker exited; keep reading whatever it already wrote
+                        sel.unregister(pidfd)
+                        continue
+                    chunk = os.read(stdout_fd, _READ_CHUNK)
+                    if not chunk:
+                        raise EOFError("worker closed stdout")
+                    buf += chunk
+                    if needed == _FRAME_HEADER.size and len(buf) >= needed:
+                        needed += _FRAME_HEADER.unpack_from(buf)[0]
+        
+        return bytes(buf[_FRAME_HEADER.size:needed])
+    
+    def request(self, request_bytes: bytes, timeout: float) -> Tuple[bytes, Optional[int]]:
+        """
+        Send one request to a free worker and return its response.
+        
+        Args:
+            request_bytes: Serialized JSON request
+            timeout: Maximum wall-clock time in seconds
+        
+        Returns:
+            Tuple of (response bytes, peak worker memory in KB while the
+            request ran, or None if it could not be sampled)
+        
+        Raises:
+            RuntimeError: If the worker times out, goes over the memory limit
+                or exits unexpectedly
+        """
+        slot = self._free.get()
+        try:
+            process = self._workers[slot]
+            if process is None or process.poll() is not None:
+                self._discard(slot)
+                process = self._spawn(slot)
+            pidfd = self._pidfds[slot]
+            
+            monitor = None
+            if self.max_rss_kb is not None:
+                monitor = _RssMonitor(process.pid, self.max_rss_kb, lambda: _kill(process, pidfd))
+                monitor.start()
+            
+            try:
+                process.stdin.write(_FRAME_HEADER.pack(len(request_bytes)) + request_bytes)
+                process.stdin.flush()
+                response = self._read_frame(process, pidfd, timeout)
+                exited = False
+            except (OSError, EOFError):
+                response, exited = b"", True
+            finally:
+                if monitor is not None:
+                    monitor.stop()
+            
+            if monitor is not None and monitor.killed:
+                self._discard(slot)
+                raise RuntimeError(
+                    f"RSS limit exceeded: {monitor.peak_kb}KB > {self.max_rss_kb}KB"
+                )
+            
+            if response is None:
+                self._discard(slot)
+                raise RuntimeError(f"Implementation timed out after {timeout}s")
+            
+            if exited:
+                # _discard reaps the worker, so its exit status is known afterwards
+                self._discard(slot)
+                returncode = process.returncode
+                raise RuntimeError(f"Worker exited unexpectedly (exit {returncode})")
+            
+            peak_kb = monitor.peak_kb if monitor is not None and monitor.supported else None
+            return response, peak_kb
+        finally:
+            self._free.put(slot)
+    
+    def close(self) -> None:
+        """Stop all workers."""
+        for slot in range(self.size):
+            self._discard(slot)
+
 
 class SubprocessAdapter(SwhidImplementation):
     """
@@ -42,7 +580,10 @@ class SubprocessAdapter(SwhidImplementation):
         max_rss_mb: int = 500,
         max_cpu_time: int = 60,
         clean_env: bool = True,
-        use_subprocess: bool = True
+        use_subprocess: bool = True,
+        pool_size: int = 1,
+        metrics_sink: Optional[MetricsSink] = None,
+        collect_metrics: bool = False
     ):
         """
         Initialize subprocess adapter.
@@ -54,6 +595,11 @@ class SubprocessAdapter(SwhidImplementation):
             max_cpu_time: Maximum CPU time in seconds
             clean_env: Use clean environment (whitelist PATH only)
             use_subprocess: If True, run in subprocess; if False, monitor in-process
+            pool_size: Number of long-lived worker processes
+            metrics_sink: Receives wall/CPU/RSS metrics for every request
+            collect_metrics: Measure in-process computations and check their
+                RSS/CPU use (implied by metrics_sink); off by default since
+                the measurement can cost more than a small computation
         """
         self.wrapped_impl = wrapped_impl
         self.timeout = timeout
@@ -61,12 +607,43 @@ class SubprocessAdapter(SwhidImplementation):
         self.max_cpu_time = max_cpu_time
         self.clean_env = clean_env
         self.use_subprocess = use_subprocess
+        self.pool_size = pool_size
+        self.metrics_sink = metrics_sink
+        self.collect_metrics = collect_metrics or metrics_sink is not None
+        
+        # Runs in-process computations so they can be given a timeout
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="swhid-compute")
+        
+        # In-process computations share this process's address space limit;
+        # it only needs setting once, and failing (common on macOS) is logged once
+        self._as_limit_set = False
+        if not use_subprocess:
+            try:
+                max_rss_bytes = max_rss_mb * 1024 * 1024
+                resource.setrlimit(resource.RLIMIT_AS, (max_rss_bytes, max_rss_bytes))
+                self._as_limit_set = True
+            except (ValueError, OSError) as e:
+                logger.warning(f"Could not set RSS limit: {e}")
+        
+        self._pool: Optional[WorkerPool] = None
+        self._pool_lock = threading.Lock()
+        
+        # One temp directory per adapter; each worker gets a subdirectory
+        self._session_dir = tempfile.mkdtemp(prefix="swhid_sess_")
+        atexit.register(shutil.rmtree, self._session_dir, ignore_errors=True)
         
         # Get implementation module path for subprocess execution
         impl_module = wrapped_impl.__class__.__module__
         impl_class = wrapped_impl.__class__.__name__
         self.impl_module_path = impl_module
         self.impl_class_name = impl_class
+        
+        # The implementation fields never change for an adapter, so encode
+        # them once; each request only appends its own fields
+        self._request_prefix = (
+            '{"impl_module":' + json.dumps(impl_module)
+            + ',"impl_class":' + json.dumps(impl_class) + ','
+        ).encode("utf-8")
     
     def get_info(self) -> ImplementationInfo:
         """Return implementation metadata."""
@@ -95,140 +672,145 @@ class SubprocessAdapter(SwhidImplementation):
         else:
             return self._compute_with_monitoring(payload_path, obj_type)
     
+    def _get_pool(self) -> WorkerPool:
+        """Return the worker pool, starting it on first use."""
+        with self._pool_lock:
+            if self._pool is None:
+                if not _PYTHON:
+                    raise RuntimeError("Python interpreter not found")
+                
+                self._pool = WorkerPool(
+                    cmd=[
+                        _PYTHON, str(_WRAPPER_SCRIPT), "--serve",
+                        "--max-rss-mb", str(self.max_rss_mb),
+                        "--max-cpu-sec", str(self.max_cpu_time),
+                    ],
+                    env=self._prepare_environment(),
+                    size=self.pool_size,
+                    max_rss_kb=self.max_rss_mb * 1024,
+                    session_dir=self._session_dir
+                )
+            return self._pool
+    
+    def close(self) -> None:
+        """Stop the worker processes, if any were started."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
+    
+    def compute_swhid_batch(self, items: List[Tuple[str, Optional[str]]]) -> List[str]:
+        """
+        Compute SWHIDs for many payloads in a single worker request.
+        
+        The wrapped implementation stays loaded for the whole batch; the
+        timeout and CPU limit scale with the number of items.
+        """
+        if not self.use_subprocess:
+            return super().compute_swhid_batch(items)
+        if not items:
+            return []
+        
+        items_json = _dumps(
+            [[_absolute_path(payload_path), obj_type] for payload_path, obj_type in items]
+        )
+        response = self._request(b'"op":"compute_batch","items":' + items_json + b'}', len(items))
+        
+        swhids = response.get("swhids")
+        if not isinstance(swhids, list) or len(swhids) != len(items) or not all(swhids):
+            raise RuntimeError("Missing SWHIDs in batch response")
+        
+        return swhids
+    
     def _compute_via_subprocess(self, payload_path: str, obj_type: Optional[str] = None) -> str:
-        """Compute SWHID by running implementation in subprocess with JSON protocol."""
+        """Compute SWHID by sending a JSON request to a pooled worker process."""
         # Prepare request
-        request = {
-            "op": "compute",
-            "payload_path": os.path.abspath(payload_path),
-            "obj_type": obj_type,
-            "impl_module": self.impl_module_path,
-            "impl_class": self.impl_class_name
-        }
+        request_fields = (
+            b'"op":"compute","payload_path":' + _dumps(_absolute_path(payload_path))
+            + b',"obj_type":' + _dumps(obj_type) + b'}'
+        )
+        response = self._request(request_fields)
         
-        # Prepare environment
-        env = self._prepare_environment()
+        swhid = response.get("swhid")
+        if not swhid:
+            raise RuntimeError("No SWHID in response")
         
-        # Create isolated working directory
-        work_dir = tempfile.mkdtemp(prefix="swhid_impl_")
+        return swhid
+    
+    def _request(self, request_fields: bytes, n_items: int = 1) -> Dict[str, Any]:
+        """
+        Send a request to a pooled worker, check limits and return the response.
         
+        Args:
+            request_fields: The request's own JSON fields followed by the
+                closing brace; the implementation fields are prepended
+            n_items: Number of payloads in the request
+        """
+        request_bytes = self._request_prefix + request_fields
+        stdout, peak_kb = self._get_pool().request(request_bytes, self.timeout * n_items)
+        
+        # Parse response
         try:
-            # Build command
-            python = shutil.which("python3") or shutil.which("python")
-            if not python:
-                raise RuntimeError("Python interpreter not found")
-            
-            cmd = [python, str(_WRAPPER_SCRIPT)]
-            
-            # Start process with resource limits
-            process = subprocess.Popen(
-                cmd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                encoding='utf-8',
-                errors='replace',  # Replace invalid UTF-8 sequences instead of raising UnicodeDecodeError
-                env=env,
-                cwd=work_dir,
-                preexec_fn=self._set_resource_limits if os.name != 'nt' else None
+            response = _loads(stdout)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            output = stdout[:200].decode("utf-8", errors="replace")
+            raise RuntimeError(f"Invalid JSON response: {e}\nOutput: {output}")
+        
+        if not response.get("ok"):
+            error = response.get("error", {})
+            error_msg = error.get("message", "Unknown error")
+            error_code = error.get("code", "UNKNOWN")
+            if "index" in error:
+                error_msg = f"item {error['index']}: {error_msg}"
+            raise RuntimeError(f"Implementation error [{error_code}]: {error_msg}")
+        
+        # The pool enforces the memory limit while the request runs; without
+        # /proc, check the peak RSS the worker measured with getrusage instead
+        metrics = response.get("metrics", {})
+        if peak_kb is None:
+            max_rss_kb = metrics.get("max_rss_kb", 0)
+        else:
+            max_rss_kb = peak_kb
+        if max_rss_kb > self.max_rss_mb * 1024:
+            raise RuntimeError(
+                f"RSS limit exceeded: {max_rss_kb}KB > {self.max_rss_mb * 1024}KB"
             )
-            
-            # Monitor process for RSS
-            proc_monitor = psutil.Process(process.pid)
-            max_rss_kb = 0
-            
-            # Send request
-            request_json = json.dumps(request)
-            start_time = time.time()
-            
-            try:
-                stdout, stderr = process.communicate(
-                    input=request_json,
-                    timeout=self.timeout
-                )
-                
-                # Get final RSS
-                try:
-                    max_rss_kb = int(proc_monitor.memory_info().rss / 1024)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-                
-            except subprocess.TimeoutExpired:
-                # Kill process and all children
-                try:
-                    proc_monitor.terminate()
-                    proc_monitor.wait(timeout=5)
-                except psutil.TimeoutExpired:
-                    proc_monitor.kill()
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-                
-                raise RuntimeError(f"Implementation timed out after {self.timeout}s")
-            
-            # Check RSS limit
-            if max_rss_kb > self.max_rss_mb * 1024:
-                raise RuntimeError(
-                    f"RSS limit exceeded: {max_rss_kb}KB > {self.max_rss_mb * 1024}KB"
-                )
-            
-            # Check exit code
-            if process.returncode != 0:
-                error_msg = stderr.strip() or stdout.strip() or "Unknown error"
-                raise RuntimeError(f"Implementation failed (exit {process.returncode}): {error_msg}")
-            
-            # Parse response
-            try:
-                response = json.loads(stdout)
-            except json.JSONDecodeError as e:
-                raise RuntimeError(f"Invalid JSON response: {e}\nOutput: {stdout[:200]}")
-            
-            if not response.get("ok"):
-                error = response.get("error", {})
-                error_msg = error.get("message", "Unknown error")
-                error_code = error.get("code", "UNKNOWN")
-                raise RuntimeError(f"Implementation error [{error_code}]: {error_msg}")
-            
-            swhid = response.get("swhid")
-            if not swhid:
-                raise RuntimeError("No SWHID in response")
-            
-            return swhid
-            
-        finally:
-            # Cleanup
-            try:
-                shutil.rmtree(work_dir, ignore_errors=True)
-            except Exception:
-                pass
+        
+        cpu_ms = metrics.get("cpu_ms", 0.0)
+        max_cpu_ms = self.max_cpu_time * 1000 * n_items
+        if cpu_ms > max_cpu_ms:
+            raise RuntimeError(f"CPU time limit exceeded: {cpu_ms}ms > {max_cpu_ms}ms")
+        
+        if self.metrics_sink is not None:
+            self.metrics_sink.append(metrics.get("wall_ms", 0.0), cpu_ms, max_rss_kb)
+        
+        return response
     
     def _compute_with_monitoring(self, payload_path: str, obj_type: Optional[str] = None) -> str:
         """Compute SWHID with in-process monitoring (fallback)."""
-        # Set resource limits
-        try:
-            max_rss_bytes = self.max_rss_mb * 1024 * 1024
-            resource.setrlimit(resource.RLIMIT_AS, (max_rss_bytes, max_rss_bytes))
-        except (ValueError, OSError) as e:
-            logger.warning(f"Could not set RSS limit: {e}")
+        # RLIMIT_AS was set (or found unavailable) once in __init__
+        compute = lambda: self.wrapped_impl.compute_swhid(payload_path, obj_type)
+        
+        if not self.collect_metrics:
+            try:
+                return self._run_with_timeout(compute, self.timeout)
+            except Exception as e:
+                raise RuntimeError(f"Subprocess execution failed: {e}")
         
         # Monitor process
-        process = psutil.Process()
-        start_rss = process.memory_info().rss / 1024  # KB
-        start_cpu = process.cpu_times().user + process.cpu_times().system
+        start_rss = self._current_memory_kb()
+        start_cpu = self._cpu_seconds()
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             # Run with timeout
-            result = self._run_with_timeout(
-                lambda: self.wrapped_impl.compute_swhid(payload_path, obj_type),
-                self.timeout
-            )
+            result = self._run_with_timeout(compute, self.timeout)
             
             # Get final metrics
-            end_time = time.time()
-            end_rss = process.memory_info().rss / 1024  # KB
-            end_cpu = process.cpu_times().user + process.cpu_times().system
+            end_time = time.perf_counter()
+            end_rss = self._current_memory_kb()
+            end_cpu = self._cpu_seconds()
             
             wall_ms = (end_time - start_time) * 1000
             cpu_ms = (end_cpu - start_cpu) * 1000
@@ -241,6 +823,9 @@ class SubprocessAdapter(SwhidImplementation):
             if cpu_ms > self.max_cpu_time * 1000:
                 raise RuntimeError(f"CPU time limit exceeded: {cpu_ms}ms > {self.max_cpu_time * 1000}ms")
             
+            if self.metrics_sink is not None:
+                self.metrics_sink.append(wall_ms, cpu_ms, max_rss_kb)
+            
             return result
             
         except subprocess.TimeoutExpired:
@@ -248,20 +833,37 @@ class SubprocessAdapter(SwhidImplementation):
         except Exception as e:
             raise RuntimeError(f"Subprocess execution failed: {e}")
     
+    @staticmethod
+    def _current_memory_kb() -> int:
+        """Get memory use of this process in KB (PSS on Linux, peak RSS elsewhere)."""
+        pss_kb = read_pss_kb()
+        if pss_kb is not None:
+            return pss_kb
+        return self_max_rss_kb()
+    
+    @staticmethod
+    def _cpu_seconds() -> float:
+        """Get user + system CPU time consumed by this process."""
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return usage.ru_utime + usage.ru_stime
+    
     def _prepare_environment(self) -> Dict[str, str]:
         """Prepare clean environment for subprocess."""
         return prepare_subprocess_environment(
             clean_env=self.clean_env,
-            project_root=str(Path(__file__).parent.parent.parent.absolute())
+            project_root=_PROJECT_ROOT
         )
     
-    def _set_resource_limits(self):
-        """Set resource limits for subprocess (Unix only)."""
-        set_resource_limits(self.max_rss_mb, self.max_cpu_time)
-    
     def _run_with_timeout(self, func, timeout: float):
-        """Run a function with timeout using signal (Unix only)."""
-        return run_with_timeout(func, timeout)
+        """Run a function with timeout in the adapter's worker thread."""
+        try:
+            return run_with_timeout(func, timeout, executor=self._executor)
+        except TimeoutError:
+            # The timed-out call cannot be interrupted; leave it running and
+            # give later calls a fresh thread instead of queueing behind it
+            self._executor.shutdown(wait=False)
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="swhid-compute")
+            raise RuntimeError(f"Implementation timed out after {timeout}s")
     
     def detect_object_type(self, payload_path: str) -> str:
         """Delegate to wrapped implementation."""
@@ -283,7 +885,8 @@ class JSONProtocolAdapter(SwhidImplementation):
         timeout: int = 30,
         max_rss_mb: int = 500,
         max_cpu_time: int = 60,
-        clean_env: bool = True
+        clean_env: bool = True,
+        metrics_sink: Optional[MetricsSink] = None
     ):
         """
         Initialize JSON protocol adapter.
@@ -294,12 +897,29 @@ class JSONProtocolAdapter(SwhidImplementation):
             max_rss_mb: Maximum RSS limit
             max_cpu_time: Maximum CPU time in seconds
             clean_env: Use clean environment
+            metrics_sink: Receives wall/CPU/RSS metrics for every call
         """
         self.command = command
         self.timeout = timeout
         self.max_rss_mb = max_rss_mb
         self.max_cpu_time = max_cpu_time
         self.clean_env = clean_env
+        self.metrics_sink = metrics_sink
+        self._available: Optional[bool] = None
+        
+        # The command is an arbitrary executable, so it cannot apply its own
+        # limits like run_impl.py does. Where prlimit exists they are applied
+        # right after the spawn (_apply_limits); elsewhere on POSIX a
+        # preexec_fn is the only option left.
+        # stderr is only wanted for error messages; see _call
+        self._popen_kwargs: Dict[str, Any] = dict(_POPEN_COMMON, stderr=subprocess.DEVNULL)
+        if _IS_POSIX and not _USE_PRLIMIT:
+            self._popen_kwargs["preexec_fn"] = self._set_resource_limits
+        
+        # One temp directory per adapter; each call gets a subdirectory
+        self._session_dir = tempfile.mkdtemp(prefix="swhid_sess_")
+        self._dir_counter = itertools.count()
+        atexit.register(shutil.rmtree, self._session_dir, ignore_errors=True)
     
     def get_info(self) -> ImplementationInfo:
         """Return implementation metadata."""
@@ -313,7 +933,21 @@ class JSONProtocolAdapter(SwhidImplementation):
         )
     
     def is_available(self) -> bool:
-        """Check if command is available."""
+        """
+        Check if command is available.
+        
+        Availability does not change over the adapter's lifetime, so the
+        result is cached; a command missing from PATH is rejected without
+        starting a process.
+        """
+        if self._available is None:
+            self._available = self._probe_available()
+        return self._available
+    
+    def _probe_available(self) -> bool:
+        """Run the command once with --version to check that it works."""
+        if shutil.which(self.command[0]) is None:
+            return False
         try:
             result = subprocess.run(
                 self.command[:1] + ["--version"],
@@ -336,61 +970,136 @@ class JSONProtocolAdapter(SwhidImplementation):
         """Compute SWHID via JSON protocol."""
         request = {
             "op": "compute",
-            "payload_path": os.path.abspath(payload_path),
+            "payload_path": _absolute_path(payload_path),
             "obj_type": obj_type
         }
+        response = self._call(request, self.timeout)
+        self._check_response(response)
         
+        swhid = response.get("swhid")
+        if not swhid:
+            raise RuntimeError("No SWHID in response")
+        
+        return swhid
+    
+    def compute_swhid_batch(self, items: List[Tuple[str, Optional[str]]]) -> List[str]:
+        """
+        Compute SWHIDs for many payloads with one compute_batch request.
+        
+        Falls back to one compute request per item if the command does not
+        know the compute_batch operation.
+        """
+        if not items:
+            return []
+        
+        request = {
+            "op": "compute_batch",
+            "items": [[_absolute_path(payload_path), obj_type] for payload_path, obj_type in items]
+        }
+        response = self._call(request, self.timeout * len(items))
+        
+        if not response.get("ok") and response.get("error", {}).get("code") == "INVALID_OPERATION":
+            return super().compute_swhid_batch(items)
+        self._check_response(response)
+        
+        swhids = response.get("swhids")
+        if not isinstance(swhids, list) or len(swhids) != len(items) or not all(swhids):
+            raise RuntimeError("Missing SWHIDs in batch response")
+        
+        return swhids
+    
+    @staticmethod
+    def _check_response(response: Dict[str, Any]) -> None:
+        """Raise if a protocol response reports an error."""
+        if not response.get("ok"):
+            error = response.get("error", {})
+            error_msg = error.get("message", "Unknown error")
+            error_code = error.get("code", "UNKNOWN")
+            if "index" in error:
+                error_msg = f"item {error['index']}: {error_msg}"
+            raise RuntimeError(f"Implementation error [{error_code}]: {error_msg}")
+    
+    def _call(
+        self,
+        request: Dict[str, Any],
+        timeout: float,
+        capture_stderr: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Run the command with a request on stdin and return its response.
+        
+        A non-zero exit is only an error here if the command did not answer
+        with a protocol response; error responses are returned to the caller.
+        stderr is discarded unless capture_stderr is set: when the command
+        fails without a response, the request is run again with stderr
+        captured so the error message can include it.
+        """
         # Prepare environment
         env = self._prepare_environment()
         
         # Create isolated working directory
-        work_dir = tempfile.mkdtemp(prefix="swhid_impl_")
+        work_dir = _make_work_dir(self._session_dir, self._dir_counter)
         
         try:
+            rss_before = children_max_rss_kb()
+            start_time = time.monotonic()
+            
+            popen_kwargs = self._popen_kwargs
+            if capture_stderr:
+                popen_kwargs = dict(popen_kwargs, stderr=subprocess.PIPE)
+            
             # Start process with resource limits
             process = subprocess.Popen(
                 self.command,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                encoding='utf-8',
-                errors='replace',
                 env=env,
                 cwd=work_dir,
-                preexec_fn=self._set_resource_limits if os.name != 'nt' else None
+                **popen_kwargs
             )
+            self._apply_limits(process.pid)
+            pidfd = _open_pidfd(process.pid)
             
-            # Monitor process for RSS
-            proc_monitor = psutil.Process(process.pid)
-            max_rss_kb = 0
+            monitor = _RssMonitor(process.pid, self.max_rss_mb * 1024, lambda: _kill(process, pidfd))
+            monitor.start()
             
             # Send request
-            request_json = json.dumps(request)
+            request_bytes = _dumps(request)
             
             try:
-                stdout, stderr = process.communicate(
-                    input=request_json,
-                    timeout=self.timeout
-                )
-                
-                # Get final RSS
-                try:
-                    max_rss_kb = int(proc_monitor.memory_info().rss / 1024)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-                
+                if _IS_POSIX:
+                    stdout_bytes, stderr_bytes = _communicate(
+                        process, pidfd, request_bytes, timeout
+                    )
+                else:
+                    # select() only works on sockets on Windows
+                    stdout_bytes, stderr_bytes = process.communicate(
+                        input=request_bytes,
+                        timeout=timeout
+                    )
             except subprocess.TimeoutExpired:
-                # Kill process and all children
-                try:
-                    proc_monitor.terminate()
-                    proc_monitor.wait(timeout=5)
-                except psutil.TimeoutExpired:
-                    proc_monitor.kill()
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-                
-                raise RuntimeError(f"Implementation timed out after {self.timeout}s")
+                _kill(process, pidfd)
+                process.wait()
+                raise RuntimeError(f"Implementation timed out after {timeout}s")
+            finally:
+                monitor.stop()
+                if pidfd is not None:
+                    os.close(pidfd)
+            
+            if monitor.killed:
+                raise RuntimeError(
+                    f"RSS limit exceeded: {monitor.peak_kb}KB > {self.max_rss_mb * 1024}KB"
+                )
+            
+            # Replace invalid UTF-8 sequences instead of raising UnicodeDecodeError
+            stdout = stdout_bytes.decode("utf-8", errors="replace")
+            stderr = (stderr_bytes or b"").decode("utf-8", errors="replace")
+            
+            if monitor.supported:
+                max_rss_kb = monitor.peak_kb
+            else:
+                # RUSAGE_CHILDREN reports the peak RSS of the largest reaped child,
+                # so it only moves when this child set a new high-water mark.
+                rss_after = children_max_rss_kb()
+                max_rss_kb = rss_after if rss_after > rss_before else 0
             
             # Check RSS limit
             if max_rss_kb > self.max_rss_mb * 1024:
@@ -398,54 +1107,70 @@ class JSONProtocolAdapter(SwhidImplementation):
                     f"RSS limit exceeded: {max_rss_kb}KB > {self.max_rss_mb * 1024}KB"
                 )
             
-            if process.returncode != 0:
-                error_msg = stderr.strip() or stdout.strip() or "Unknown error"
-                raise RuntimeError(f"Process failed (exit {process.returncode}): {error_msg}")
-            
             # Parse response
             try:
-                response = json.loads(stdout)
+                response = _loads(stdout)
             except json.JSONDecodeError as e:
-                raise RuntimeError(f"Invalid JSON response: {e}\nOutput: {stdout[:200]}")
+                response = None
+                parse_error = f"Invalid JSON response: {e}\nOutput: {stdout[:200]}"
+            else:
+                parse_error = f"Invalid JSON response: expected an object\nOutput: {stdout[:200]}"
             
-            if not response.get("ok"):
-                error = response.get("error", {})
-                error_msg = error.get("message", "Unknown error")
-                error_code = error.get("code", "UNKNOWN")
-                raise RuntimeError(f"Implementation error [{error_code}]: {error_msg}")
+            if not isinstance(response, dict) or "ok" not in response:
+                if process.returncode != 0:
+                    if not capture_stderr:
+                        return self._call(request, timeout, capture_stderr=True)
+                    error_msg = stderr.strip() or stdout.strip() or "Unknown error"
+                    raise RuntimeError(f"Process failed (exit {process.returncode}): {error_msg}")
+                raise RuntimeError(parse_error)
             
-            swhid = response.get("swhid")
-            if not swhid:
-                raise RuntimeError("No SWHID in response")
+            if self.metrics_sink is not None:
+                # Prefer the command's own timings; it may not report any
+                metrics = response.get("metrics")
+                if not isinstance(metrics, dict):
+                    metrics = {}
+                self.metrics_sink.append(
+                    metrics.get("wall_ms", (time.monotonic() - start_time) * 1000),
+                    metrics.get("cpu_ms", 0.0),
+                    max_rss_kb
+                )
             
-            return swhid
+            return response
             
         finally:
-            # Cleanup
-            try:
-                shutil.rmtree(work_dir, ignore_errors=True)
-            except Exception:
-                pass
+            _remove_work_dir(work_dir)
     
     def _prepare_environment(self) -> Dict[str, str]:
         """Prepare clean environment for subprocess."""
         return prepare_subprocess_environment(
             clean_env=self.clean_env,
-            project_root=str(Path(__file__).parent.parent.parent.absolute())
+            project_root=_PROJECT_ROOT
         )
     
+    def _apply_limits(self, pid: int) -> None:
+        """Apply resource limits to a freshly started implementation (Linux only)."""
+        if not _USE_PRLIMIT:
+            return
+        max_rss_bytes = self.max_rss_mb * 1024 * 1024
+        try:
+            resource.prlimit(pid, resource.RLIMIT_AS, (max_rss_bytes, max_rss_bytes))
+            resource.prlimit(pid, resource.RLIMIT_CPU, (self.max_cpu_time, self.max_cpu_time))
+        except (ValueError, OSError) as e:
+            logger.warning(f"Could not set resource limits: {e}")
+    
     def _set_resource_limits(self):
         """Set resource limits for subprocess (Unix only)."""
-        max_cpu_time = self.max_cpu_time if hasattr(self, 'max_cpu_time') else 60
-        set_resource_limits(self.max_rss_mb, max_cpu_time)
+        set_resource_limits(self.max_rss_mb, self.max_cpu_time)
     
     def detect_object_type(self, payload_path: str) -> str:
         """Detect object type (default implementation)."""
-        from pathlib import Path
-        path = Path(payload_path)
-        if path.is_file():
+        try:
+            mode = os.stat(payload_path).st_mode
+        except OSError:
+            mode = 0
+        if stat.S_ISREG(mode):
             return "content"
-        elif path.is_dir():
+        elif stat.S_ISDIR(mode):
             return "directory"
         else:
             raise ValueError(f"Payload is neither file nor directory: {payload_path}")
@@ -11,9 +11,10 @@ import tempfile
 import tarfile
 import platform
 import stat
+import threading
 import time
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,11 +26,18 @@ class ResourceManager:
     def __init__(self):
         """Initialize resource manager."""
         self._temp_dirs: List[str] = []
+        # Tarball path -> extracted path, so each tarball is only extracted
+        # once however many implementations and tests use it
+        self._extracted: Dict[str, str] = {}
+        self._extract_lock = threading.Lock()
     
     def extract_tarball_if_needed(self, payload_path: str, config_dir: str) -> str:
         """
         Extract tarball to temporary directory if payload is a .tar.gz file.
         
+        A tarball is extracted once and the extracted path reused until
+        cleanup_temp_dirs() is called, so implementations must not modify it.
+        
         Args:
             payload_path: Path to payload (may be .tar.gz file)
             config_dir: Directory containing config file (for resolving relative paths)
@@ -47,6 +55,15 @@ class ResourceManager:
         if not os.path.exists(payload_path):
             raise FileNotFoundError(f"Tarball not found: {payload_path}")
         
+        with self._extract_lock:
+            extracted_path = self._extracted.get(payload_path)
+            if extracted_path is None or not os.path.exists(extracted_path):
+                extracted_path = self._extract_tarball(payload_path)
+                self._extracted[payload_path] = extracted_path
+        return extracted_path
+    
+    def _extract_tarball(self, payload_path: str) -> str:
+        """Extract a tarball to a new temporary directory and return the extracted path."""
         # Create temporary directory
         temp_dir = tempfile.mkdtemp(prefix="swhid_test_")
         self._temp_dirs.append(temp_dir)
@@ -95,6 +112,7 @@ class ResourceManager:
                 except Exception as e:
                     logger.warning(f"Failed to clean up temporary directory {temp_dir}: {e}")
         self._temp_dirs.clear()
+        self._extracted.clear()
     
     def _rmtree_windows(self, path: str) -> None:
         """
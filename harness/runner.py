@@ -6,7 +6,7 @@ This module handles test execution, orchestration, and parallel execution.
 
 import os
 import time
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, List, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from .plugins.base import SwhidImplementation, SwhidTestResult, TestMetrics
@@ -48,6 +48,26 @@ class TestRunner:
         self.implementations = implementations
         self.resource_manager = resource_manager
         self.git_manager = git_manager
+        self.config_dir = os.path.dirname(os.path.abspath(config_path))
+        # Implementation names and supported SWHID type codes are fixed for
+        # the lifetime of an implementation, so they are queried once
+        self._impl_names: Dict[SwhidImplementation, str] = {}
+        self._supported_types: Dict[SwhidImplementation, FrozenSet[str]] = {}
+    
+    def _impl_name(self, implementation: SwhidImplementation) -> str:
+        """Get an implementation's name, querying it only once."""
+        name = self._impl_names.get(implementation)
+        if name is None:
+            name = self._impl_names[implementation] = implementation.get_info().name
+        return name
+    
+    def _supported_type_codes(self, implementation: SwhidImplementation) -> FrozenSet[str]:
+        """Get the SWHID type codes an implementation supports, querying it only once."""
+        codes = self._supported_types.get(implementation)
+        if codes is None:
+            codes = frozenset(implementation.get_capabilities().supported_types)
+            self._supported_types[implementation] = codes
+        return codes
     
     def run_single_test(
         self,
@@ -76,12 +96,12 @@ class TestRunner:
         Returns:
             SwhidTestResult with test outcome
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
+        impl_name = self._impl_name(implementation)
         
         try:
             # Extract tarball if needed
-            config_dir = os.path.dirname(os.path.abspath(self.config_path))
-            actual_payload_path = self.resource_manager.extract_tarball_if_needed(payload_path, config_dir)
+            actual_payload_path = self.resource_manager.extract_tarball_if_needed(payload_path, self.config_dir)
             
             # Determine object type from category if available, otherwise auto-detect
             if category:
@@ -104,15 +124,14 @@ class TestRunner:
                 obj_type = implementation.detect_object_type(actual_payload_path)
             
             # Check if implementation supports this object type
-            capabilities = implementation.get_capabilities()
             swhid_code = obj_type_to_swhid_code(obj_type)
             
-            if swhid_code not in capabilities.supported_types:
-                logger.info(f"Skipping {payload_name} for {implementation.get_info().name}: unsupported type '{obj_type}' (SWHID code '{swhid_code}')")
+            if swhid_code not in self._supported_type_codes(implementation):
+                logger.info(f"Skipping {payload_name} for {impl_name}: unsupported type '{obj_type}' (SWHID code '{swhid_code}')")
                 return SwhidTestResult(
                     payload_name=payload_name,
                     payload_path=payload_path,
-                    implementation=implementation.get_info().name,
+                    implementation=impl_name,
                     swhid=None,
                     error=f"Object type '{obj_type}' (SWHID code '{swhid_code}') not supported by implementation",
                     duration=0.0,
@@ -133,7 +152,7 @@ class TestRunner:
                 compute_kwargs["hash_algo"] = hash_algo
             
             swhid = implementation.compute_swhid(actual_payload_path, obj_type, **compute_kwargs)
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             
             # Determine SWHID version from result
             if version is not None:
@@ -148,7 +167,7 @@ class TestRunner:
             return SwhidTestResult(
                 payload_name=payload_name,
                 payload_path=payload_path,
-                implementation=implementation.get_info().name,
+                implementation=impl_name,
                 swhid=swhid,
                 error=None,
                 duration=duration,
@@ -157,18 +176,18 @@ class TestRunner:
             )
             
         except Exception as e:
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             error_str = str(e)
             # Check if this is an "unsupported type" error that should be skipped
             if any(phrase in error_str.lower() for phrase in [
                 "doesn't support", "does not support", "not support", 
                 "unsupported", "not supported"
             ]):
-                logger.info(f"Skipping {payload_name} for {implementation.get_info().name}: {error_str}")
+                logger.info(f"Skipping {payload_name} for {impl_name}: {error_str}")
                 return SwhidTestResult(
                     payload_name=payload_name,
                     payload_path=payload_path,
-                    implementation=implementation.get_info().name,
+                    implementation=impl_name,
                     swhid=None,
                     error=f"Object type not supported: {error_str}",
                     duration=0.0,
@@ -178,7 +197,7 @@ class TestRunner:
             return SwhidTestResult(
                 payload_name=payload_name,
                 payload_path=payload_path,
-                implementation=implementation.get_info().name,
+                implementation=impl_name,
                 swhid=None,
                 error=error_str,
                 duration=duration,
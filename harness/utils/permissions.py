@@ -9,12 +9,40 @@ import os
 import stat
 import subprocess
 import platform
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterator, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _iter_files(source_path: str) -> Iterator[Tuple[str, os.DirEntry]]:
+    """
+    Yield (relative path, DirEntry) for every non-directory under source_path.
+    
+    Lists the same entries as the files of os.walk (symlinked directories are
+    not followed), but relative paths are built while descending instead of
+    with os.path.relpath, and the DirEntry caches its stat result. Relative
+    paths use forward slashes.
+    """
+    pending = [(source_path, '')]
+    while pending:
+        dir_path, prefix = pending.pop()
+        try:
+            it = os.scandir(dir_path)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    yield prefix + entry.name, entry
+                elif not entry.is_symlink():
+                    pending.append((entry.path, prefix + entry.name + '/'))
+
+
 def get_source_permissions(source_path: str) -> Dict[str, bool]:
     """
     Read file permissions from source path.
@@ -53,23 +81,16 @@ def get_source_permissions(source_path: str) -> Dict[str, bool]:
     
     # Fall back to filesystem permissions (works on Unix, or if Git check failed)
     if os.path.isdir(source_path):
-        for root, dirs, files in os.walk(source_path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                rel_path = os.path.relpath(file_path, source_path)
-                # Normalize path separators to forward slashes for cross-platform consistency
-                rel_path = rel_path.replace(os.sep, '/')
-                
-                # Skip if we already got permission from Git index
-                if rel_path in source_permissions:
-                    continue
-                
-                try:
-                    stat_info = os.stat(file_path)
-                    is_executable = bool(stat_info.st_mode & stat.S_IEXEC)
-                    source_permissions[rel_path] = is_executable
-                except OSError:
-                    source_permissions[rel_path] = False
+        for rel_path, entry in _iter_files(source_path):
+            # Skip if we already got permission from Git index
+            if rel_path in source_permissions:
+                continue
+            
+            try:
+                is_executable = bool(entry.stat().st_mode & stat.S_IEXEC)
+                source_permissions[rel_path] = is_executable
+            except OSError:
+                source_permissions[rel_path] = False
     elif os.path.isfile(source_path):
         # Skip if we already got permission from Git index
         if '.' not in source_permissions:
@@ -120,38 +141,34 @@ def _read_permissions_from_git_index_dir(source_path: str, repo_root: str) -> Di
     """
     permissions: Dict[str, bool] = {}
     
-    for root, dirs, files in os.walk(source_path):
-        for file in files:
-            file_path = os.path.join(root, file)
-            rel_path = os.path.relpath(file_path, source_path)
-            # Normalize path separators to forward slashes for cross-platform consistency
-            rel_path = rel_path.replace(os.sep, '/')
-            
-            # Get path relative to repo root
-            try:
-                repo_rel_path = os.path.relpath(file_path, repo_root)
-                # Normalize for Git command (Git uses forward slashes)
-                repo_rel_path = repo_rel_path.replace(os.sep, '/')
-                # Check Git index
-                result = subprocess.run(
-                    ['git', 'ls-files', '--stage', repo_rel_path],
-                    cwd=repo_root,
-                    capture_output=True,
-                    text=True,
-                    encoding='utf-8',
-                    errors='replace',
-                    timeout=2
-                )
-                if result.returncode == 0 and result.stdout.strip():
-                    # Format: <mode> <sha> <stage> <path>
-                    parts = result.stdout.strip().split()
-                    if parts:
-                        git_mode = parts[0]
-                        # Mode is octal string, e.g., '100755' for executable
-                        is_executable = git_mode.endswith('755')
-                        permissions[rel_path] = is_executable
-            except (subprocess.TimeoutExpired, subprocess.CalledProcessError, ValueError):
-                pass
+    for rel_path, entry in _iter_files(source_path):
+        file_path = entry.path
+        
+        # Get path relative to repo root
+        try:
+            repo_rel_path = os.path.relpath(file_path, repo_root)
+            # Normalize for Git command (Git uses forward slashes)
+            repo_rel_path = repo_rel_path.replace(os.sep, '/')
+            # Check Git index
+            result = subprocess.run(
+                ['git', 'ls-files', '--stage', repo_rel_path],
+                cwd=repo_root,
+                capture_output=True,
+                text=True,
+                encoding='utf-8',
+                errors='replace',
+                timeout=2
+            )
+            if result.returncode == 0 and result.stdout.strip():
+                # Format: <mode> <sha> <stage> <path>
+                parts = result.stdout.strip().split()
+                if parts:
+                    git_mode = parts[0]
+                    # Mode is octal string, e.g., '100755' for executable
+                    is_executable = git_mode.endswith('755')
+                    permissions[rel_path] = is_executable
+        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, ValueError):
+            pass
     
     return permissions
 
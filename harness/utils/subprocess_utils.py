@@ -6,14 +6,18 @@ environment preparation, and resource limit management.
 """
 
 import os
-import signal
+import sys
 import resource
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from pathlib import Path
 from typing import Dict, Callable, Any, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# ru_maxrss is reported in kilobytes on Linux but in bytes on macOS
+_RU_MAXRSS_DIVISOR = 1024 if sys.platform == 'darwin' else 1
+
 
 def prepare_subprocess_environment(
     clean_env: bool = True,
@@ -97,41 +101,109 @@ def set_resource_limits(
         logger.warning(f"Could not set resource limits: {e}")
 
 
+def children_max_rss_kb() -> int:
+    """
+    Get the peak RSS of the largest terminated child process.
+    
+    Returns:
+        ru_maxrss of RUSAGE_CHILDREN, in KB
+    """
+    return resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss // _RU_MAXRSS_DIVISOR
+
+
+def self_max_rss_kb() -> int:
+    """
+    Get the peak RSS of the current process.
+    
+    Returns:
+        ru_maxrss of RUSAGE_SELF, in KB
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // _RU_MAXRSS_DIVISOR
+
+
+def read_pss_kb(pid: Optional[int] = None) -> Optional[int]:
+    """
+    Read the proportional set size (PSS) of a process (Linux only).
+    
+    PSS splits shared pages (libpython, shared libraries) between the
+    processes mapping them, so it does not overcount the way RSS does.
+    
+    Args:
+        pid: Process ID (defaults to the current process)
+        
+    Returns:
+        PSS in KB, or None if /proc/<pid>/smaps_rollup is unavailable
+    """
+    path = f"/proc/{'self' if pid is None else pid}/smaps_rollup"
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    
+    for line in data.splitlines():
+        if line.startswith(b"Pss:"):
+            return int(line.split()[1])
+    return None
+
+
+def read_rss_kb(pid: Optional[int] = None) -> Optional[int]:
+    """
+    Read the resident set size (VmRSS) of a process (Linux only).
+    
+    Args:
+        pid: Process ID (defaults to the current process)
+        
+    Returns:
+        RSS in KB, or None if /proc/<pid>/status is unavailable
+    """
+    path = f"/proc/{'self' if pid is None else pid}/status"
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    
+    for line in data.splitlines():
+        if line.startswith(b"VmRSS:"):
+            return int(line.split()[1])
+    return None
+
+
 def run_with_timeout(
     func: Callable[[], Any],
-    timeout: float
+    timeout: float,
+    executor: Optional[ThreadPoolExecutor] = None
 ) -> Any:
     """
-    Run a function with timeout using signal (Unix only).
+    Run a function with timeout in a worker thread.
+    
+    Unlike SIGALRM, this works on any platform and from any thread, and it
+    leaves signal handlers and interrupted system calls alone.
     
     Args:
         func: Function to execute
         timeout: Timeout in seconds
+        executor: Executor to run func in (a single-use one if None)
         
     Returns:
         Function result
         
     Raises:
-        TimeoutError: If function exceeds timeout (Unix only)
+        TimeoutError: If function exceeds timeout
         
     Note:
-        On Windows, timeout is not enforced (function runs without timeout).
+        A thread cannot be interrupted, so on timeout the call keeps running
+        in the background; run uncooperative code in a subprocess instead.
     """
-    if os.name == 'nt':
-        # Windows doesn't support SIGALRM
-        return func()
-    
-    def timeout_handler(signum, frame):
-        raise TimeoutError(f"Operation timed out after {timeout}s")
-    
-    # Set up signal handler
-    old_handler = signal.signal(signal.SIGALRM, timeout_handler)
-    signal.alarm(int(timeout))
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="swhid-timeout")
     
     try:
-        result = func()
-        return result
+        return executor.submit(func).result(timeout=timeout)
+    except FuturesTimeoutError:
+        raise TimeoutError(f"Operation timed out after {timeout}s")
     finally:
-        signal.alarm(0)
-        signal.signal(signal.SIGALRM, old_handler)
-
+        if own_executor:
+            executor.shutdown(wait=False)
@@ -4,19 +4,26 @@ Git Command SWHID Implementation Plugin
 This module provides an interface to Git-based SWHID computation using git commands.
 """
 
+import atexit
 import os
 import sys
 import subprocess
 import tempfile
+import threading
 import shutil
+import stat
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from harness.plugins.base import SwhidImplementation, ImplementationInfo, ImplementationCapabilities
 
 class Implementation(SwhidImplementation):
     """Git command SWHID implementation plugin."""
     
+    # Repository whose object store is reused by every directory computation
+    _scratch_repo: Optional[str] = None
+    _scratch_lock = threading.Lock()
+    
     def get_info(self) -> ImplementationInfo:
         """Return implementation metadata."""
         return ImplementationInfo(
@@ -102,6 +109,46 @@ class Implementation(SwhidImplementation):
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"git hash-object failed: {e}")
     
+    def compute_swhid_batch(self, items: List[Tuple[str, Optional[str]]]) -> List[str]:
+        """Compute SWHIDs in item order, hashing all content payloads with one git process."""
+        content = [
+            (i, os.path.abspath(payload_path))
+            for i, (payload_path, obj_type) in enumerate(items)
+            # --stdin-paths reads one path per line; missing files are left to
+            # compute_swhid so they raise the same error
+            if obj_type == "content" and "\n" not in payload_path and os.path.exists(payload_path)
+        ]
+        if len(content) < 2:
+            return super().compute_swhid_batch(items)
+        
+        swhids: List[Optional[str]] = [None] * len(items)
+        blob_ids = self._hash_objects([path for _, path in content])
+        for (i, _), blob_id in zip(content, blob_ids):
+            swhids[i] = f"swh:1:cnt:{blob_id}"
+        return [
+            swhid if swhid is not None else self.compute_swhid(payload_path, obj_type)
+            for swhid, (payload_path, obj_type) in zip(swhids, items)
+        ]
+    
+    def _hash_objects(self, file_paths: List[str]) -> List[str]:
+        """Compute blob IDs of many files with one git hash-object process."""
+        try:
+            # Paths are passed as bytes so undecodable file names round-trip
+            result = subprocess.run(
+                ["git", "hash-object", "--no-filters", "--stdin-paths"],
+                input=b"".join(os.fsencode(path) + b"\n" for path in file_paths),
+                capture_output=True,
+                check=True
+            )
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"Failed to compute Git SWHID: git hash-object failed: {e}")
+        blob_ids = result.stdout.decode('ascii').split()
+        if len(blob_ids) != len(file_paths):
+            raise RuntimeError(
+                f"git hash-object returned {len(blob_ids)} hashes for {len(file_paths)} files"
+            )
+        return blob_ids
+    
     def _get_source_permissions(self, source_dir):
         """Read intended permissions from source files before copying.
         
@@ -193,86 +240,101 @@ class Implementation(SwhidImplementation):
         
         return permissions
     
+    def _scratch_git_dir(self) -> str:
+        """Return the git dir of the repository shared by directory computations.
+        
+        The repository is created on first use and removed at exit. It only
+        collects the blob and tree objects; each computation uses its own
+        index file, so concurrent computations do not interfere.
+        """
+        with Implementation._scratch_lock:
+            if Implementation._scratch_repo is None:
+                repo_path = tempfile.mkdtemp(prefix="swhid-git-cmd-")
+                atexit.register(shutil.rmtree, repo_path, ignore_errors=True)
+                subprocess.run(["git", "init"], cwd=repo_path, check=True,
+                             capture_output=True)
+                
+                # Configure Git for SWHID testing (preserve line endings and permissions)
+                # This is critical for cross-platform consistency
+                for key, value in (("core.autocrlf", "false"),
+                                   ("core.filemode", "true"),
+                                   ("core.precomposeunicode", "false")):
+                    subprocess.run(["git", "config", key, value],
+                                 cwd=repo_path, check=True, capture_output=True)
+                Implementation._scratch_repo = repo_path
+            return os.path.join(Implementation._scratch_repo, ".git")
+    
     def _compute_directory_swhid(self, dir_path: str) -> str:
         """Compute directory SWHID using git commands."""
-        # Read source permissions BEFORE copying (critical for Windows)
-        # This preserves the intended permissions from source files
-        source_permissions = self._get_source_permissions(dir_path) if os.path.isdir(dir_path) else {}
+        if not os.path.isdir(dir_path):
+            # A single file is hashed as the only entry of a directory
+            return self._compute_single_file_tree_swhid(dir_path)
         
-        # Create a temporary Git repository
-        with tempfile.TemporaryDirectory() as temp_dir:
-            repo_path = os.path.join(temp_dir, "repo")
-            os.makedirs(repo_path)
-            
-            # Initialize Git repository
-            subprocess.run(["git", "init"], cwd=repo_path, check=True, 
-                         capture_output=True)
-            
-            # Configure Git for SWHID testing (preserve line endings and permissions)
-            # This is critical for cross-platform consistency
-            subprocess.run(["git", "config", "core.autocrlf", "false"], 
-                         cwd=repo_path, check=True, capture_output=True)
-            subprocess.run(["git", "config", "core.filemode", "true"], 
-                         cwd=repo_path, check=True, capture_output=True)
-            subprocess.run(["git", "config", "core.precomposeunicode", "false"], 
-                         cwd=repo_path, check=True, capture_output=True)
-            
-            # Copy the directory contents maintaining the structure
-            # Use a target subdirectory to avoid conflicts with .git
-            target_path = os.path.join(repo_path, "target")
-            if os.path.isdir(dir_path):
-                # Copy the entire directory structure, preserving symlinks
-                # On Windows, symlinks may not be supported, so handle gracefully
-                try:
-                    shutil.copytree(dir_path, target_path, symlinks=True)
-                except (OSError, NotImplementedError) as e:
-                    # If symlink copy fails (e.g., on Windows without privileges),
-                    # fall back to copying without symlinks
-                    # This is a known limitation on Windows
-                    shutil.copytree(dir_path, target_path, symlinks=False)
-            else:
-                # If it's a file, create target directory and copy file
-                os.makedirs(target_path)
-                shutil.copy2(dir_path, target_path)
-            
-            # Move contents from target to repo root (Git tree is for repo root)
-            # We need to move the contents, not the directory itself
-            for item in os.listdir(target_path):
-                src = os.path.join(target_path, item)
-                dst = os.path.join(repo_path, item)
-                if os.path.isdir(src):
-                    shutil.move(src, dst)
-                else:
-                    shutil.move(src, dst)
-            os.rmdir(target_path)
+        # Read source permissions (critical for Windows, where they come
+        # from the Git index rather than the filesystem)
+        return self._compute_work_tree_swhid(dir_path, self._get_source_permissions(dir_path))
+    
+    def _compute_single_file_tree_swhid(self, file_path: str) -> str:
+        """Compute the SWHID of a directory holding only the given file, without copying it."""
+        env = dict(os.environ, GIT_DIR=self._scratch_git_dir())
+        
+        # Write the blob, then build the tree from it directly; the mode is
+        # what git add would record for a copy of the file
+        result = subprocess.run(
+            ["git", "hash-object", "-w", "--no-filters", file_path],
+            env=env, capture_output=True, check=True
+        )
+        blob_id = result.stdout.decode('ascii').strip()
+        mode = "100755" if os.stat(file_path).st_mode & stat.S_IXUSR else "100644"
+        
+        result = subprocess.run(
+            ["git", "mktree", "-z"],
+            input=f"{mode} blob {blob_id}\t".encode('ascii') + os.fsencode(os.path.basename(file_path)) + b"\0",
+            env=env, capture_output=True, check=True
+        )
+        tree_id = result.stdout.decode('ascii').strip()
+        
+        return f"swh:1:dir:{tree_id}"
+    
+    def _compute_work_tree_swhid(self, work_tree: str, source_permissions) -> str:
+        """Compute the tree SWHID of a directory, staged in place without copying it."""
+        git_dir = self._scratch_git_dir()
+        
+        with tempfile.TemporaryDirectory(dir=git_dir) as index_dir:
+            env = dict(
+                os.environ,
+                GIT_DIR=git_dir,
+                GIT_WORK_TREE=work_tree,
+                GIT_INDEX_FILE=os.path.join(index_dir, "index"),
+            )
+            # The payload may belong to another user; it is only read
+            git = ["git", "-c", "safe.directory=*"]
             
             # Add all files to Git
             # Note: We configure core.autocrlf=false in the repo, so line endings are preserved
             # The --no-filters flag is only valid for git hash-object, not git add
-            subprocess.run(["git", "add", "."], cwd=repo_path, check=True,
+            subprocess.run(git + ["add", "."], cwd=work_tree, env=env, check=True,
                          capture_output=True)
             
             # Apply executable bits based on source permissions
             # This is critical on Windows where filesystem permissions may not be preserved
             # We use git update-index to set executable bits, which works cross-platform
             for rel_path, is_executable in source_permissions.items():
-                if is_executable:
-                    # Check if file exists in repo (handle nested paths)
-                    file_path = os.path.join(repo_path, rel_path)
-                    if os.path.exists(file_path):
-                        try:
-                            subprocess.run(
-                                ["git", "update-index", "--chmod=+x", rel_path],
-                                cwd=repo_path, check=True, capture_output=True
-                            )
-                        except subprocess.CalledProcessError:
-                            # If update-index fails, continue (file might not be in index)
-                            pass
+                if is_executable and os.path.exists(os.path.join(work_tree, rel_path)):
+                    try:
+                        subprocess.run(
+                            git + ["update-index", "--chmod=+x", rel_path],
+                            cwd=work_tree, env=env, check=True, capture_output=True
+                        )
+                    except subprocess.CalledProcessError:
+                        # If update-index fails, continue (file might not be in index)
+                        pass
             
             # Get the tree hash for the root directory
             result = subprocess.run(
-                ["git", "write-tree"],
-                cwd=repo_path,
+                git + ["write-tree"],
+                cwd=work_tree,
+                env=env,
                 capture_output=True,
                 text=True,
                 encoding='utf-8',
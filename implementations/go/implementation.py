@@ -215,28 +215,30 @@ class Implementation(SwhidImplementation):
         # For content type, read from stdin
         if cmd[-1] == "content":
             try:
+                # Give the file to the child as its stdin, so the content is
+                # never loaded into (or copied through) this process
                 with open(payload_path, 'rb') as f:
-                    content = f.read()
-
-                result = subprocess.run(
-                    cmd,
-                    input=content,
-                    capture_output=True,
-                    timeout=30
-                )
+                    if hasattr(os, 'posix_fadvise'):
+                        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                    result = subprocess.run(
+                        cmd,
+                        stdin=f,
+                        capture_output=True,
+                        timeout=30
+                    )
 
                 if result.returncode != 0:
                     stderr = result.stderr.decode('utf-8', errors='replace')
                     raise RuntimeError(f"Go implementation failed: {stderr}")
 
-                output = result.stdout.decode('utf-8', errors='replace').strip()
+                output = result.stdout.strip()
                 if not output:
                     raise RuntimeError("No output from Go implementation")
 
-                if not output.startswith("swh:"):
-                    raise RuntimeError(f"Invalid SWHID format: {output}")
+                if not output.startswith(b"swh:"):
+                    raise RuntimeError(f"Invalid SWHID format: {output.decode('utf-8', errors='replace')}")
 
-                return output
+                return output.decode('utf-8', errors='replace')
 
             except subprocess.TimeoutExpired:
                 raise RuntimeError("Go implementation timed out")
@@ -256,23 +258,22 @@ class Implementation(SwhidImplementation):
                 result = subprocess.run(
                     cmd,
                     capture_output=True,
-                    text=True,
-                    encoding='utf-8',
-                    errors='replace',
                     timeout=30
                 )
 
+                # Output is kept as bytes; only what is reported gets decoded
                 if result.returncode != 0:
-                    raise RuntimeError(f"Go implementation failed: {result.stderr}")
+                    stderr = result.stderr.decode('utf-8', errors='replace')
+                    raise RuntimeError(f"Go implementation failed: {stderr}")
 
                 output = result.stdout.strip()
                 if not output:
                     raise RuntimeError("No output from Go implementation")
 
-                if not output.startswith("swh:"):
-                    raise RuntimeError(f"Invalid SWHID format: {output}")
+                if not output.startswith(b"swh:"):
+                    raise RuntimeError(f"Invalid SWHID format: {output.decode('utf-8', errors='replace')}")
 
-                return output
+                return output.decode('utf-8', errors='replace')
 
             except subprocess.TimeoutExpired:
                 raise RuntimeError("Go implementation timed out")
@@ -5,12 +5,15 @@ This module provides an interface to the Python SWHID implementation
 for the testing harness.
 """
 
+import hashlib
 import subprocess
 import os
 import sys
-import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from harness.plugins.base import SwhidImplementation, ImplementationInfo, ImplementationCapabilities
 from harness.exceptions import ImplementationError, TestExecutionError, IOError as HarnessIOError
@@ -22,13 +25,214 @@ try:
     )
     from swh.model.git_objects import revision_git_object, release_git_object
     from swh.model import hashutil
+    from swh.model.from_disk import Content as DiskContent, Directory as DiskDirectory
+    from swh.model.model import Snapshot
     SWH_MODEL_AVAILABLE = True
 except ImportError:
     SWH_MODEL_AVAILABLE = False
 
+try:
+    import dulwich.repo
+    DULWICH_AVAILABLE = True
+except ImportError:
+    DULWICH_AVAILABLE = False
+
+# Object types computed in-process; the same as swh.model.cli --type (see
+# swh.model.cli.identify_object), without starting an interpreter per call
+_IN_PROCESS_TYPES = ("auto", "content", "directory", "snapshot")
+
+# Mapping between dulwich types and Software Heritage ones (as in swh.model.cli)
+_DULWICH_TYPES = {
+    b"blob": "content",
+    b"tree": "directory",
+    b"commit": "revision",
+    b"tag": "release",
+}
+
+# Set to re-run is_available() probes instead of using the cached result
+_FORCE_RECHECK_ENV = "SWHID_FORCE_AVAILABILITY_RECHECK"
+
+# Number of repositories that keep a `git cat-file --batch` process open
+_MAX_BATCH_READERS = 8
+
+# Concurrent computations in compute_swhid_batch; each one mostly waits on a
+# git or swh.model.cli process, so more threads than cores pay off
+_BATCH_WORKERS = (os.cpu_count() or 1) * 2
+
+# Revision SWHIDs remembered per (repository, commit SHA); releases and
+# revisions over the same commits then skip the parse and hash
+_MAX_CACHED_REVISIONS = 1024
+
+_HEX_DIGITS = "0123456789abcdefABCDEF"
+
+# Commit signature header and the line that ends its value
+_GPGSIG_HDR = b'gpgsig '
+_GPGSIG_HDR_LEN = len(_GPGSIG_HDR)
+_PGP_SIG_END = b'-----END PGP SIGNATURE-----'
+
+
+def _parse_person(line: Optional[bytes]) -> Tuple[Optional["Person"], Optional[int], Optional[bytes]]:
+    """
+    Parse Git person line: b'Name <email> timestamp offset'
+    
+    Scans from the right (offset, then timestamp, then the email brackets)
+    instead of matching a backtracking regex. Works on the raw header bytes,
+    so names and emails are kept exactly as stored.
+    
+    Returns:
+        Tuple of (Person, timestamp, offset bytes), or (None, None, None)
+        if the line is missing or malformed
+    """
+    if not line:
+        return None, None, None
+    
+    offset_pos = line.rfind(b' ')
+    ts_pos = line.rfind(b' ', 0, offset_pos)
+    email_end = line.rfind(b'> ', 0, ts_pos + 1)
+    email_start = line.find(b' <', 1, email_end)
+    
+    offset = line[offset_pos + 1:]
+    ts = line[ts_pos + 1:offset_pos]
+    if (email_start <= 0 or email_end != ts_pos - 1 or not ts.isdigit()
+            or len(offset) != 5 or offset[:1] not in (b'+', b'-') or not offset[1:].isdigit()):
+        return None, None, None
+    
+    email = line[email_start + 2:email_end]
+    if not email:
+        return None, None, None
+    
+    # fullname should be the complete "Name <email>" string
+    return Person(
+        fullname=line[:email_end + 1],
+        name=line[:email_start],
+        email=email
+    ), int(ts), offset
+
+
+class _GitBatchReader:
+    """
+    Long-lived `git cat-file --batch` process for one repository.
+    
+    Objects are requested by writing a revision expression per line and read
+    back as "<sha> <type> <size>" followed by the raw content, so resolving
+    and reading any number of objects costs a single git startup.
+    """
+    
+    def __init__(self, repo_path: str):
+        self.repo_path = repo_path
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+    
+    def read(self, ref: str) -> Tuple[str, str, bytes]:
+        """
+        Read an object.
+        
+        Args:
+            ref: Any revision expression git accepts (SHA, ref name, "HEAD^{commit}", ...)
+        
+        Returns:
+            Tuple of (object SHA, object type, raw content)
+        """
+        if "\n" in ref:
+            raise ImplementationError(f"Invalid git object reference: {ref!r}", implementation="python")
+        
+        with self._lock:
+            # A process that died since the last call (or mid-request) is
+            # replaced once; a second failure is reported
+            for attempt in range(2):
+                if self._process is None or self._process.poll() is not None:
+                    self._process = subprocess.Popen(
+                        ["git", "cat-file", "--batch"],
+                        cwd=self.repo_path,
+                        stdin=subprocess.PIPE,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.DEVNULL
+                    )
+                process = self._process
+                
+                try:
+                    process.stdin.write(ref.encode("utf-8") + b"\n")
+                    process.stdin.flush()
+                    header = process.stdout.readline()
+                except (BrokenPipeError, OSError) as e:
+                    self._close_process()
+                    if attempt:
+                        raise ImplementationError(f"git cat-file failed: {e}", implementation="python")
+                    continue
+                
+                if not header:
+                    self._close_process()
+                    if attempt:
+                        raise ImplementationError("git cat-file exited unexpectedly", implementation="python")
+                    continue
+                break
+            
+            fields = header.split()
+            if len(fields) != 3:
+                raise ImplementationError(
+                    f"Git object not found: {ref} ({header.decode('utf-8', errors='replace').strip()})",
+                    implementation="python"
+                )
+            
+            sha, obj_type, size = fields
+            # Content is followed by a newline
+            content = process.stdout.read(int(size) + 1)
+            if len(content) != int(size) + 1:
+                self._close_process()
+                raise ImplementationError(f"git cat-file output truncated for {ref}", implementation="python")
+            return sha.decode("ascii"), obj_type.decode("ascii"), content[:-1]
+    
+    def _close_process(self) -> None:
+        if self._process is not None:
+            try:
+                self._process.stdin.close()
+            except OSError:
+                pass
+            self._process.stdout.close()
+            self._process.wait()
+            self._process = None
+    
+    def close(self) -> None:
+        """Stop the git process."""
+        with self._lock:
+            self._close_process()
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
 class Implementation(SwhidImplementation):
     """Python SWHID implementation plugin."""
     
+    # is_available() starts two interpreters, so its result is shared by all instances
+    _availability: Optional[bool] = None
+    _availability_lock = threading.Lock()
+    
+    def __init__(self):
+        # One cat-file process per recently used repository (payloads are often
+        # extracted to fresh temp directories, so the cache is bounded)
+        self._batch_readers: "OrderedDict[str, _GitBatchReader]" = OrderedDict()
+        self._batch_readers_lock = threading.Lock()
+        self._revision_swhids: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._revision_swhids_lock = threading.Lock()
+    
+    def _batch_reader(self, repo_path: str) -> _GitBatchReader:
+        """Return the cat-file batch reader for a repository."""
+        with self._batch_readers_lock:
+            reader = self._batch_readers.get(repo_path)
+            if reader is None:
+                reader = _GitBatchReader(repo_path)
+                self._batch_readers[repo_path] = reader
+                if len(self._batch_readers) > _MAX_BATCH_READERS:
+                    _, evicted = self._batch_readers.popitem(last=False)
+                    evicted.close()
+            else:
+                self._batch_readers.move_to_end(repo_path)
+            return reader
+    
     def get_info(self) -> ImplementationInfo:
         """Return implementation metadata."""
         return ImplementationInfo(
@@ -41,7 +245,15 @@ class Implementation(SwhidImplementation):
         )
     
     def is_available(self) -> bool:
-        """Check if Python implementation is available."""
+        """Check if Python implementation is available (probed once per process)."""
+        cls = type(self)
+        with cls._availability_lock:
+            if cls._availability is None or os.environ.get(_FORCE_RECHECK_ENV):
+                cls._availability = self._probe_available()
+            return cls._availability
+    
+    def _probe_available(self) -> bool:
+        """Check that swh.model and its CLI can be run."""
         try:
             # Check if swh.model is available
             result = subprocess.run(
@@ -94,6 +306,21 @@ class Implementation(SwhidImplementation):
         elif obj_type == "release":
             return self._compute_release_swhid(payload_path, tag=tag)
         
+        # Ensure snapshot type is used for git repos
+        if obj_type is None:
+            obj_type = self.detect_object_type(payload_path)
+        
+        if SWH_MODEL_AVAILABLE and obj_type in _IN_PROCESS_TYPES:
+            if obj_type != "snapshot" or DULWICH_AVAILABLE:
+                try:
+                    return self._compute_in_process(payload_path, obj_type)
+                except Exception as e:
+                    raise ImplementationError(
+                        f"Error running Python implementation: {e}",
+                        implementation="python",
+                        context={"original_error": str(e)}
+                    )
+        
         # Build the command
         cmd = ["python3", "-m", "swh.model.cli"]
         
@@ -101,13 +328,6 @@ class Implementation(SwhidImplementation):
         if obj_type and obj_type != "auto":
             cmd.extend(["--type", obj_type])
         
-        # Ensure snapshot type is passed for git repos
-        if obj_type is None:
-            obj_type = self.detect_object_type(payload_path)
-            if obj_type and obj_type != "auto":
-                # Reset and add again to ensure correct flag ordering
-                cmd = ["python3", "-m", "swh.model.cli", "--type", obj_type]
-        
         # Add the payload path
         cmd.append(payload_path)
         
@@ -116,15 +336,13 @@ class Implementation(SwhidImplementation):
             result = subprocess.run(
                 cmd,
                 capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='replace',
                 timeout=30
             )
             
             if result.returncode != 0:
+                stderr = result.stderr.decode('utf-8', errors='replace')
                 raise ImplementationError(
-                    f"Python implementation failed: {result.stderr}",
+                    f"Python implementation failed: {stderr}",
                     implementation="python"
                 )
             
@@ -137,8 +355,8 @@ class Implementation(SwhidImplementation):
                 )
             
             # The output format is: SWHID\tfilename (optional)
-            # We want just the SWHID part
-            swhid = output.split('\t')[0].strip()
+            # We want just the SWHID part; only that needs decoding
+            swhid = output.partition(b'\t')[0].strip().decode('utf-8', errors='replace')
             
             if not swhid.startswith("swh:"):
                 raise ImplementationError(
@@ -168,6 +386,70 @@ class Implementation(SwhidImplementation):
                 context={"original_error": str(e)}
             )
     
+    def _compute_in_process(self, payload_path: str, obj_type: str) -> str:
+        """Compute a content, directory or snapshot SWHID like swh.model.cli does."""
+        if obj_type == "auto":
+            if os.path.isfile(payload_path):
+                obj_type = "content"
+            elif os.path.isdir(payload_path):
+                obj_type = "directory"
+            else:
+                raise ValueError(f"cannot detect object type for {payload_path}")
+        
+        if obj_type == "snapshot":
+            return self._compute_snapshot_swhid(payload_path)
+        
+        # The CLI dereferences symlinks given as arguments
+        if os.path.islink(payload_path):
+            payload_path = os.path.realpath(payload_path)
+        if obj_type == "content":
+            return self._compute_content_swhid(payload_path)
+        return self._compute_directory_swhid(payload_path)
+    
+    @staticmethod
+    def _compute_content_swhid(path: str) -> str:
+        """Compute a content SWHID with swh.model.from_disk."""
+        content = DiskContent.from_file(path=os.fsencode(path), max_content_length=None)
+        return str(content.swhid())
+    
+    @staticmethod
+    def _compute_directory_swhid(path: str) -> str:
+        """Compute a directory SWHID with swh.model.from_disk."""
+        directory = DiskDirectory.from_disk(path=os.fsencode(path), max_content_length=None)
+        return str(directory.swhid())
+    
+    @staticmethod
+    def _compute_snapshot_swhid(repo_path: str) -> str:
+        """Compute the snapshot SWHID of a git repository's refs."""
+        repo = dulwich.repo.Repo(repo_path)
+        
+        branches = {}
+        for ref, target in repo.refs.as_dict().items():
+            obj = repo[target]
+            if obj:
+                branches[ref] = {
+                    "target": hashutil.bytehex_to_hash(target),
+                    "target_type": _DULWICH_TYPES[obj.type_name],
+                }
+            else:
+                branches[ref] = None
+        
+        for ref, target in repo.refs.get_symrefs().items():
+            branches[ref] = {
+                "target": target,
+                "target_type": "alias",
+            }
+        
+        return str(Snapshot.from_dict({"branches": branches}).swhid())
+    
+    def compute_swhid_batch(self, items: List[Tuple[str, Optional[str]]]) -> List[str]:
+        """Compute SWHIDs for many payloads concurrently, in item order."""
+        if len(items) < 2:
+            return super().compute_swhid_batch(items)
+        
+        with ThreadPoolExecutor(max_workers=min(len(items), _BATCH_WORKERS)) as executor:
+            return list(executor.map(lambda item: self.compute_swhid(*item), items))
+    
     def _compute_revision_swhid(self, repo_path: str, commit: Optional[str] = None) -> str:
         """Compute revision SWHID using swh.model Python API."""
         if not SWH_MODEL_AVAILABLE:
@@ -180,79 +462,77 @@ class Implementation(SwhidImplementation):
         if commit is None:
             commit = "HEAD"
         
-        # Resolve commit reference to full SHA
-        result = subprocess.run(
-            ["git", "rev-parse", commit],
-            cwd=repo_path,
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='replace',
-            check=True
-        )
-        commit_sha = result.stdout.strip()
-        
-        # Get raw commit object (content only, no header) to extract GPG signature exactly
-        raw_commit_result = subprocess.run(
-            ["git", "cat-file", "commit", commit_sha],
-            cwd=repo_path,
-            capture_output=True,
-            check=True
-        )
-        raw_commit_content = raw_commit_result.stdout
-        
-        # Get pretty-printed commit object for parsing other fields
-        commit_result = subprocess.run(
-            ["git", "cat-file", "-p", commit_sha],
-            cwd=repo_path,
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='replace',
-            check=True
-        )
-        
-        # Parse commit object
-        lines = commit_result.stdout.split('\n')
+        reader = self._batch_reader(repo_path)
+        
+        # A full SHA (as passed by _compute_release_swhid) can be looked up
+        # before touching the repository, and read without peeling
+        commit_sha = None
+        if len(commit) == 40 and not commit.strip(_HEX_DIGITS):
+            cached = self._cached_revision_swhid(repo_path, commit.lower())
+            if cached is not None:
+                return cached
+            commit_sha, obj_type, raw_commit_content = reader.read(commit)
+            if obj_type != "commit":
+                commit_sha = None
+        
+        if commit_sha is None:
+            # Resolve the reference and read the raw commit object (content only,
+            # no header) in one round trip; the raw bytes keep the GPG signature exact
+            commit_sha, _, raw_commit_content = reader.read(f"{commit}^{{commit}}")
+        
+        swhid = self._cached_revision_swhid(repo_path, commit_sha)
+        if swhid is None:
+            swhid = self._build_revision_swhid(commit_sha, raw_commit_content)
+            with self._revision_swhids_lock:
+                self._revision_swhids[(repo_path, commit_sha)] = swhid
+                if len(self._revision_swhids) > _MAX_CACHED_REVISIONS:
+                    self._revision_swhids.popitem(last=False)
+        return swhid
+    
+    def _cached_revision_swhid(self, repo_path: str, commit_sha: str) -> Optional[str]:
+        """Return the remembered SWHID of a commit, if any."""
+        with self._revision_swhids_lock:
+            swhid = self._revision_swhids.get((repo_path, commit_sha))
+            if swhid is not None:
+                self._revision_swhids.move_to_end((repo_path, commit_sha))
+            return swhid
+    
+    def _build_revision_swhid(self, commit_sha: str, raw_commit_content: bytes) -> str:
+        """Compute a revision SWHID from a raw commit object."""
+        # Parse commit object: headers up to the first blank line, then the
+        # message, which is kept as raw bytes
+        headers, _, message = raw_commit_content.partition(b'\n\n')
         tree_sha = None
         parents = []
         author_line = None
         committer_line = None
-        message_start = None
-        
-        for i, line in enumerate(lines):
-            if line.startswith('tree '):
-                tree_sha = line.split()[1]
-            elif line.startswith('parent '):
-                parents.append(line.split()[1])
-            elif line.startswith('author '):
+        
+        for line in headers.split(b'\n'):
+            if line.startswith(b'tree '):
+                tree_sha = line[5:].decode('ascii')
+            elif line.startswith(b'parent '):
+                parents.append(line[7:].decode('ascii'))
+            elif line.startswith(b'author '):
                 author_line = line[7:]  # Skip 'author '
-            elif line.startswith('committer '):
+            elif line.startswith(b'committer '):
                 committer_line = line[10:]  # Skip 'committer '
-            elif line == '' and message_start is None:
-                # Check if there's a GPG signature before this blank line
-                # (we'll extract it from raw content)
-                message_start = i + 1
-                break
         
-        # Extract GPG signature from raw content if present
+        # Extract GPG signature from the header block if present; the message
+        # is never scanned. The value runs to the end of the headers.
         # Remove leading spaces from continuation lines (swh.model adds them back)
         gpgsig_bytes = None
-        gpgsig_start = raw_commit_content.find(b'gpgsig ')
-        if gpgsig_start >= 0:
-            # Find where message starts (blank line after END PGP SIGNATURE)
-            end_sig = raw_commit_content.find(b'-----END PGP SIGNATURE-----', gpgsig_start)
-            if end_sig >= 0:
-                # Find the blank line (two consecutive newlines)
-                blank_line_pos = raw_commit_content.find(b'\n\n', end_sig)
-                if blank_line_pos >= 0:
-                    # Extract GPG signature value (without "gpgsig " prefix, up to but not including final \n)
-                    # swh.model will add the blank line before message automatically
-                    gpgsig_raw = raw_commit_content[gpgsig_start+7:blank_line_pos]  # +7 for "gpgsig ", don't include final \n
-                    # Remove leading spaces from each line (swh.model adds them back for continuation lines)
-                    gpgsig_lines = gpgsig_raw.split(b'\n')
-                    processed_lines = [line.lstrip(b' ') for line in gpgsig_lines]
-                    gpgsig_bytes = b'\n'.join(processed_lines)
+        gpgsig_start = headers.find(b'\n' + _GPGSIG_HDR)
+        if gpgsig_start >= 0 and headers.find(_PGP_SIG_END, gpgsig_start) >= 0:
+            # Extract GPG signature value (without "gpgsig " prefix)
+            # swh.model will add the blank line before message automatically
+            gpgsig_raw = headers[gpgsig_start + 1 + _GPGSIG_HDR_LEN:]
+            # Remove leading spaces from each line (swh.model adds them back for continuation lines).
+            # Git indents continuation lines by exactly one space; anything else
+            # takes the line-by-line path
+            if b'\n  ' in gpgsig_raw or gpgsig_raw.startswith(b' '):
+                gpgsig_bytes = b'\n'.join(line.lstrip(b' ') for line in gpgsig_raw.split(b'\n'))
+            else:
+                gpgsig_bytes = gpgsig_raw.replace(b'\n ', b'\n')
         
         if not tree_sha:
             raise TestExecutionError(
@@ -264,22 +544,8 @@ class Implementation(SwhidImplementation):
             )
         
         # Parse author/committer (format: "Name <email> timestamp offset")
-        def parse_person(line):
-            """Parse Git person line: 'Name <email> timestamp offset'"""
-            match = re.match(r'(.+?) <(.+?)> (\d+) ([+-]\d{4})', line)
-            if match:
-                name, email, ts, offset = match.groups()
-                # fullname should be the complete "Name <email>" string
-                fullname_str = f"{name} <{email}>"
-                return Person(
-                    fullname=fullname_str.encode('utf-8'),
-                    name=name.encode('utf-8'),
-                    email=email.encode('utf-8')
-                ), int(ts), offset.encode('utf-8')
-            return None, None, None
-        
-        author, author_ts, author_offset = parse_person(author_line) if author_line else (None, None, None)
-        committer, committer_ts, committer_offset = parse_person(committer_line) if committer_line else (None, None, None)
+        author, author_ts, author_offset = _parse_person(author_line)
+        committer, committer_ts, committer_offset = _parse_person(committer_line)
         
         if not author or not committer:
             raise TestExecutionError(
@@ -290,9 +556,6 @@ class Implementation(SwhidImplementation):
                 subtype="parse_error"
             )
         
-        # Get message (everything after blank line)
-        message = '\n'.join(lines[message_start:]).encode('utf-8') if message_start else b''
-        
         # Get directory SWHID for tree - we need to compute it
         # Use git write-tree to get tree hash, then format as directory SWHID
         # Actually, we can use the tree SHA directly (it's already a directory hash)
@@ -332,16 +595,9 @@ class Implementation(SwhidImplementation):
         # Format as Git object
         git_obj = revision_git_object(revision)
         
-        # Extract content (skip header) - hash_git_data expects just the content
-        header_end = git_obj.find(b'\0')
-        if header_end > 0:
-            content = git_obj[header_end+1:]
-        else:
-            content = git_obj
-        
-        # Hash using swh.model hashutil (same as tested in standalone tests)
-        hash_bytes = hashutil.hash_git_data(content, 'commit', base_algo='sha1')
-        sha1 = hashutil.hash_to_hex(hash_bytes)
+        # The formatted object already starts with its "<type> <length>\0"
+        # header, so it is exactly what Git hashes
+        sha1 = hashlib.sha1(git_obj).hexdigest()
         
         return f"swh:1:rev:{sha1}"
     
@@ -363,16 +619,8 @@ class Implementation(SwhidImplementation):
             )
         
         # Check if it's an annotated tag
-        result = subprocess.run(
-            ["git", "cat-file", "-t", tag],
-            cwd=repo_path,
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='replace',
-            check=True
-        )
-        tag_type = result.stdout.strip()
+        reader = self._batch_reader(repo_path)
+        _, tag_type, raw_tag_content = reader.read(tag)
         
         if tag_type != "tag":
             raise TestExecutionError(
@@ -383,37 +631,23 @@ class Implementation(SwhidImplementation):
                 subtype="validation_error"
             )
         
-        # Get tag object
-        tag_result = subprocess.run(
-            ["git", "cat-file", "-p", tag],
-            cwd=repo_path,
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='replace',
-            check=True
-        )
-        
-        # Parse tag object
-        lines = tag_result.stdout.split('\n')
+        # Parse tag object: headers up to the first blank line, then the
+        # message, which is kept as raw bytes
+        headers, _, message = raw_tag_content.partition(b'\n\n')
         object_sha = None
         object_type = None
         tag_name = None
         tagger_line = None
-        message_start = None
-        
-        for i, line in enumerate(lines):
-            if line.startswith('object '):
-                object_sha = line.split()[1]
-            elif line.startswith('type '):
-                object_type = line.split()[1]
-            elif line.startswith('tag '):
-                tag_name = line.split()[1]
-            elif line.startswith('tagger '):
+        
+        for line in headers.split(b'\n'):
+            if line.startswith(b'object '):
+                object_sha = line[7:].decode('ascii')
+            elif line.startswith(b'type '):
+                object_type = line[5:].decode('ascii')
+            elif line.startswith(b'tag '):
+                tag_name = line[4:]
+            elif line.startswith(b'tagger '):
                 tagger_line = line[7:]  # Skip 'tagger '
-            elif line == '' and message_start is None:
-                message_start = i + 1
-                break
         
         if not object_sha:
             raise TestExecutionError(
@@ -425,30 +659,21 @@ class Implementation(SwhidImplementation):
             )
         
         if not tag_name:
-            tag_name = tag
+            tag_name = tag.encode('utf-8')
         
         # For releases, the target should be the revision SWHID (commit hash)
         # For signed tags pointing to tags, we need to follow to the commit
         target_commit_sha = object_sha
         if object_type == 'tag':
             # Follow the chain: tag -> tag -> commit
-            inner_tag_result = subprocess.run(
-                ["git", "cat-file", "-p", object_sha],
-                cwd=repo_path,
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='replace',
-                check=True
-            )
-            inner_lines = inner_tag_result.stdout.split('\n')
+            _, _, inner_tag_content = reader.read(object_sha)
             inner_object_sha = None
             inner_object_type = None
-            for line in inner_lines:
-                if line.startswith('object '):
-                    inner_object_sha = line.split()[1]
-                elif line.startswith('type '):
-                    inner_object_type = line.split()[1]
+            for line in inner_tag_content.partition(b'\n\n')[0].split(b'\n'):
+                if line.startswith(b'object '):
+                    inner_object_sha = line[7:].decode('ascii')
+                elif line.startswith(b'type '):
+                    inner_object_type = line[5:].decode('ascii')
                     break
             if inner_object_type == 'commit' and inner_object_sha:
                 target_commit_sha = inner_object_sha
@@ -477,24 +702,7 @@ class Implementation(SwhidImplementation):
         target_revision_bytes = bytes.fromhex(target_revision_sha)
         
         # Parse tagger
-        def parse_person(line):
-            """Parse Git person line: 'Name <email> timestamp offset'"""
-            match = re.match(r'(.+?) <(.+?)> (\d+) ([+-]\d{4})', line)
-            if match:
-                name, email, ts, offset = match.groups()
-                # fullname should be the complete "Name <email>" string
-                fullname_str = f"{name} <{email}>"
-                return Person(
-                    fullname=fullname_str.encode('utf-8'),
-                    name=name.encode('utf-8'),
-                    email=email.encode('utf-8')
-                ), int(ts), offset.encode('utf-8')
-            return None, None, None
-        
-        tagger, tagger_ts, tagger_offset = parse_person(tagger_line) if tagger_line else (None, None, None)
-        
-        # Get message (everything after blank line)
-        message = '\n'.join(lines[message_start:]).encode('utf-8') if message_start else b''
+        tagger, tagger_ts, tagger_offset = _parse_person(tagger_line)
         
         # Check if message contains GPG signature
         # For tags, GPG signatures are in the message, but swh.model's Release object
@@ -515,7 +723,7 @@ class Implementation(SwhidImplementation):
         
         # Create Release object (for unsigned tags, swh.model works correctly)
         release = Release(
-            name=tag_name.encode('utf-8'),
+            name=tag_name,
             target=target_revision_bytes,
             message=message,
             target_type=ReleaseTargetType.REVISION,
@@ -527,15 +735,8 @@ class Implementation(SwhidImplementation):
         # Format as Git object
         git_obj = release_git_object(release)
         
-        # Extract content (skip header) - hash_git_data expects just the content
-        header_end = git_obj.find(b'\0')
-        if header_end > 0:
-            content = git_obj[header_end+1:]
-        else:
-            content = git_obj
-        
-        # Hash using swh.model hashutil (same as tested in standalone tests)
-        hash_bytes = hashutil.hash_git_data(content, 'tag', base_algo='sha1')
-        sha1 = hashutil.hash_to_hex(hash_bytes)
+        # The formatted object already starts with its "<type> <length>\0"
+        # header, so it is exactly what Git hashes
+        sha1 = hashlib.sha1(git_obj).hexdigest()
         
         return f"swh:1:rel:{sha1}"
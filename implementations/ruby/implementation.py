@@ -5,17 +5,62 @@ This module provides an interface to the Ruby SWHID implementation
 for the testing harness.
 """
 
+import atexit
 import subprocess
 import os
 import platform
 import logging
-from typing import Optional
+import select
+import shutil
+import stat
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
 
 from harness.plugins.base import SwhidImplementation, ImplementationInfo, ImplementationCapabilities
 from harness.utils.permissions import get_source_permissions, create_git_repo_with_permissions
 
 logger = logging.getLogger(__name__)
 
+# Set to re-run is_available() probes instead of using the cached result
+_FORCE_RECHECK_ENV = "SWHID_FORCE_AVAILABILITY_RECHECK"
+
+# Set to start the swhid command for every call instead of using the worker
+_NO_WORKER_ENV = "SWHID_RUBY_NO_WORKER"
+
+# Ruby driver that runs swhid invocations in one long-lived process
+_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "swhid_worker.rb")
+
+# The worker's replies are read with select(), which only handles pipes on POSIX
+_WORKER_SUPPORTED = os.name == "posix"
+
+# Timeout for one swhid invocation, in seconds
+_COMMAND_TIMEOUT = 30
+
+# swhid CLI command for each accepted object type: (command, whether the payload
+# path follows the command, optional trailing argument). Directory paths are
+# appended separately, after permissions are preserved.
+_CLI_COMMANDS = {
+    "content": ("content", False, None),
+    "cnt": ("content", False, None),
+    "directory": ("directory", False, None),
+    "dir": ("directory", False, None),
+    "revision": ("revision", True, "commit"),
+    "rev": ("revision", True, "commit"),
+    "release": ("release", True, "tag"),
+    "rel": ("release", True, "tag"),
+    "snapshot": ("snapshot", True, None),
+    "snp": ("snapshot", True, None),
+}
+
+# Requests written to the worker before reading replies in compute_swhid_batch;
+# bounded so neither side blocks on a full pipe
+_PIPELINE_DEPTH = 64
+
+# Content and directory SWHIDs remembered per payload state
+_MAX_CACHED_RESULTS = 1024
+
 
 def _parse_bat_wrapper(bat_path: str) -> Optional[list]:
     """Parse a Windows .bat wrapper to extract Ruby invocation command.
@@ -70,9 +115,174 @@ def _parse_bat_wrapper(bat_path: str) -> Optional[list]:
         return None
 
 
+def _expand_gem_pattern(pattern: str) -> List[str]:
+    """Return the files matching a gem path such as ~/.gem/ruby/*/bin/swhid.
+
+    A "*" path component (the Ruby version directory) is expanded with one
+    os.scandir; any other pattern is an exact path.
+    """
+    wildcard = os.sep + "*" + os.sep
+    if wildcard not in pattern:
+        return [pattern] if os.path.isfile(pattern) else []
+
+    root, _, rest = pattern.partition(wildcard)
+    try:
+        with os.scandir(root) as it:
+            version_dirs = sorted(entry.path for entry in it if entry.is_dir())
+    except OSError:
+        return []
+    return [
+        candidate for candidate in (os.path.join(version_dir, rest) for version_dir in version_dirs)
+        if os.path.isfile(candidate)
+    ]
+
+
+def _ruby_script_command(swhid_path: str) -> Optional[List[str]]:
+    """Return [ruby_exe, script_path] if the swhid command is a Ruby script.
+
+    Reads the shebang line (or the .bat wrapper on Windows); returns None for
+    anything else, such as a native binary.
+    """
+    if swhid_path.endswith(('.bat', '.cmd')):
+        return _parse_bat_wrapper(swhid_path)
+
+    try:
+        with open(swhid_path, 'rb') as f:
+            first_line = f.readline(256)
+    except OSError:
+        return None
+    if not first_line.startswith(b'#!') or b'ruby' not in first_line:
+        return None
+
+    interpreter = first_line[2:].decode('utf-8', errors='replace').split()
+    if os.path.basename(interpreter[0]) == "env":
+        args = [arg for arg in interpreter[1:] if not arg.startswith('-')]
+        ruby = shutil.which(args[0]) if args else None
+    else:
+        ruby = interpreter[0]
+    if not ruby or not os.path.isfile(ruby):
+        return None
+    return [ruby, swhid_path]
+
+
+def _payload_fingerprint(path: str, st: Optional[os.stat_result] = None) -> tuple:
+    """Return the stat fields (mode, size, mtime, inode) of a file, or of
+    every entry under a directory, which change whenever its SWHID can.
+    st is the path's own stat result, if already known."""
+    if st is None:
+        st = os.stat(path)
+    if not stat.S_ISDIR(st.st_mode):
+        return (st.st_mode, st.st_size, st.st_mtime_ns, st.st_ino)
+
+    entries = []
+    pending = [path]
+    while pending:
+        with os.scandir(pending.pop()) as it:
+            for entry in it:
+                st = entry.stat(follow_symlinks=False)
+                entries.append((entry.path, st.st_mode, st.st_size, st.st_mtime_ns, st.st_ino))
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+    entries.sort()
+    return tuple(entries)
+
+
+class _RubyWorker:
+    """A Ruby process running swhid_worker.rb (see there for the protocol)."""
+
+    def __init__(self, ruby_command: List[str]):
+        ruby_exe, self.script_path = ruby_command
+        self._process = subprocess.Popen(
+            [ruby_exe, _WORKER_SCRIPT, self.script_path],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        self._buffer = b""
+
+    def run(self, args: List[str], stdin_path: Optional[str], timeout: float) -> Tuple[int, bytes, bytes]:
+        """Run the swhid command with args; return (exit status, stdout, stderr).
+
+        Raises:
+            subprocess.TimeoutExpired: No reply within timeout
+            EOFError: The worker exited
+        """
+        return self.run_many([(args, stdin_path)], timeout)[0]
+
+    def run_many(self, requests: List[Tuple[List[str], Optional[str]]],
+                 timeout: float) -> List[Tuple[int, bytes, bytes]]:
+        """Run several commands, writing up to _PIPELINE_DEPTH requests ahead
+        of the replies; each reply gets its own timeout."""
+        replies = []
+        for start in range(0, len(requests), _PIPELINE_DEPTH):
+            window = requests[start:start + _PIPELINE_DEPTH]
+            frame = []
+            for args, stdin_path in window:
+                frame.append(b"%d\n" % len(args))
+                for field in [*args, stdin_path or ""]:
+                    data = os.fsencode(field)
+                    frame.append(b"%d\n%s" % (len(data), data))
+            self._process.stdin.write(b"".join(frame))
+            self._process.stdin.flush()
+            for args, _ in window:
+                replies.append(self._receive(args, timeout))
+        return replies
+
+    def _receive(self, args: List[str], timeout: float) -> Tuple[int, bytes, bytes]:
+        deadline = time.monotonic() + timeout
+        while b"\n" not in self._buffer:
+            self._fill(deadline, args, timeout)
+        header, self._buffer = self._buffer.split(b"\n", 1)
+        status, out_len, err_len = (int(field) for field in header.split())
+        while len(self._buffer) < out_len + err_len:
+            self._fill(deadline, args, timeout)
+        out = self._buffer[:out_len]
+        err = self._buffer[out_len:out_len + err_len]
+        self._buffer = self._buffer[out_len + err_len:]
+        return status, out, err
+
+    def _fill(self, deadline: float, args: List[str], timeout: float) -> None:
+        fd = self._process.stdout.fileno()
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+            raise subprocess.TimeoutExpired(args, timeout)
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            raise EOFError("swhid worker exited")
+        self._buffer += chunk
+
+    def close(self) -> None:
+        """Stop the worker."""
+        if self._process.poll() is None:
+            self._process.kill()
+        self._process.wait()
+        self._process.stdin.close()
+        self._process.stdout.close()
+
+
 class Implementation(SwhidImplementation):
     """Ruby SWHID implementation plugin."""
     
+    # is_available() runs `swhid help`, so its result is shared by all instances
+    _availability: Optional[bool] = None
+    _availability_lock = threading.Lock()
+    
+    # Path discovery scans gem directories and runs `swhid snapshot --help`,
+    # so its result is shared too (None: not found)
+    _discovered_swhid_path: Optional[str] = None
+    _swhid_path_discovered = False
+    _swhid_path_lock = threading.Lock()
+    
+    # One Ruby worker per process serves all instances; disabled for the rest
+    # of the process once the swhid command turns out not to work in it
+    _worker: Optional[_RubyWorker] = None
+    _worker_disabled = False
+    _worker_lock = threading.Lock()
+    
+    # (absolute path, type, _payload_fingerprint) -> SWHID, shared by all instances
+    _results: "OrderedDict[tuple, str]" = OrderedDict()
+    _results_lock = threading.Lock()
+    
     def __init__(self):
         """Initialize Ruby implementation and find swhid command path."""
         super().__init__()
@@ -90,9 +300,20 @@ class Implementation(SwhidImplementation):
             logger.debug(f"Ruby: Using cached swhid path: {self._swhid_path}")
             return self._swhid_path
         
+        cls = type(self)
+        with cls._swhid_path_lock:
+            cached = cls._discovered_swhid_path
+            if (not cls._swhid_path_discovered or os.environ.get(_FORCE_RECHECK_ENV)
+                    or (cached and not os.path.isfile(cached))):
+                cls._discovered_swhid_path = self._discover_swhid_path()
+                cls._swhid_path_discovered = True
+            self._swhid_path = cls._discovered_swhid_path
+        return self._swhid_path
+    
+    def _discover_swhid_path(self) -> Optional[str]:
+        """Search gem directories, then PATH, for the Ruby gem's swhid command."""
         import shutil
         import os
-        import glob
         
         logger.debug("Ruby: Starting swhid binary detection")
         is_windows = platform.system() == "Windows"
@@ -101,9 +322,12 @@ class Implementation(SwhidImplementation):
         # CRITICAL: Check gem-specific paths FIRST to prefer Ruby gem over Rust binary
         # The Rust binary may be in PATH and come first, but we need the Ruby gem
         home = os.path.expanduser("~")
+        # These cover Gem.user_dir (~/.gem/ruby/<version>, or the XDG data
+        # directory when ~/.gem does not exist), so Ruby is not asked for it
+        xdg_data_home = os.environ.get("XDG_DATA_HOME") or os.path.join(home, ".local", "share")
         gem_paths = [
             os.path.join(home, ".gem", "ruby", "*", "bin", "swhid"),
-            os.path.join(home, ".local", "share", "gem", "ruby", "*", "bin", "swhid"),
+            os.path.join(xdg_data_home, "gem", "ruby", "*", "bin", "swhid"),
         ]
         logger.debug(f"Ruby: Checking standard gem paths: {gem_paths}")
         
@@ -131,48 +355,18 @@ class Implementation(SwhidImplementation):
         else:
             logger.debug("Ruby: GEM_HOME is not set")
         
-        # Also try system gem locations via Ruby
-        try:
-            import subprocess as sp
-            gem_env_result = sp.run(
-                ["ruby", "-e", "puts Gem.user_dir"],
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='replace',
-                timeout=2
-            )
-            if gem_env_result.returncode == 0:
-                gem_dir = gem_env_result.stdout.strip()
-                if gem_dir:
-                    gem_paths.append(os.path.join(gem_dir, "bin", "swhid"))
-        except Exception:
-            pass
-        
         # Try to find swhid in gem-specific locations first
         for pattern in gem_paths:
             logger.debug(f"Ruby: Checking pattern: {pattern}")
             # Normalize the pattern path for Windows compatibility
             pattern_normalized = os.path.normpath(pattern)
             
-            # Try glob first (for wildcard patterns)
-            matches = glob.glob(pattern_normalized)
-            
-            # Also try direct path check (for exact paths, especially on Windows)
-            if os.path.isfile(pattern_normalized):
-                matches.append(pattern_normalized)
+            matches = _expand_gem_pattern(pattern_normalized)
             
             # On Windows, also try .bat and .cmd extensions
             if is_windows:
-                bat_pattern = pattern_normalized + ".bat"
-                cmd_pattern = pattern_normalized + ".cmd"
-                matches.extend(glob.glob(bat_pattern))
-                matches.extend(glob.glob(cmd_pattern))
-                # Direct path checks for .bat/.cmd
-                if os.path.isfile(bat_pattern):
-                    matches.append(bat_pattern)
-                if os.path.isfile(cmd_pattern):
-                    matches.append(cmd_pattern)
+                matches.extend(_expand_gem_pattern(pattern_normalized + ".bat"))
+                matches.extend(_expand_gem_pattern(pattern_normalized + ".cmd"))
             
             # Remove duplicates while preserving order
             seen = set()
@@ -302,7 +496,15 @@ class Implementation(SwhidImplementation):
         )
 
     def is_available(self) -> bool:
-        """Check if Ruby implementation is available."""
+        """Check if Ruby implementation is available (probed once per process)."""
+        cls = type(self)
+        with cls._availability_lock:
+            if cls._availability is None or os.environ.get(_FORCE_RECHECK_ENV):
+                cls._availability = self._probe_available()
+            return cls._availability
+
+    def _probe_available(self) -> bool:
+        """Check that the swhid command can be found and run."""
         logger.debug("Ruby: Checking availability")
         swhid_path = self._find_swhid_path()
         if not swhid_path:
@@ -360,9 +562,103 @@ class Implementation(SwhidImplementation):
                      version: Optional[int] = None, hash_algo: Optional[str] = None) -> str:
         """Compute SWHID for a payload using the Ruby implementation.
         
+        Content and directory results are reused while the payload is unchanged.
+        
         Note: version and hash_algo parameters are accepted for API compatibility
         but are ignored as the Ruby implementation only supports v1/SHA1.
         """
+        cache_key = self._result_cache_key(payload_path, obj_type)
+        if cache_key is not None:
+            swhid = self._cached_result(cache_key)
+            if swhid is not None:
+                return swhid
+        
+        swhid = self._compute_swhid(payload_path, obj_type, commit=commit, tag=tag)
+        
+        if cache_key is not None:
+            self._remember_result(cache_key, swhid)
+        return swhid
+    
+    @classmethod
+    def _cached_result(cls, cache_key: tuple) -> Optional[str]:
+        """Return a remembered SWHID, if any."""
+        with cls._results_lock:
+            swhid = cls._results.get(cache_key)
+            if swhid is not None:
+                cls._results.move_to_end(cache_key)
+            return swhid
+    
+    @classmethod
+    def _remember_result(cls, cache_key: tuple, swhid: str) -> None:
+        """Remember a SWHID, evicting the least recently used one if full."""
+        with cls._results_lock:
+            cls._results[cache_key] = swhid
+            if len(cls._results) > _MAX_CACHED_RESULTS:
+                cls._results.popitem(last=False)
+    
+    @staticmethod
+    def _result_cache_key(payload_path: str, obj_type: Optional[str]) -> Optional[tuple]:
+        """Return the result cache key for content and directory payloads."""
+        entry = _CLI_COMMANDS.get(obj_type)
+        if entry is None:
+            if obj_type is not None and obj_type != "auto":
+                return None
+        elif entry[0] not in ("content", "directory"):
+            return None
+        
+        try:
+            st = os.stat(payload_path)
+        except OSError:
+            return None
+        if entry is not None:
+            obj_type = entry[0]
+        elif stat.S_ISREG(st.st_mode):
+            obj_type = "content"
+        elif stat.S_ISDIR(st.st_mode) and not os.path.isdir(os.path.join(payload_path, ".git")):
+            obj_type = "directory"
+        else:
+            return None
+        
+        try:
+            fingerprint = _payload_fingerprint(payload_path, st)
+        except OSError:
+            return None
+        return (os.path.abspath(payload_path), obj_type, fingerprint)
+    
+    @staticmethod
+    def _command_args(payload_path: str, obj_type: Optional[str],
+                      commit: Optional[str] = None, tag: Optional[str] = None) -> List[str]:
+        """Map an object type to swhid CLI arguments (directory paths are added later)."""
+        entry = _CLI_COMMANDS.get(obj_type)
+        if entry is None:
+            if obj_type is not None and obj_type != "auto":
+                raise NotImplementedError(f"Ruby implementation doesn't support {obj_type} object type")
+            # Auto-detect based on path, with a single stat
+            try:
+                mode = os.stat(payload_path).st_mode
+            except OSError:
+                mode = 0
+            if stat.S_ISREG(mode):
+                entry = _CLI_COMMANDS["content"]
+            elif stat.S_ISDIR(mode):
+                # Check if it's a git repository
+                if os.path.isdir(os.path.join(payload_path, ".git")):
+                    entry = _CLI_COMMANDS["snapshot"]
+                else:
+                    entry = _CLI_COMMANDS["directory"]
+            else:
+                raise ValueError(f"Cannot determine object type for {payload_path}")
+        
+        command, takes_path, extra_arg = entry
+        args = [command, payload_path] if takes_path else [command]
+        extra = commit if extra_arg == "commit" else tag if extra_arg == "tag" else None
+        if extra:
+            args.append(extra)
+        return args
+    
+    def _compute_swhid(self, payload_path: str, obj_type: Optional[str],
+                       commit: Optional[str] = None, tag: Optional[str] = None) -> str:
+        """Run the swhid command for a payload."""
         
         # Get the swhid command path
         swhid_path = self._find_swhid_path()
@@ -383,112 +679,199 @@ class Implementation(SwhidImplementation):
                 logger.warning("Could not parse .bat wrapper, using .bat directly (may have binary issues)")
         else:
             cmd = [swhid_path]
+        n_base = len(cmd)
 
-        # Map object types to swhid CLI commands
-        if obj_type == "content" or obj_type == "cnt":
-            cmd.append("content")
-        elif obj_type == "directory" or obj_type == "dir":
-            cmd.append("directory")
-        elif obj_type == "revision" or obj_type == "rev":
-            cmd.extend(["revision", payload_path])
-            if commit:
-                cmd.append(commit)
-        elif obj_type == "release" or obj_type == "rel":
-            cmd.extend(["release", payload_path])
-            if tag:
-                cmd.append(tag)
-        elif obj_type == "snapshot" or obj_type == "snp":
-            cmd.extend(["snapshot", payload_path])
-        elif obj_type is None or obj_type == "auto":
-            # Auto-detect based on path
-            if os.path.isfile(payload_path):
-                cmd.append("content")
-            elif os.path.isdir(payload_path):
-                # Check if it's a git repository
-                if os.path.isdir(os.path.join(payload_path, ".git")):
-                    cmd.extend(["snapshot", payload_path])
-                else:
-                    cmd.append("directory")
-            else:
-                raise ValueError(f"Cannot determine object type for {payload_path}")
-        else:
-            raise NotImplementedError(f"Ruby implementation doesn't support {obj_type} object type")
-
-        # For content type, read from stdin
-        if cmd[-1] == "content":
-            try:
-                # Read file and pipe to stdin
-                with open(payload_path, 'rb') as f:
-                    content = f.read()
+        cmd.extend(self._command_args(payload_path, obj_type, commit=commit, tag=tag))
 
-                result = subprocess.run(
-                    cmd,
-                    input=content,
-                    capture_output=True,
-                    timeout=30
-                )
-
-                if result.returncode != 0:
-                    stderr = result.stderr.decode('utf-8', errors='replace')
-                    raise RuntimeError(f"Ruby implementation failed: {stderr}")
-
-                # Parse the output
-                output = result.stdout.decode('utf-8', errors='replace').strip()
-                if not output:
-                    raise RuntimeError("No output from Ruby implementation")
-
-                if not output.startswith("swh:"):
-                    raise RuntimeError(f"Invalid SWHID format: {output}")
+        command = cmd[n_base]
+        stdin_path = None
+        if command == "content":
+            # Content is read from stdin
+            stdin_path = payload_path
+        elif command == "directory":
+            # On Windows, we need to preserve file permissions before calling the tool
+            # Create a temporary copy with correct permissions
+            payload_path = self._ensure_permissions_preserved(payload_path)
+            cmd.append(payload_path)
 
+        try:
+            output = self._run_in_worker(cmd[n_base:], stdin_path=stdin_path)
+            if output is not None:
                 return output
+            return self._run_and_parse(cmd, stdin_path=stdin_path)
 
-            except subprocess.TimeoutExpired:
-                raise RuntimeError("Ruby implementation timed out")
-            except FileNotFoundError as e:
+        except subprocess.TimeoutExpired:
+            raise RuntimeError("Ruby implementation timed out")
+        except FileNotFoundError as e:
+            if stdin_path is not None:
                 raise RuntimeError(f"File not found: {e}")
-            except Exception as e:
-                raise RuntimeError(f"Error running Ruby implementation: {e}")
-
-        # For directory and git types, pass path as argument
-        elif cmd[1] in ["directory", "revision", "release", "snapshot"]:
-            if cmd[1] == "directory":
-                # On Windows, we need to preserve file permissions before calling the tool
-                # Create a temporary copy with correct permissions
-                payload_path = self._ensure_permissions_preserved(payload_path)
-                cmd.append(payload_path)
-
-            try:
+            raise RuntimeError("Ruby implementation not found (swhid gem not installed)")
+        except Exception as e:
+            raise RuntimeError(f"Error running Ruby implementation: {e}")
+        finally:
+            # Cleanup temporary directories if created
+            self._cleanup_temp_dirs()
+    
+    @staticmethod
+    def _run_and_parse(cmd: List[str], stdin_path: Optional[str] = None) -> str:
+        """Run the swhid command once and return the SWHID it prints.
+        
+        Args:
+            cmd: Full command line
+            stdin_path: File given to the command as its stdin (content
+                payloads), so the content is never loaded into (or copied
+                through) this process
+        
+        Raises:
+            RuntimeError: The command failed or printed no SWHID
+        """
+        if stdin_path is None:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                timeout=_COMMAND_TIMEOUT
+            )
+        else:
+            with open(stdin_path, 'rb') as f:
+                if hasattr(os, 'posix_fadvise'):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
                 result = subprocess.run(
                     cmd,
+                    stdin=f,
                     capture_output=True,
-                    text=True,
-                    encoding='utf-8',
-                    errors='replace',
-                    timeout=30
+                    timeout=_COMMAND_TIMEOUT
                 )
 
-                if result.returncode != 0:
-                    raise RuntimeError(f"Ruby implementation failed: {result.stderr}")
+        if result.returncode != 0:
+            stderr = result.stderr.decode('utf-8', errors='replace')
+            raise RuntimeError(f"Ruby implementation failed: {stderr}")
 
-                # Parse the output
-                output = result.stdout.strip()
-                if not output:
-                    raise RuntimeError("No output from Ruby implementation")
+        # Parse the output as bytes; only the SWHID (or an error) is decoded
+        output = result.stdout.strip()
+        if not output:
+            raise RuntimeError("No output from Ruby implementation")
 
-                if not output.startswith("swh:"):
-                    raise RuntimeError(f"Invalid SWHID format: {output}")
-
-                return output
+        if not output.startswith(b"swh:"):
+            raise RuntimeError(f"Invalid SWHID format: {output.decode('utf-8', errors='replace')}")
 
+        # Keep only the SWHID if the path is echoed after a tab
+        return output.partition(b'\t')[0].strip().decode('utf-8', errors='replace')
+    
+    def _run_in_worker(self, args: List[str], stdin_path: Optional[str] = None) -> Optional[str]:
+        """Run the swhid command in the shared Ruby worker.
+        
+        Returns:
+            The SWHID, or None if the caller should run the command itself
+            (no worker, or anything but a SWHID on stdout, including errors,
+            whose messages then come from the real command)
+        
+        Raises:
+            subprocess.TimeoutExpired: The command did not finish in time
+        """
+        outputs = self._run_many_in_worker([(args, stdin_path)])
+        return outputs[0] if outputs else None
+    
+    def _run_many_in_worker(self, requests: List[Tuple[List[str], Optional[str]]]) -> Optional[List[Optional[str]]]:
+        """Run several swhid commands in the shared Ruby worker, pipelined.
+        
+        Returns:
+            One SWHID or None per request, as for _run_in_worker, or None if
+            there is no worker
+        
+        Raises:
+            subprocess.TimeoutExpired: A command did not finish in time
+        """
+        if not _WORKER_SUPPORTED or os.environ.get(_NO_WORKER_ENV):
+            return None
+        
+        cls = type(self)
+        with cls._worker_lock:
+            if cls._worker_disabled:
+                return None
+            if cls._worker is not None and cls._worker.script_path != self._swhid_path:
+                cls._worker.close()
+                cls._worker = None
+            if cls._worker is None:
+                ruby_command = _ruby_script_command(self._swhid_path)
+                if ruby_command is None:
+                    logger.debug(f"Ruby: {self._swhid_path} is not a Ruby script, not using a worker")
+                    cls._worker_disabled = True
+                    return None
+                try:
+                    cls._worker = _RubyWorker(ruby_command)
+                except OSError as e:
+                    logger.debug(f"Ruby: Could not start swhid worker: {e}")
+                    cls._worker_disabled = True
+                    return None
+                atexit.register(cls._worker.close)
+            
+            try:
+                replies = cls._worker.run_many(requests, _COMMAND_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                cls._worker.close()
+                cls._worker = None
+                raise
+            except (OSError, EOFError, ValueError) as e:
+                logger.debug(f"Ruby: swhid worker failed, running the command per call: {e}")
+                cls._worker.close()
+                cls._worker = None
+                cls._worker_disabled = True
+                return None
+            
+            outputs: List[Optional[str]] = []
+            for status, out, _ in replies:
+                output = out.strip()
+                if status == 0 and not output:
+                    # The command writes somewhere the worker does not capture
+                    logger.debug("Ruby: swhid worker got no output, running the command per call")
+                    cls._worker_disabled = True
+                if status != 0 or not output.startswith(b"swh:"):
+                    outputs.append(None)
+                else:
+                    outputs.append(output.partition(b'\t')[0].strip().decode('utf-8', errors='replace'))
+            return outputs
+    
+    def compute_swhid_batch(self, items: List[Tuple[str, Optional[str]]]) -> List[str]:
+        """Compute SWHIDs for many payloads, pipelining them through the worker.
+        
+        Items the worker cannot answer are computed one by one with
+        compute_swhid, which also raises their errors in item order.
+        """
+        results: List[Optional[str]] = [None] * len(items)
+        pending = []
+        requests = []
+        for index, (payload_path, obj_type) in enumerate(items):
+            cache_key = self._result_cache_key(payload_path, obj_type)
+            if cache_key is not None:
+                results[index] = self._cached_result(cache_key)
+                if results[index] is not None:
+                    continue
+            try:
+                args = self._command_args(payload_path, obj_type)
+            except (ValueError, NotImplementedError):
+                continue
+            if args[0] == "content":
+                requests.append((args, payload_path))
+            elif args[0] == "directory":
+                requests.append((args + [payload_path], None))
+            else:
+                requests.append((args, None))
+            pending.append((index, cache_key))
+        
+        if len(requests) > 1 and self._find_swhid_path():
+            try:
+                outputs = self._run_many_in_worker(requests)
             except subprocess.TimeoutExpired:
                 raise RuntimeError("Ruby implementation timed out")
-            except FileNotFoundError:
-                raise RuntimeError("Ruby implementation not found (swhid gem not installed)")
-            except Exception as e:
-                raise RuntimeError(f"Error running Ruby implementation: {e}")
-            finally:
-                # Cleanup temporary directories if created
-                self._cleanup_temp_dirs()
+            for (index, cache_key), output in zip(pending, outputs or ()):
+                results[index] = output
+                if output is not None and cache_key is not None:
+                    self._remember_result(cache_key, output)
+        
+        return [
+            swhid if swhid is not None else self.compute_swhid(payload_path, obj_type)
+            for swhid, (payload_path, obj_type) in zip(results, items)
+        ]
     
     def _ensure_permissions_preserved(self, source_path: str) -> str:
         """Ensure file permissions are preserved for external tools.
@@ -0,0 +1,56 @@
+# Runs swhid CLI invocations inside one Ruby process.
+#
+# Usage: ruby swhid_worker.rb SWHID_SCRIPT
+#
+# The swhid script is loaded once per request, so the interpreter and the
+# gem's files are only started and read once. A request on stdin is
+# "<argc>\n" followed by "<length>\n<bytes>" for each argument and then for
+# the path to use as the command's standard input (empty for none). The reply
+# on stdout is "<exit status> <stdout length> <stderr length>\n" followed by
+# the command's stdout and stderr.
+
+require 'stringio'
+
+script = ARGV.shift
+requests = STDIN.dup.binmode
+replies = STDOUT.dup.binmode
+# Anything written to the STDOUT constant must not corrupt the replies
+STDOUT.reopen(File::NULL)
+# Reloading the script redefines its constants
+$VERBOSE = nil
+
+def read_field(io)
+  line = io.gets or exit
+  io.read(Integer(line))
+end
+
+while (line = requests.gets)
+  args = Array.new(Integer(line)) { read_field(requests) }
+  input = read_field(requests)
+
+  out = StringIO.new(String.new)
+  err = StringIO.new(String.new)
+  $stdout = out
+  $stderr = err
+  ARGV.replace(args)
+
+  status = 0
+  begin
+    STDIN.reopen(input.empty? ? File::NULL : input, 'rb')
+    $stdin = STDIN
+    load script
+  rescue SystemExit => e
+    status = e.status
+  rescue Exception => e
+    err.write("#{e.class}: #{e.message}\n")
+    status = 1
+  ensure
+    $stdout = STDOUT
+    $stderr = STDERR
+  end
+
+  out_bytes = out.string.b
+  err_bytes = err.string.b
+  replies.write("#{status} #{out_bytes.bytesize} #{err_bytes.bytesize}\n", out_bytes, err_bytes)
+  replies.flush
+end
@@ -15,18 +15,219 @@ This script reads the JSON results file and creates an HTML table showing:
 
 import argparse
 import json
-import re
+import mmap
+import os
 import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 from html import escape
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Hash character sets; a hash is classified with subset tests on its set of
+# characters, so it is only scanned once
+_HEX_CHARS = frozenset('0123456789abcdef')
+_BASE85_CHARS = frozenset(chr(c) for c in range(33, 118))  # ! through u
+_BASE32_CHARS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZ234567=')
+_BASE64_CHARS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=')
+
+# Hash length -> algorithm, for the non-ambiguous lengths other than hex
+# (hex lengths and the ambiguous length 40 are handled first)
+_LENGTH_TO_HASH_ALGO = {
+    # Base64 (with padding)
+    27: 'sha1',      # SHA1 base64
+    44: 'sha256',    # SHA256 base64
+    88: 'sha512',    # SHA512 base64
+    
+    # Base64 (without padding)
+    43: 'sha256',    # SHA256 base64 (no padding)
+    86: 'sha512',    # SHA512 base64 (no padding)
+    
+    # Base85 (non-ambiguous lengths)
+    25: 'sha1',      # SHA1 base85
+    50: 'sha512',    # SHA512 base85
+    
+    # Base32
+    32: 'sha1',      # SHA1 base32
+    52: 'sha256',    # SHA256 base32
+    104: 'sha512',   # SHA512 base32
+}
+
+# Static parts of the generated pages
+_TABLE_STYLE_HTML = (
+    '<style>\n'
+    '''
+        body {
+            font-family: Arial, sans-serif;
+            margin: 20px;
+            background-color: #f5f5f5;
+        }
+        h1 {
+            color: #333;
+        }
+        table {
+            border-collapse: collapse;
+            width: 100%;
+            background-color: white;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }
+        th {
+            background-color: #4CAF50;
+            color: white;
+            padding: 10px;
+            text-align: left;
+            font-weight: bold;
+            position: sticky;
+            top: 0;
+            z-index: 10;
+        }
+        td {
+            padding: 4px 8px;
+            border: 1px solid #ddd;
+            font-size: 10px;
+            white-space: nowrap;
+            overflow: hidden;
+            text-overflow: ellipsis;
+            max-width: 150px;
+            min-width: 80px;
+        }
+        td.test-name {
+            font-weight: bold;
+            background-color: #f9f9f9;
+            max-width: 300px;
+        }
+        td.expected {
+            font-family: monospace;
+            font-size: 9px;
+            max-width: 200px;
+        }
+        tr:hover {
+            background-color: #f5f5f5;
+        }
+        .legend {
+            margin: 20px 0;
+            padding: 15px;
+            background-color: white;
+            border-radius: 5px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }
+        .legend-item {
+            display: inline-block;
+            margin: 5px 15px;
+        }
+        .color-box {
+            display: inline-block;
+            width: 20px;
+            height: 20px;
+            border: 1px solid #ccc;
+            vertical-align: middle;
+            margin-right: 5px;
+        }
+        .tooltip {
+            position: relative;
+            cursor: help;
+        }
+        .tooltip:hover::after {
+            content: attr(title);
+            position: absolute;
+            left: 100%;
+            top: 0;
+            background-color: #333;
+            color: white;
+            padding: 5px 10px;
+            border-radius: 3px;
+            white-space: pre-wrap;
+            z-index: 1000;
+            min-width: 200px;
+            font-size: 11px;
+        }
+    '''
+    '\n</style>'
+)
+
+_INDEX_STYLE_HTML = (
+    '<style>\n'
+    '''
+        body {
+            font-family: Arial, sans-serif;
+            margin: 20px;
+            background-color: #f5f5f5;
+        }
+        h1 {
+            color: #333;
+        }
+        table {
+            border-collapse: collapse;
+            width: 100%;
+            background-color: white;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+            margin-top: 20px;
+        }
+        th {
+            background-color: #4CAF50;
+            color: white;
+            padding: 10px;
+            text-align: left;
+            font-weight: bold;
+        }
+        td {
+            padding: 8px;
+            border: 1px solid #ddd;
+        }
+        tr:hover {
+            background-color: #f5f5f5;
+        }
+        .pass-rate {
+            font-weight: bold;
+        }
+        .pass-rate.high {
+            color: #4CAF50;
+        }
+        .pass-rate.medium {
+            color: #FF9800;
+        }
+        .pass-rate.low {
+            color: #F44336;
+        }
+        a {
+            color: #2196F3;
+            text-decoration: none;
+        }
+        a:hover {
+            text-decoration: underline;
+        }
+    '''
+    '\n</style>'
+)
+
+_LEGEND_HTML = '\n'.join([
+    '<div class="legend">',
+    '<strong>Legend:</strong>',
+    '<div class="legend-item"><span class="color-box" style="background-color: #888888;"></span>SKIP - Test was skipped</div>',
+    '<div class="legend-item"><span class="color-box" style="background-color: #90EE90;"></span>CONFORMANT - PASS with matching expected SWHID</div>',
+    '<div class="legend-item"><span class="color-box" style="background-color: #FF6B6B;"></span>NON-CONFORMANT - Wrong SWHID or FAIL with expected</div>',
+    '<div class="legend-item"><span class="color-box" style="background-color: #87CEEB;"></span>EXECUTED_OK - PASS but no expected to compare</div>',
+    '<div class="legend-item"><span class="color-box" style="background-color: #FFD700;"></span>EXECUTED_ERROR - FAIL without expected</div>',
+    '</div>',
+])
+
+# Cell for an implementation with no result for a test
+_TD_NA = '<td style="background-color: #f0f0f0;">N/A</td>'
+
 
 class VariantRegistry:
     """Registry for SWHID variants (version + hash algorithm + serialization format)."""
     
     def __init__(self):
         self.variants: Dict[str, Dict] = {}
+        # Implementations mostly agree, so the same SWHID is looked up many times
+        self._variant_cache: Dict[str, Optional[str]] = {}
         self._register_defaults()
     
     def _register_defaults(self):
@@ -76,20 +277,31 @@ class VariantRegistry:
         Returns:
             Variant ID like 'v1_sha1_hex' or 'v2_sha256_hex', or None if not detected
         """
+        if swhid in self._variant_cache:
+            return self._variant_cache[swhid]
+        
+        variant_id = self._detect_variant(swhid)
+        self._variant_cache[swhid] = variant_id
+        return variant_id
+    
+    def _detect_variant(self, swhid: str) -> Optional[str]:
+        """Detect variant from SWHID string format, without caching."""
         if not swhid or not swhid.startswith('swh:'):
             return None
         
-        parts = swhid.split(':')
-        if len(parts) < 4:
+        # Needs at least four ':'-separated parts; slice them out rather than
+        # splitting, as only the version and the last part are used
+        version_end = swhid.find(':', 4)
+        if version_end < 0 or swhid.find(':', version_end + 1) < 0:
             return None
         
-        version_str = parts[1]  # "1", "2", etc.
+        version_str = swhid[4:version_end]  # "1", "2", etc.
         try:
             version = int(version_str)
         except ValueError:
             return None
         
-        hash_part = parts[-1]  # Last part is the hash
+        hash_part = swhid[swhid.rfind(':') + 1:]  # Last part is the hash
         
         # Detect serialization format first (needed for disambiguation)
         serialization = self._detect_serialization_format(hash_part)
@@ -130,51 +342,16 @@ class VariantRegistry:
         Returns:
             Hash algorithm name (sha1, sha256, sha512) or 'unknown'
         """
-        # Handle ambiguous lengths using serialization
-        if serialization:
-            if hash_length == 40:
-                if serialization == 'hex':
-                    return 'sha1'
-                elif serialization == 'base85':
-                    return 'sha256'
-            # Add other ambiguous cases as needed
-        
-        # Direct length mappings (non-ambiguous)
-        # Note: 40 is ambiguous (SHA1 hex or SHA256 base85), so it's handled above
-        length_to_algo = {
-            # Hex (non-ambiguous lengths)
-            64: 'sha256',    # SHA256 hex
-            128: 'sha512',   # SHA512 hex
-            
-            # Base64 (with padding)
-            27: 'sha1',      # SHA1 base64
-            44: 'sha256',    # SHA256 base64
-            88: 'sha512',    # SHA512 base64
-            
-            # Base64 (without padding)
-            43: 'sha256',    # SHA256 base64 (no padding)
-            86: 'sha512',   # SHA512 base64 (no padding)
-            
-            # Base85 (non-ambiguous lengths)
-            25: 'sha1',      # SHA1 base85
-            50: 'sha512',    # SHA512 base85
-            
-            # Base32
-            32: 'sha1',      # SHA1 base32
-            52: 'sha256',    # SHA256 base32
-            104: 'sha512',   # SHA512 base32
-        }
-        
-        # Check non-ambiguous mappings first
-        if hash_length in length_to_algo:
-            return length_to_algo[hash_length]
-        
-        # Handle ambiguous length 40 (SHA1 hex or SHA256 base85)
-        # Default to SHA1 hex if serialization not provided (backward compatibility)
+        # Common hex cases first; 40 is ambiguous (SHA1 hex or SHA256 base85)
+        # and defaults to SHA1 hex if serialization not provided (backward compatibility)
+        if hash_length == 64:
+            return 'sha256'
         if hash_length == 40:
-            return 'sha1'  # Default assumption for backward compatibility
+            return 'sha256' if serialization == 'base85' else 'sha1'
+        if hash_length == 128:
+            return 'sha512'
         
-        return 'unknown'
+        return _LENGTH_TO_HASH_ALGO.get(hash_length, 'unknown')
     
     def _detect_serialization_format(self, hash_part: str) -> str:
         """Detect serialization format from hash character set.
@@ -188,21 +365,28 @@ class VariantRegistry:
         Returns:
             'hex', 'base85', 'base32', 'base64', or 'unknown'
         """
+        # A single trailing newline is ignored, as the old '$'-anchored regexes did
+        if hash_part.endswith('\n'):
+            hash_part = hash_part[:-1]
+        if not hash_part:
+            return 'unknown'
+        chars = set(hash_part)
+        
         # Hex: only 0-9, a-f (most restrictive)
-        if re.match(r'^[0-9a-f]+$', hash_part):
+        if chars <= _HEX_CHARS:
             return 'hex'
         
         # Base85: ASCII characters 33-117 (! through u)
         # Must check before base64 since base85 charset is subset of base64
-        if re.match(r'^[!-u]+$', hash_part):
+        if chars <= _BASE85_CHARS:
             return 'base85'
         
         # Base32: A-Z, 2-7, = (padding), no lowercase, no 0, 1, 8, 9
-        if re.match(r'^[A-Z2-7=]+$', hash_part) and not re.search(r'[01]', hash_part):
+        if chars <= _BASE32_CHARS:
             return 'base32'
         
         # Base64: A-Z, a-z, 0-9, +, /, = (padding) (most permissive)
-        if re.match(r'^[A-Za-z0-9+/=]+$', hash_part):
+        if chars <= _BASE64_CHARS:
             return 'base64'
         
         return 'unknown'
@@ -249,62 +433,192 @@ def detect_variants_in_results(results_data: Dict, registry: VariantRegistry) ->
     return variants
 
 
-def filter_results_by_variant(results_data: Dict, variant_id: str, 
-                              registry: VariantRegistry) -> Dict:
-    """Filter results to only include specified variant.
+def compute_buckets_and_stats(results_data: Dict, variant_ids: List[str],
+                              registry: VariantRegistry) -> Tuple[Dict[str, Dict], Dict[str, Counter]]:
+    """Split results by variant and count their statuses, in a single pass.
     
     Args:
         results_data: Full results dictionary
-        variant_id: Variant identifier like 'v1_sha1_hex'
+        variant_ids: Variant identifiers like 'v1_sha1_hex'
         registry: VariantRegistry instance
     
     Returns:
-        Filtered results dictionary with only tests/results for the specified variant
+        Tuple of (dictionary mapping each variant ID to a filtered results
+        dictionary as returned by filter_results_by_variant, dictionary
+        mapping each variant ID to a Counter of its result statuses)
     """
-    variant_config = registry.get_variant_config(variant_id)
-    if not variant_config:
-        raise ValueError(f"Unknown variant: {variant_id}")
+    variant_configs = {}
+    for variant_id in variant_ids:
+        variant_config = registry.get_variant_config(variant_id)
+        if not variant_config:
+            raise ValueError(f"Unknown variant: {variant_id}")
+        variant_configs[variant_id] = variant_config
+    
+    filtered_tests = {variant_id: [] for variant_id in variant_configs}
+    status_counts = {variant_id: Counter() for variant_id in variant_configs}
     
-    filtered_tests = []
+    # What each result is checked against, looked up once
+    variant_checks = [
+        (variant_id, config['swhid_prefix'], config['hash_length'], config['serialization'])
+        for variant_id, config in variant_configs.items()
+    ]
+    detect_serialization = registry._detect_serialization_format
     
     for test in results_data.get('tests', []):
-        filtered_results = []
+        filtered_results = {}
         for result in test.get('results', []):
             swhid = result.get('swhid', '')
-            if swhid.startswith(variant_config['swhid_prefix']):
-                # Check hash length matches
-                hash_part = swhid.split(':')[-1]
-                if len(hash_part) == variant_config['hash_length']:
-                    # Additional check: verify serialization format matches
-                    detected_serialization = registry._detect_serialization_format(hash_part)
-                    if detected_serialization == variant_config['serialization']:
-                        filtered_results.append(result)
+            hash_part = swhid[swhid.rfind(':') + 1:]
+            serialization = None
+            for variant_id, prefix, hash_length, variant_serialization in variant_checks:
+                # Check prefix and hash length, then that the serialization
+                # format matches
+                if swhid.startswith(prefix) and len(hash_part) == hash_length:
+                    if serialization is None:
+                        serialization = detect_serialization(hash_part)
+                    if serialization == variant_serialization:
+                        filtered_results.setdefault(variant_id, []).append(result)
+                        status_counts[variant_id][result.get('status')] += 1
         
-        if filtered_results:
+        for variant_id, results in filtered_results.items():
             # Create filtered test with variant-appropriate expected
-            expected_key = variant_config['expected_key']
+            expected_key = variant_configs[variant_id]['expected_key']
             expected = test.get('expected', {})
             
-            # Get the expected value for this variant
-            expected_value = expected.get(expected_key)
-            
             # Create filtered expected dict with the variant-specific key
-            filtered_expected = {expected_key: expected_value}
+            filtered_expected = {expected_key: expected.get(expected_key)}
             
-            filtered_test = {
+            filtered_tests[variant_id].append({
                 'id': test['id'],
                 'category': test.get('category'),
                 'payload_ref': test.get('payload_ref'),
                 'expected': filtered_expected,
-                'results': filtered_results
-            }
-            filtered_tests.append(filtered_test)
-    
-    return {
-        'run': results_data.get('run'),
-        'implementations': results_data.get('implementations'),
-        'tests': filtered_tests
+                'results': results
+            })
+    
+    buckets = {
+        variant_id: {
+            'run': results_data.get('run'),
+            'implementations': results_data.get('implementations'),
+            'tests': tests
+        }
+        for variant_id, tests in filtered_tests.items()
     }
+    return buckets, status_counts
+
+
+def bucket_results_by_variant(results_data: Dict, variant_ids: List[str],
+                              registry: VariantRegistry) -> Dict[str, Dict]:
+    """Split results by variant in a single pass.
+    
+    Args:
+        results_data: Full results dictionary
+        variant_ids: Variant identifiers like 'v1_sha1_hex'
+        registry: VariantRegistry instance
+    
+    Returns:
+        Dictionary mapping each variant ID to a filtered results dictionary,
+        as returned by filter_results_by_variant
+    """
+    return compute_buckets_and_stats(results_data, variant_ids, registry)[0]
+
+
+def filter_results_by_variant(results_data: Dict, variant_id: str, 
+                              registry: VariantRegistry) -> Dict:
+    """Filter results to only include specified variant.
+    
+    Args:
+        results_data: Full results dictionary
+        variant_id: Variant identifier like 'v1_sha1_hex'
+        registry: VariantRegistry instance
+    
+    Returns:
+        Filtered results dictionary with only tests/results for the specified variant
+    """
+    return bucket_results_by_variant(results_data, [variant_id], registry)[variant_id]
+
+
+def _parse_json(data) -> object:
+    """Parse JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # json also accepts NaN and escaped lone surrogates, and reports
+            # real errors the same way
+            pass
+    return json.loads(data)
+
+
+# NDJSON record type -> (results key, whether records of the type form a list)
+_NDJSON_RECORD_KEYS = {
+    'run_info': ('run', False),
+    'implementation': ('implementations', True),
+    'test_case': ('tests', True),
+    'aggregates': ('aggregates', False),
+}
+
+
+def load_ndjson_results(results_path: Path) -> Dict:
+    """Read an NDJSON results file into the layout of a JSON results file.
+    
+    Records are parsed one line at a time, so the file is never held in
+    memory as a whole.
+    """
+    results_data = {'implementations': [], 'tests': []}
+    with open(results_path, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = _parse_json(line)
+            key, is_list = _NDJSON_RECORD_KEYS.get(record.pop('type', None), (None, False))
+            if key is None:
+                continue
+            if is_list:
+                results_data[key].append(record)
+            else:
+                results_data[key] = record
+    return results_data
+
+
+def load_results(results_path: Path) -> Dict:
+    """Read a JSON or NDJSON (.ndjson, .jsonl) results file, using orjson when it is installed."""
+    if results_path.suffix in ('.ndjson', '.jsonl'):
+        return load_ndjson_results(results_path)
+    if orjson is not None:
+        try:
+            # orjson parses the mapped file directly, without reading it
+            # into a bytes copy first
+            with open(results_path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                    memoryview(mm) as view:
+                return orjson.loads(view)
+        except ValueError:
+            # Empty files cannot be mapped; json also accepts NaN and escaped
+            # lone surrogates, and reports real errors the same way
+            pass
+    return json.loads(results_path.read_bytes())
+
+
+# (status, has expected SWHID, SWHID matches expected) ->
+#     (status label, html color, whether the cell shows the SWHID)
+_CELL_STATUS = {
+    # Gray - color only, no text
+    ('SKIPPED', False, False): ('SKIP', '#888888', False),
+    ('SKIPPED', True, False): ('SKIP', '#888888', False),
+    ('SKIPPED', True, True): ('SKIP', '#888888', False),
+    # Light green - color only, no text
+    ('PASS', True, True): ('CONFORMANT', '#90EE90', False),
+    # Light red - full wrong SWHID
+    ('PASS', True, False): ('NON-CONFORMANT', '#FF6B6B', True),
+    # Sky blue - color only
+    ('PASS', False, False): ('EXECUTED_OK', '#87CEEB', False),
+    # Light red - full SWHID for discrepancy if available
+    ('FAIL', True, True): ('NON-CONFORMANT', '#FF6B6B', True),
+    ('FAIL', True, False): ('NON-CONFORMANT', '#FF6B6B', True),
+    # Gold - color only, no text
+    ('FAIL', False, False): ('EXECUTED_ERROR', '#FFD700', False),
+}
 
 
 def determine_cell_status(result: Dict, expected_swhid: Optional[str]) -> Tuple[str, str, Optional[str]]:
@@ -314,34 +628,16 @@ def determine_cell_status(result: Dict, expected_swhid: Optional[str]) -> Tuple[
     Returns:
         Tuple of (status_label, html_color, cell_content)
     """
-    status = result.get('status', 'UNKNOWN')
     swhid = result.get('swhid')
-    error = result.get('error')
+    has_expected = bool(expected_swhid)
+    key = (result.get('status', 'UNKNOWN'), has_expected, has_expected and swhid == expected_swhid)
     
-    if status == 'SKIPPED':
-        return ('SKIP', '#888888', '')  # Gray - color only, no text
+    cell_status = _CELL_STATUS.get(key)
+    if cell_status is None:
+        return ('UNKNOWN', '#FFFFFF', 'Unknown')
     
-    if status == 'PASS':
-        if expected_swhid:
-            if swhid == expected_swhid:
-                return ('CONFORMANT', '#90EE90', '')  # Light green - color only, no text
-            else:
-                # Non-conformant: show full wrong SWHID
-                return ('NON-CONFORMANT', '#FF6B6B', swhid)  # Light red - full SWHID
-        else:
-            return ('EXECUTED_OK', '#87CEEB', '')  # Sky blue - color only
-    
-    if status == 'FAIL':
-        if expected_swhid:
-            # Non-conformant: show full wrong SWHID if available
-            if swhid:
-                return ('NON-CONFORMANT', '#FF6B6B', swhid)  # Full SWHID for discrepancy
-            else:
-                return ('NON-CONFORMANT', '#FF6B6B', '')  # Red - color only, no text
-        else:
-            return ('EXECUTED_ERROR', '#FFD700', '')  # Gold - color only, no text
-    
-    return ('UNKNOWN', '#FFFFFF', 'Unknown')
+    status_label, color, show_swhid = cell_status
+    return (status_label, color, swhid if show_swhid and swhid else '')
 
 
 def get_error_summary(error: Optional[Dict]) -> str:
@@ -357,18 +653,44 @@ def get_error_summary(error: Optional[Dict]) -> str:
     return error_message
 
 
-def create_html_table(results_data: Dict, variant_config: Optional[Dict] = None) -> str:
-    """Create an HTML table with color-coded results.
+def sorted_implementation_ids(results_data: Dict) -> List[str]:
+    """Get the sorted implementation IDs of a results dictionary."""
+    return sorted(impl['id'] for impl in results_data.get('implementations') or [])
+
+
+def results_in_column_order(results: List[Dict], impl_index: Dict[str, int]) -> List[Optional[Dict]]:
+    """Place a test's results in a list indexed by implementation column.
+    
+    Columns without a result hold None; results of implementations without
+    a column are dropped.
+    """
+    columns: List[Optional[Dict]] = [None] * len(impl_index)
+    for result in results:
+        i = impl_index.get(result['implementation'])
+        if i is not None:
+            columns[i] = result
+    return columns
+
+
+def iter_html_table(results_data: Dict, variant_config: Optional[Dict] = None,
+                    implementations: Optional[List[str]] = None) -> Iterator[str]:
+    """Generate an HTML table with color-coded results, one line at a time.
+    
+    The lines are yielded without their newline separators, so large tables
+    can be written out without building the whole document in memory.
     
     Args:
         results_data: Results dictionary with tests and implementations
         variant_config: Optional variant configuration dict for variant-specific display
+        implementations: Sorted implementation IDs, if already known
     """
-    implementations = sorted([impl['id'] for impl in results_data.get('implementations', [])])
+    if implementations is None:
+        implementations = sorted_implementation_ids(results_data)
     tests = results_data.get('tests', [])
     
     if not implementations or not tests:
-        return "<p>No data to display</p>"
+        yield "<p>No data to display</p>"
+        return
     
     # Determine variant info for title
     if variant_config:
@@ -379,125 +701,34 @@ def create_html_table(results_data: Dict, variant_config: Optional[Dict] = None)
         variant_title = None
     
     # Start HTML
-    html = ['<!DOCTYPE html>', '<html>', '<head>', '<meta charset="UTF-8">']
-    html.append(f'<title>{escape(page_title)}</title>')
-    html.append('<style>')
-    html.append('''
-        body {
-            font-family: Arial, sans-serif;
-            margin: 20px;
-            background-color: #f5f5f5;
-        }
-        h1 {
-            color: #333;
-        }
-        table {
-            border-collapse: collapse;
-            width: 100%;
-            background-color: white;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }
-        th {
-            background-color: #4CAF50;
-            color: white;
-            padding: 10px;
-            text-align: left;
-            font-weight: bold;
-            position: sticky;
-            top: 0;
-            z-index: 10;
-        }
-        td {
-            padding: 4px 8px;
-            border: 1px solid #ddd;
-            font-size: 10px;
-            white-space: nowrap;
-            overflow: hidden;
-            text-overflow: ellipsis;
-            max-width: 150px;
-            min-width: 80px;
-        }
-        td.test-name {
-            font-weight: bold;
-            background-color: #f9f9f9;
-            max-width: 300px;
-        }
-        td.expected {
-            font-family: monospace;
-            font-size: 9px;
-            max-width: 200px;
-        }
-        tr:hover {
-            background-color: #f5f5f5;
-        }
-        .legend {
-            margin: 20px 0;
-            padding: 15px;
-            background-color: white;
-            border-radius: 5px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }
-        .legend-item {
-            display: inline-block;
-            margin: 5px 15px;
-        }
-        .color-box {
-            display: inline-block;
-            width: 20px;
-            height: 20px;
-            border: 1px solid #ccc;
-            vertical-align: middle;
-            margin-right: 5px;
-        }
-        .tooltip {
-            position: relative;
-            cursor: help;
-        }
-        .tooltip:hover::after {
-            content: attr(title);
-            position: absolute;
-            left: 100%;
-            top: 0;
-            background-color: #333;
-            color: white;
-            padding: 5px 10px;
-            border-radius: 3px;
-            white-space: pre-wrap;
-            z-index: 1000;
-            min-width: 200px;
-            font-size: 11px;
-        }
-    ''')
-    html.append('</style>')
-    html.append('</head>')
-    html.append('<body>')
-    html.append(f'<h1>{escape(page_title)}</h1>')
+    yield from ('<!DOCTYPE html>', '<html>', '<head>', '<meta charset="UTF-8">')
+    yield f'<title>{escape(page_title)}</title>'
+    yield _TABLE_STYLE_HTML
+    yield '</head>'
+    yield '<body>'
+    yield f'<h1>{escape(page_title)}</h1>'
     
     # Add variant info if available
     if variant_title:
-        html.append(f'<p><strong>Variant:</strong> {escape(variant_title)}</p>')
+        yield f'<p><strong>Variant:</strong> {escape(variant_title)}</p>'
     
     # Add legend
-    html.append('<div class="legend">')
-    html.append('<strong>Legend:</strong>')
-    html.append('<div class="legend-item"><span class="color-box" style="background-color: #888888;"></span>SKIP - Test was skipped</div>')
-    html.append('<div class="legend-item"><span class="color-box" style="background-color: #90EE90;"></span>CONFORMANT - PASS with matching expected SWHID</div>')
-    html.append('<div class="legend-item"><span class="color-box" style="background-color: #FF6B6B;"></span>NON-CONFORMANT - Wrong SWHID or FAIL with expected</div>')
-    html.append('<div class="legend-item"><span class="color-box" style="background-color: #87CEEB;"></span>EXECUTED_OK - PASS but no expected to compare</div>')
-    html.append('<div class="legend-item"><span class="color-box" style="background-color: #FFD700;"></span>EXECUTED_ERROR - FAIL without expected</div>')
-    html.append('</div>')
+    yield _LEGEND_HTML
     
     # Start table
-    html.append('<table>')
-    html.append('<thead>')
-    html.append('<tr>')
-    html.append('<th>Test Case</th>')
-    html.append('<th>Expected SWHID</th>')
-    for impl in implementations:
-        html.append(f'<th>{escape(impl)}</th>')
-    html.append('</tr>')
-    html.append('</thead>')
-    html.append('<tbody>')
+    yield '<table>'
+    yield '<thead>'
+    yield '\n'.join([
+        '<tr>',
+        '<th>Test Case</th>',
+        '<th>Expected SWHID</th>',
+        *(f'<th>{escape(impl)}</th>' for impl in implementations),
+        '</tr>',
+    ])
+    yield '</thead>'
+    yield '<tbody>'
+    
+    impl_index = {impl: i for i, impl in enumerate(implementations)}
     
     # Add rows
     for test in tests:
@@ -514,55 +745,86 @@ def create_html_table(results_data: Dict, variant_config: Optional[Dict] = None)
         
         results = test.get('results', [])
         
-        result_map = {r['implementation']: r for r in results}
-        
-        html.append('<tr>')
+        # Test name and expected SWHID
+        expected_display = escape(expected_swhid) if expected_swhid else ''
+        row = [
+            f'<tr>\n<td class="test-name">{escape(test_id)}</td>\n'
+            f'<td class="expected">{expected_display}</td>'
+        ]
         
-        # Test name
-        html.append(f'<td class="test-name">{escape(test_id)}</td>')
+        # Escaped once per row, as it is the same in every cell's tooltip
+        expected_tooltip = escape(f"\nExpected: {expected_swhid}") if expected_swhid else ''
         
-        # Expected SWHID
-        expected_display = escape(expected_swhid) if expected_swhid else ''
-        html.append(f'<td class="expected">{expected_display}</td>')
+        # Cells without an error only depend on the status and the SWHID, and
+        # repeat within a row (e.g. for every conformant implementation)
+        row_cells = {}
         
         # Results per implementation
-        for impl in implementations:
-            result = result_map.get(impl)
+        for result in results_in_column_order(results, impl_index):
             if not result:
-                html.append('<td style="background-color: #f0f0f0;">N/A</td>')
-            else:
-                status_label, color, content = determine_cell_status(result, expected_swhid)
-                
-                # Build tooltip with full details
-                tooltip_parts = [f"Status: {status_label}"]
-                if result.get('swhid'):
-                    tooltip_parts.append(f"SWHID: {result.get('swhid')}")
-                if expected_swhid:
-                    tooltip_parts.append(f"Expected: {expected_swhid}")
-                if result.get('error'):
-                    error_summary = get_error_summary(result.get('error'))
-                    tooltip_parts.append(f"Error: {error_summary}")
-                
-                tooltip = '\n'.join(tooltip_parts)
+                row.append(_TD_NA)
+                continue
+            
+            status_label, color, content = determine_cell_status(result, expected_swhid)
+            result_swhid = result.get('swhid')
+            error = result.get('error')
+            cell_key = None if error else (status_label, result_swhid)
+            cell = row_cells.get(cell_key)
+            if cell is None:
+                # Build tooltip with full details (escaping is per character, so
+                # the escaped parts can be concatenated)
+                tooltip = f"Status: {status_label}"
+                if result_swhid:
+                    tooltip += f"\nSWHID: {result_swhid}"
+                tooltip = escape(tooltip) + expected_tooltip
+                if error:
+                    tooltip += escape(f"\nError: {get_error_summary(error)}")
                 
                 # Display content (for non-conformant, content already contains full SWHID)
                 # For conformant/executed_ok, content is empty (color only)
                 display_content = escape(str(content)).replace('\n', '<br>') if content else ''
                 
-                html.append(f'<td class="tooltip" style="background-color: {color};" title="{escape(tooltip)}">{display_content}</td>')
+                cell = f'<td class="tooltip" style="background-color: {color};" title="{tooltip}">{display_content}</td>'
+                if cell_key is not None:
+                    row_cells[cell_key] = cell
+            row.append(cell)
         
-        html.append('</tr>')
+        row.append('</tr>')
+        yield '\n'.join(row)
     
-    html.append('</tbody>')
-    html.append('</table>')
-    html.append('</body>')
-    html.append('</html>')
+    yield '</tbody>'
+    yield '</table>'
+    yield '</body>'
+    yield '</html>'
+
+
+
+def create_html_table(results_data: Dict, variant_config: Optional[Dict] = None,
+                      implementations: Optional[List[str]] = None) -> str:
+    """Create an HTML table with color-coded results.
     
-    return '\n'.join(html)
+    Args:
+        results_data: Results dictionary with tests and implementations
+        variant_config: Optional variant configuration dict for variant-specific display
+        implementations: Sorted implementation IDs, if already known
+    """
+    return '\n'.join(iter_html_table(results_data, variant_config, implementations))
+
+
+def _write_html(output_file: Path, lines: Iterator[str]) -> None:
+    """Write HTML lines to a file, encoded as UTF-8, as they are generated."""
+    with open(output_file, 'wb', buffering=1 << 20) as f:
+        separator = b''
+        for line in lines:
+            f.write(separator)
+            f.write(line.encode('utf-8'))
+            separator = b'\n'
 
 
 def generate_table_for_variant(results_data: Dict, variant_id: str, 
-                               output_dir: Path, registry: VariantRegistry) -> Path:
+                               output_dir: Path, registry: VariantRegistry,
+                               filtered_data: Optional[Dict] = None,
+                               implementations: Optional[List[str]] = None) -> Path:
     """Generate HTML table for specific variant.
     
     Args:
@@ -570,6 +832,8 @@ def generate_table_for_variant(results_data: Dict, variant_id: str,
         variant_id: Variant identifier like 'v1_sha1_hex'
         output_dir: Directory to write output file
         registry: VariantRegistry instance
+        filtered_data: Results already filtered for this variant, if available
+        implementations: Sorted implementation IDs, if already known
     
     Returns:
         Path to generated HTML file
@@ -579,18 +843,24 @@ def generate_table_for_variant(results_data: Dict, variant_id: str,
         raise ValueError(f"Unknown variant: {variant_id}")
     
     # Filter results for this variant
-    filtered_data = filter_results_by_variant(results_data, variant_id, registry)
-    
-    # Generate HTML table
-    html_content = create_html_table(filtered_data, variant_config)
+    if filtered_data is None:
+        filtered_data = filter_results_by_variant(results_data, variant_id, registry)
     
-    # Save to variant-specific file
+    # Generate HTML table into a variant-specific file
     output_file = output_dir / f"results_{variant_id}.html"
-    output_file.write_text(html_content, encoding='utf-8')
+    _write_html(output_file, iter_html_table(filtered_data, variant_config, implementations))
     
     return output_file
 
 
+def _generate_variant_table(args: Tuple) -> Path:
+    """Generate one variant's table from pre-filtered data (picklable for worker processes)."""
+    variant_id, output_dir, registry, filtered_data, implementations = args
+    return generate_table_for_variant(
+        filtered_data, variant_id, output_dir, registry, filtered_data, implementations
+    )
+
+
 def generate_all_tables(results_data: Dict, output_dir: Path, 
                        registry: VariantRegistry) -> List[Path]:
     """Generate separate tables for all detected variants.
@@ -612,28 +882,43 @@ def generate_all_tables(results_data: Dict, output_dir: Path,
     if not variants:
         # No variants detected - generate single table (backward compatibility)
         output_file = output_dir / "results.html"
-        html_content = create_html_table(results_data)
-        output_file.write_text(html_content, encoding='utf-8')
+        _write_html(output_file, iter_html_table(results_data))
         return [output_file]
     
     output_files = []
     
-    # Generate table for each variant
-    for variant_id in sorted(variants):
-        output_file = generate_table_for_variant(
-            results_data, variant_id, output_dir, registry
-        )
-        output_files.append(output_file)
+    # Split results by variant once, for both the tables and the index
+    buckets, status_counts = compute_buckets_and_stats(results_data, sorted(variants), registry)
+    
+    # All variant tables have the same implementation columns
+    implementations = sorted_implementation_ids(results_data)
+    
+    # Generate table for each variant; the tables are independent, so use a
+    # process per variant when there are several CPUs to spread them over
+    table_args = [
+        (variant_id, output_dir, registry, filtered_data, implementations)
+        for variant_id, filtered_data in buckets.items()
+    ]
+    workers = min(len(table_args), os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            output_files.extend(executor.map(_generate_variant_table, table_args))
+    else:
+        output_files.extend(map(_generate_variant_table, table_args))
     
     # Generate index page
-    index_file = generate_index_page(variants, output_dir, results_data, registry)
+    index_file = generate_index_page(
+        variants, output_dir, results_data, registry, buckets, status_counts
+    )
     output_files.append(index_file)
     
     return output_files
 
 
 def generate_index_page(variants: Set[str], output_dir: Path, 
-                       results_data: Dict, registry: VariantRegistry) -> Path:
+                       results_data: Dict, registry: VariantRegistry,
+                       buckets: Optional[Dict[str, Dict]] = None,
+                       status_counts: Optional[Dict[str, Counter]] = None) -> Path:
     """Generate index page linking to all variant tables.
     
     Args:
@@ -641,24 +926,25 @@ def generate_index_page(variants: Set[str], output_dir: Path,
         output_dir: Directory to write index file
         results_data: Full results dictionary (for statistics)
         registry: VariantRegistry instance
+        buckets: Results already split by variant, from compute_buckets_and_stats
+        status_counts: Result status counts per variant, from compute_buckets_and_stats
     
     Returns:
         Path to generated index.html file
     """
+    if buckets is None or status_counts is None:
+        buckets, status_counts = compute_buckets_and_stats(results_data, sorted(variants), registry)
+    
     # Calculate statistics per variant
     variant_stats = {}
     for variant_id in variants:
-        filtered_data = filter_results_by_variant(results_data, variant_id, registry)
-        tests = filtered_data.get('tests', [])
+        counts = status_counts[variant_id]
         
-        total_tests = len(tests)
-        total_results = sum(len(t.get('results', [])) for t in tests)
-        passed = sum(1 for t in tests for r in t.get('results', []) 
-                    if r.get('status') == 'PASS')
-        failed = sum(1 for t in tests for r in t.get('results', []) 
-                    if r.get('status') == 'FAIL')
-        skipped = sum(1 for t in tests for r in t.get('results', []) 
-                     if r.get('status') == 'SKIPPED')
+        total_tests = len(buckets[variant_id].get('tests', []))
+        total_results = sum(counts.values())
+        passed = counts['PASS']
+        failed = counts['FAIL']
+        skipped = counts['SKIPPED']
         
         pass_rate = round((passed / total_results * 100) if total_results > 0 else 0, 1)
         
@@ -676,58 +962,7 @@ def generate_index_page(variants: Set[str], output_dir: Path,
     # Generate HTML
     html = ['<!DOCTYPE html>', '<html>', '<head>', '<meta charset="UTF-8">']
     html.append('<title>SWHID Test Results - All Variants</title>')
-    html.append('<style>')
-    html.append('''
-        body {
-            font-family: Arial, sans-serif;
-            margin: 20px;
-            background-color: #f5f5f5;
-        }
-        h1 {
-            color: #333;
-        }
-        table {
-            border-collapse: collapse;
-            width: 100%;
-            background-color: white;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            margin-top: 20px;
-        }
-        th {
-            background-color: #4CAF50;
-            color: white;
-            padding: 10px;
-            text-align: left;
-            font-weight: bold;
-        }
-        td {
-            padding: 8px;
-            border: 1px solid #ddd;
-        }
-        tr:hover {
-            background-color: #f5f5f5;
-        }
-        .pass-rate {
-            font-weight: bold;
-        }
-        .pass-rate.high {
-            color: #4CAF50;
-        }
-        .pass-rate.medium {
-            color: #FF9800;
-        }
-        .pass-rate.low {
-            color: #F44336;
-        }
-        a {
-            color: #2196F3;
-            text-decoration: none;
-        }
-        a:hover {
-            text-decoration: underline;
-        }
-    ''')
-    html.append('</style>')
+    html.append(_INDEX_STYLE_HTML)
     html.append('</head>')
     html.append('<body>')
     html.append('<h1>SWHID Test Results - All Variants</h1>')
@@ -764,18 +999,20 @@ def generate_index_page(variants: Set[str], output_dir: Path,
         else:
             pass_rate_class = 'low'
         
-        html.append('<tr>')
-        html.append(f'<td><code>{escape(variant_id)}</code></td>')
-        html.append(f'<td>{config["version"]}</td>')
-        html.append(f'<td>{escape(config["hash_algo"].upper())}</td>')
-        html.append(f'<td>{escape(config["serialization"])}</td>')
-        html.append(f'<td>{stats["total_tests"]}</td>')
-        html.append(f'<td>{stats["total_results"]}</td>')
-        html.append(f'<td>{stats["passed"]}</td>')
-        html.append(f'<td>{stats["failed"]}</td>')
-        html.append(f'<td class="pass-rate {pass_rate_class}">{stats["pass_rate"]}%</td>')
-        html.append(f'<td><a href="results_{escape(variant_id)}.html">View Table</a></td>')
-        html.append('</tr>')
+        html.append(
+            f'<tr>\n'
+            f'<td><code>{escape(variant_id)}</code></td>\n'
+            f'<td>{config["version"]}</td>\n'
+            f'<td>{escape(config["hash_algo"].upper())}</td>\n'
+            f'<td>{escape(config["serialization"])}</td>\n'
+            f'<td>{stats["total_tests"]}</td>\n'
+            f'<td>{stats["total_results"]}</td>\n'
+            f'<td>{stats["passed"]}</td>\n'
+            f'<td>{stats["failed"]}</td>\n'
+            f'<td class="pass-rate {pass_rate_class}">{stats["pass_rate"]}%</td>\n'
+            f'<td><a href="results_{escape(variant_id)}.html">View Table</a></td>\n'
+            f'</tr>'
+        )
     
     html.append('</tbody>')
     html.append('</table>')
@@ -794,7 +1031,7 @@ def create_table_rich(results_data: Dict):
     console = Console()
     
     # Get implementations and tests
-    implementations = sorted([impl['id'] for impl in results_data.get('implementations', [])])
+    implementations = sorted_implementation_ids(results_data)
     tests = results_data.get('tests', [])
     
     if not implementations:
@@ -815,6 +1052,8 @@ def create_table_rich(results_data: Dict):
     for impl in implementations:
         table.add_column(impl, justify="center", max_width=25)
     
+    impl_index = {impl: i for i, impl in enumerate(implementations)}
+    
     # Add rows
     for test in tests:
         test_id = test.get('id', 'unknown')
@@ -822,9 +1061,6 @@ def create_table_rich(results_data: Dict):
         expected_swhid = expected.get('swhid')
         results = test.get('results', [])
         
-        # Create result map by implementation
-        result_map = {r['implementation']: r for r in results}
-        
         # Build row
         row = [test_id]
         
@@ -833,12 +1069,11 @@ def create_table_rich(results_data: Dict):
         row.append(expected_display)
         
         # Results per implementation
-        for impl in implementations:
-            result = result_map.get(impl)
+        for result in results_in_column_order(results, impl_index):
             if not result:
                 cell_text = Text('N/A', style='dim white')
             else:
-                status_label, color = determine_cell_status(result, expected_swhid)
+                status_label, color, _ = determine_cell_status(result, expected_swhid)
                 swhid = result.get('swhid')
                 error = result.get('error')
                 
@@ -865,17 +1100,17 @@ def create_table_rich(results_data: Dict):
 
 def create_table_basic(results_data: Dict) -> None:
     """Create a basic text table (fallback when rich is not available)."""
-    implementations = sorted([impl['id'] for impl in results_data.get('implementations', [])])
+    implementations = sorted_implementation_ids(results_data)
     tests = results_data.get('tests', [])
     
     if not implementations or not tests:
         print("No data to display")
         return
     
+    impl_index = {impl: i for i, impl in enumerate(implementations)}
+    
     # Print header
-    header = f"{'Test Case':<40} {'Expected':<25}"
-    for impl in implementations:
-        header += f" {impl:<25}"
+    header = ' '.join([f"{'Test Case':<40} {'Expected':<25}"] + [f"{impl:<25}" for impl in implementations])
     print(header)
     print("=" * len(header))
     
@@ -886,17 +1121,14 @@ def create_table_basic(results_data: Dict) -> None:
         expected_swhid = expected.get('swhid')
         results = test.get('results', [])
         
-        result_map = {r['implementation']: r for r in results}
-        
         expected_display = expected_swhid[:24] if expected_swhid else ''
-        row = f"{test_id:<40} {expected_display:<25}"
+        row = [f"{test_id:<40} {expected_display:<25}"]
         
-        for impl in implementations:
-            result = result_map.get(impl)
+        for result in results_in_column_order(results, impl_index):
             if not result:
                 cell = 'N/A'
             else:
-                status_label, _ = determine_cell_status(result, expected_swhid)
+                status_label, _, _ = determine_cell_status(result, expected_swhid)
                 swhid = result.get('swhid', '')
                 error = result.get('error')
                 
@@ -910,9 +1142,9 @@ def create_table_basic(results_data: Dict) -> None:
                 
                 cell = ' | '.join(cell_parts)
             
-            row += f" {cell:<25}"
+            row.append(f"{cell:<25}")
         
-        print(row)
+        print(' '.join(row))
 
 
 def print_legend(console: Optional = None):
@@ -953,7 +1185,7 @@ Examples:
     parser.add_argument(
         'results_file',
         type=str,
-        help='Path to the JSON results file (e.g., results.json)'
+        help='Path to the JSON or NDJSON results file (e.g., results.json, results.ndjson)'
     )
     parser.add_argument(
         '--output', '-o',
@@ -992,8 +1224,7 @@ Examples:
         sys.exit(1)
     
     try:
-        with open(results_path, 'r') as f:
-            results_data = json.load(f)
+        results_data = load_results(results_path)
     except json.JSONDecodeError as e:
         print(f"Error: Invalid JSON in results file: {e}", file=sys.stderr)
         sys.exit(1)
@@ -1028,19 +1259,13 @@ Examples:
                 print(f"  - {output_file}", file=sys.stderr)
     else:
         # Legacy single-table mode (backward compatible)
-        html_content = create_html_table(results_data)
-        
         if args.output:
             output_path = Path(args.output)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            print(f"HTML table written to: {output_path}", file=sys.stderr)
         else:
             # Default to results.html if no output specified
-            default_output = results_path.with_suffix('.html')
-            with open(default_output, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            print(f"HTML table written to: {default_output}", file=sys.stderr)
+            output_path = results_path.with_suffix('.html')
+        _write_html(output_path, iter_html_table(results_data))
+        print(f"HTML table written to: {output_path}", file=sys.stderr)
 
 
 if __name__ == '__main__':
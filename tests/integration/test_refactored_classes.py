@@ -35,6 +35,35 @@ class TestResourceManager:
         assert result == str(test_file)
         assert os.path.exists(result)
     
+    def test_extract_tarball_once(self, tmp_path):
+        """Test that a tarball is extracted once and the extraction reused."""
+        import tarfile
+        
+        source = tmp_path / "payload"
+        source.mkdir()
+        (source / "file.txt").write_text("test content")
+        tarball = tmp_path / "payload.tar.gz"
+        with tarfile.open(tarball, "w:gz") as tar:
+            tar.add(source, arcname="payload")
+        
+        manager = ResourceManager()
+        try:
+            first = manager.extract_tarball_if_needed(str(tarball), str(tmp_path))
+            second = manager.extract_tarball_if_needed("payload.tar.gz", str(tmp_path))
+            assert first == second
+            assert (Path(first) / "file.txt").read_text() == "test content"
+        finally:
+            manager.cleanup_temp_dirs()
+        assert not os.path.exists(first)
+        
+        # A new extraction is made after cleanup
+        third = manager.extract_tarball_if_needed(str(tarball), str(tmp_path))
+        try:
+            assert third != first
+            assert os.path.exists(third)
+        finally:
+            manager.cleanup_temp_dirs()
+    
     def test_cleanup_temp_dirs(self, tmp_path):
         """Test that temporary directories are cleaned up."""
         manager = ResourceManager()
@@ -270,6 +299,48 @@ settings:
         
         assert runner.config == config
         assert runner.implementations == implementations
+    
+    def test_runner_queries_implementation_once(self, tmp_path):
+        """Test that an implementation's info and capabilities are queried once per runner."""
+        from unittest.mock import Mock
+        from harness.plugins.base import ImplementationInfo, ImplementationCapabilities
+        
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text("""
+schema_version: "1.0.0"
+output:
+  results_dir: "results"
+payloads:
+  content:
+    - name: test
+      path: "test"
+settings:
+  timeout: 30
+  parallel_tests: 1
+""")
+        payload = tmp_path / "test"
+        payload.write_text("hello\n")
+        
+        impl = Mock()
+        impl.get_info.return_value = ImplementationInfo(
+            name="mock", version="1.0", language="python", description="", dependencies=[]
+        )
+        impl.get_capabilities.return_value = ImplementationCapabilities(
+            supported_types=["cnt"], supported_qualifiers=[], api_version="1.0"
+        )
+        impl.compute_swhid.return_value = "swh:1:cnt:ce013625030ba8dba906f756967f9e9ca394464a"
+        
+        config = HarnessConfig.load_from_file(str(config_path))
+        runner = TestRunner(config, str(config_path), {"mock": impl}, ResourceManager(), GitManager())
+        for _ in range(3):
+            result = runner.run_single_test(impl, str(payload), "test", "content")
+            assert result.success
+            assert result.implementation == "mock"
+        skipped = runner.run_single_test(impl, str(tmp_path), "dir", "directory")
+        assert not skipped.success
+        
+        assert impl.get_info.call_count == 1
+        assert impl.get_capabilities.call_count == 1
 
 
 class TestHarnessIntegration:
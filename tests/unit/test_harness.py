@@ -145,10 +145,10 @@ class TestSwhidHarness:
         mock_discovery = Mock()
         mock_impl1 = MockImplementation("impl1")
         mock_impl2 = MockImplementation("impl2")
-        mock_discovery.discover_implementations.return_value = {
+        mock_discovery.get_implementation.side_effect = {
             "impl1": mock_impl1,
             "impl2": mock_impl2
-        }
+        }.get
         mock_discovery_class.return_value = mock_discovery
         
         with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
@@ -171,6 +171,7 @@ class TestSwhidHarness:
             assert len(implementations) == 1
             assert "impl1" in implementations
             assert "impl2" not in implementations
+            mock_discovery.discover_implementations.assert_not_called()
         finally:
             os.unlink(config_path)
     
@@ -395,3 +396,65 @@ class TestSwhidHarness:
                 expected_swhid="swh:1:rev:expected",
                 expected_swhid_sha256=None
             )
+
+
+def _make_harness_results(test_id="hello.txt"):
+    """Build a small HarnessResults with one test case."""
+    from harness.models import (
+        HarnessResults, RunInfo, TestCase, ExpectedRef, Result, Metrics, Aggregates,
+        get_runner_info, make_run_id,
+    )
+    from datetime import datetime, timezone
+
+    return HarnessResults(
+        run=RunInfo(id=make_run_id(), created_at=datetime.now(timezone.utc),
+                    branch="main", commit="abc", runner=get_runner_info()),
+        implementations=[],
+        tests=[TestCase(
+            id=test_id, category="content",
+            expected=ExpectedRef(swhid="swh:1:cnt:test123"),
+            results=[Result(implementation="python", status="PASS", swhid="swh:1:cnt:test123",
+                            metrics=Metrics(wall_ms_median=1.0, wall_ms_mad=0.0, cpu_ms_median=1.0))],
+        )],
+        aggregates=Aggregates(by_implementation={"python": {"PASS": 1}}),
+    )
+
+
+@pytest.mark.parametrize("test_id", ["hello.txt", "bad\udcffname"])
+@pytest.mark.parametrize("use_orjson", [False, True])
+def test_write_results_files(tmp_path, test_id, use_orjson):
+    """Results written as NDJSON and canonical JSON load back to the same data.
+    
+    Lone surrogates (from undecodable file names) are rejected by orjson, so
+    the writers must fall back to json for them.
+    """
+    import json
+    from harness import harness as harness_module
+    from harness.harness import write_json_results, write_ndjson_results
+
+    if use_orjson:
+        # orjson is optional; stand in for it with one that rejects surrogates like it does
+        def dumps(obj, option=0):
+            serialized = json.dumps(obj, ensure_ascii=False, indent=2 if option & 1 else None)
+            try:
+                encoded = serialized.encode("utf-8")
+            except UnicodeEncodeError:
+                raise TypeError("str is not valid UTF-8: surrogates not allowed")
+            return encoded + (b"\n" if option & 2 else b"")
+        fake_orjson = Mock(dumps=dumps, OPT_INDENT_2=1, OPT_APPEND_NEWLINE=2)
+        patcher = patch.object(harness_module, "orjson", fake_orjson)
+    else:
+        patcher = patch.object(harness_module, "orjson", None)
+
+    results = _make_harness_results(test_id)
+    with patcher:
+        json_path = tmp_path / "results.json"
+        write_json_results(results, json_path)
+        ndjson_path = tmp_path / "results.ndjson"
+        write_ndjson_results(results, ndjson_path)
+
+    assert json.loads(json_path.read_bytes()) == results.model_dump(mode="json")
+    records = [json.loads(line) for line in ndjson_path.read_bytes().splitlines()]
+    assert [r["type"] for r in records] == ["run_info", "test_case", "aggregates"]
+    assert records[1]["id"] == test_id
+    assert records[1]["results"][0]["swhid"] == "swh:1:cnt:test123"
@@ -10,7 +10,7 @@ from unittest.mock import Mock, patch
 
 from harness.plugins.base import (
     SwhidImplementation, ImplementationInfo, SwhidTestResult, ComparisonResult, 
-    BenchmarkResult, ImplementationCapabilities
+    BenchmarkResult, ImplementationCapabilities, MetricsSink
 )
 from harness.plugins.discovery import ImplementationDiscovery
 
@@ -100,6 +100,29 @@ class TestSwhidTestResult:
         assert result.timestamp is not None
 
 
+class TestMetricsSink:
+    """Test MetricsSink aggregation."""
+    
+    def test_to_metrics(self):
+        """Test that samples are summarized as median/MAD and peak RSS."""
+        sink = MetricsSink()
+        for wall_ms, cpu_ms, rss_kb in [(1.0, 0.5, 100), (2.0, 1.5, 300), (10.0, 2.5, 200)]:
+            sink.append(wall_ms, cpu_ms, rss_kb)
+        
+        metrics = sink.to_metrics()
+        
+        assert len(sink) == 3
+        assert metrics.samples == 3
+        assert metrics.wall_ms_median == 2.0
+        assert metrics.wall_ms_mad == 1.0
+        assert metrics.cpu_ms_median == 1.5
+        assert metrics.max_rss_kb == 300
+    
+    def test_empty(self):
+        """Test that an empty sink summarizes to zero samples."""
+        assert MetricsSink().to_metrics().samples == 0
+
+
 class TestComparisonResult:
     """Test ComparisonResult dataclass."""
     
@@ -134,6 +157,14 @@ class TestSwhidImplementation:
         assert impl.is_available() is True
         assert impl.compute_swhid("/test/path") == "swh:1:cnt:test123"
     
+    def test_compute_swhid_batch_default(self):
+        """Test that the default batch calls compute_swhid per item."""
+        impl = MockImplementation()
+        
+        assert impl.compute_swhid_batch([("/a", "content"), ("/b", None)]) == [
+            "swh:1:cnt:test123", "swh:1:cnt:test123"
+        ]
+    
     def test_detect_object_type_file(self):
         """Test object type detection for files."""
         impl = MockImplementation()
@@ -173,6 +204,41 @@ class TestSwhidImplementation:
             assert result.min_duration_ms > 0
             assert result.max_duration_ms > 0
     
+    def test_benchmark_warmup_not_timed(self):
+        """Test that benchmark runs one untimed warmup call."""
+        impl = MockImplementation()
+        calls = []
+        compute = impl.compute_swhid
+        impl.compute_swhid = lambda *args, **kwargs: calls.append(args) or compute(*args, **kwargs)
+        
+        with tempfile.NamedTemporaryFile() as f:
+            f.write(b"test content")
+            f.flush()
+            
+            result = impl.benchmark(f.name, iterations=3)
+        
+        assert len(calls) == 4
+        assert result.iterations == 3
+    
+    @pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="CPU affinity not supported")
+    def test_benchmark_pin_cpu(self):
+        """Test that benchmark pins to a CPU while timing and restores affinity."""
+        impl = MockImplementation()
+        original = os.sched_getaffinity(0)
+        cpu = min(original)
+        seen = []
+        compute = impl.compute_swhid
+        impl.compute_swhid = lambda *args, **kwargs: seen.append(os.sched_getaffinity(0)) or compute(*args, **kwargs)
+        
+        with tempfile.NamedTemporaryFile() as f:
+            f.write(b"test content")
+            f.flush()
+            
+            impl.benchmark(f.name, iterations=2, pin_cpu=cpu)
+        
+        assert seen == [{cpu}] * 3
+        assert os.sched_getaffinity(0) == original
+    
     def test_benchmark_failure(self):
         """Test benchmark with failing implementation."""
         impl = MockImplementation(available=False)
@@ -279,6 +345,42 @@ class Implementation(SwhidImplementation):
             assert impl is not None
             assert impl.get_info().name == "mock"
     
+    def test_get_implementation_loads_only_matching_dir(self):
+        """Test that getting an implementation by name doesn't import the others."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            impl_dir = Path(temp_dir) / "mock"
+            impl_dir.mkdir()
+            (impl_dir / "implementation.py").write_text('''
+from harness.plugins.base import SwhidImplementation, ImplementationInfo
+
+class Implementation(SwhidImplementation):
+    def get_info(self):
+        return ImplementationInfo("mock", "1.0.0", "python")
+    
+    def is_available(self):
+        return True
+    
+    def get_capabilities(self):
+        return None
+    
+    def compute_swhid(self, payload_path, obj_type=None):
+        return "swh:1:cnt:mock123"
+''')
+            broken_dir = Path(temp_dir) / "broken"
+            broken_dir.mkdir()
+            (broken_dir / "implementation.py").write_text("raise ImportError('boom')\n")
+            
+            discovery = ImplementationDiscovery(temp_dir)
+            with patch.object(discovery, "_load_implementation",
+                              wraps=discovery._load_implementation) as load:
+                impl = discovery.get_implementation("mock")
+                assert impl.get_info().name == "mock"
+                assert discovery.get_implementation("mock") is impl
+                assert [call.args[0].name for call in load.call_args_list] == ["mock"]
+                
+                assert list(discovery.discover_implementations()) == ["mock"]
+                assert [call.args[0].name for call in load.call_args_list] == ["mock", "broken"]
+    
     def test_get_nonexistent_implementation(self):
         """Test getting nonexistent implementation."""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -330,3 +432,72 @@ class Implementation(SwhidImplementation):
         
         discovery.clear_cache()
         assert discovery._implementations_cache == {}
+
+
+class TestSubprocessAdapter:
+    """Test SubprocessAdapter worker pool."""
+    
+    def test_compute_reuses_worker(self):
+        """Test that consecutive calls are served by the same worker process."""
+        from harness.plugins.subprocess_adapter import SubprocessAdapter
+        
+        sink = MetricsSink()
+        adapter = SubprocessAdapter(MockImplementation(), timeout=30, metrics_sink=sink)
+        try:
+            with tempfile.NamedTemporaryFile() as f:
+                assert adapter.compute_swhid(f.name, "content") == "swh:1:cnt:test123"
+                pid = adapter._get_pool()._workers[0].pid
+                assert adapter.compute_swhid(f.name, "content") == "swh:1:cnt:test123"
+                assert adapter._get_pool()._workers[0].pid == pid
+            assert len(sink) == 2
+        finally:
+            adapter.close()
+    
+    def test_load_error_is_reported(self):
+        """Test that a worker reports implementations it cannot load."""
+        from harness.plugins.subprocess_adapter import SubprocessAdapter
+        
+        unloadable = type("Unloadable", (MockImplementation,), {"__module__": "tests.unit.does_not_exist"})
+        adapter = SubprocessAdapter(unloadable(), timeout=30)
+        try:
+            with pytest.raises(RuntimeError, match="LOAD_ERROR"):
+                adapter.compute_swhid(__file__, "content")
+        finally:
+            adapter.close()
+    
+    def test_compute_swhid_batch(self):
+        """Test that a batch is answered in item order by one worker request."""
+        from harness.plugins.subprocess_adapter import SubprocessAdapter
+        
+        adapter = SubprocessAdapter(MockImplementation(), timeout=30)
+        try:
+            with tempfile.NamedTemporaryFile() as f:
+                swhids = adapter.compute_swhid_batch([(f.name, "content"), (f.name, None)])
+                assert swhids == ["swh:1:cnt:test123", "swh:1:cnt:test123"]
+        finally:
+            adapter.close()
+
+
+class TestGitImplementation:
+    """Test the dulwich-based git implementation's helpers."""
+    
+    def test_read_file_short_reads(self, tmp_path):
+        """Test that a file is read whole even when each read returns less than asked."""
+        import importlib.util
+        
+        impl_file = Path(__file__).parent.parent.parent / "implementations" / "git" / "implementation.py"
+        spec = importlib.util.spec_from_file_location("git_impl", impl_file)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        
+        payload = tmp_path / "payload"
+        payload.write_bytes(b"0123456789" * 10)
+        real_read = os.read
+        
+        with patch.object(os, "read", lambda fd, n: real_read(fd, min(n, 7))):
+            assert module._read_file(str(payload)) == b"0123456789" * 10
+        assert module._read_file(str(payload)) == b"0123456789" * 10
+        
+        empty = tmp_path / "empty"
+        empty.write_bytes(b"")
+        assert module._read_file(str(empty)) == b""
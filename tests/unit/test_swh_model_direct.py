@@ -605,3 +605,28 @@ class TestSwhModelDirect:
             assert len(sha1) == 40, "SHA1 should be 40 hex characters"
             assert sha1 == commit_sha, f"Hash should match commit SHA: {sha1} != {commit_sha}"
 
+    
+    def test_content_swhid_of_symlink(self, tmp_path):
+        """Test that a symlink content is hashed as its target path, as swh.model does."""
+        import importlib.util
+        from swh.model.from_disk import Content as DiskContent
+        
+        project_root = Path(__file__).parent.parent.parent
+        spec = importlib.util.spec_from_file_location(
+            "python_impl", project_root / 'implementations' / 'python' / 'implementation.py'
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        
+        target = tmp_path / "t"
+        target.write_bytes(b"hello\n")
+        link = tmp_path / "l"
+        link.symlink_to("t")
+        
+        # The content of a symlink is its target path, not the target's data
+        expected = str(DiskContent.from_file(path=os.fsencode(link), max_content_length=None).swhid())
+        assert expected == "swh:1:cnt:" + hashutil.hash_to_hex(hashutil.hash_git_data(b"t", 'blob'))
+        assert module.Implementation._compute_content_swhid(str(link)) == expected
+        assert module.Implementation._compute_content_swhid(str(target)) == \
+            "swh:1:cnt:ce013625030ba8dba906f756967f9e9ca394464a"
+
@@ -2,10 +2,14 @@
 """Unit tests for variant registry system in view_results.py"""
 
 import unittest
+from unittest.mock import patch
 from scripts.view_results import (
     VariantRegistry,
+    bucket_results_by_variant,
+    compute_buckets_and_stats,
     detect_variants_in_results,
     filter_results_by_variant,
+    load_results,
 )
 
 
@@ -53,6 +57,16 @@ class TestVariantRegistry(unittest.TestCase):
             variant = self.registry.get_variant_for_swhid(invalid)
             self.assertIsNone(variant, f"Expected None for '{invalid}'")
     
+    def test_variant_detection_cached_per_swhid(self):
+        """Test that repeated SWHIDs are only parsed once."""
+        swhid = 'swh:1:cnt:e69de29bb2d1d6434b8b29ae775ad8c2e48c5391'
+        with patch.object(self.registry, '_detect_variant',
+                          wraps=self.registry._detect_variant) as detect:
+            for _ in range(3):
+                self.assertEqual(self.registry.get_variant_for_swhid(swhid), 'v1_sha1_hex')
+                self.assertIsNone(self.registry.get_variant_for_swhid('invalid'))
+        self.assertEqual(detect.call_count, 2)
+    
     def test_register_new_variant(self):
         """Test registering a new variant."""
         self.registry.register_variant('v2_sha256_base64', {
@@ -324,6 +338,64 @@ class TestVariantDetection(unittest.TestCase):
         self.assertEqual(filtered['run']['id'], 'test-run')
         self.assertEqual(len(filtered['implementations']), 2)
 
+    
+    def test_bucket_results_matches_filter(self):
+        """Test that bucketing gives the same result as filtering each variant."""
+        variant_ids = ['v1_sha1_hex', 'v2_sha256_hex']
+        buckets = bucket_results_by_variant(self.sample_results, variant_ids, self.registry)
+        
+        self.assertEqual(list(buckets), variant_ids)
+        for variant_id in variant_ids:
+            self.assertEqual(
+                buckets[variant_id],
+                filter_results_by_variant(self.sample_results, variant_id, self.registry)
+            )
+    
+    def test_compute_buckets_and_stats_counts_statuses(self):
+        """Test that status counts are collected while bucketing."""
+        self.sample_results['tests'][0]['results'][0]['status'] = 'FAIL'
+        buckets, status_counts = compute_buckets_and_stats(
+            self.sample_results, ['v1_sha1_hex', 'v2_sha256_hex'], self.registry
+        )
+        
+        self.assertEqual(buckets, bucket_results_by_variant(
+            self.sample_results, ['v1_sha1_hex', 'v2_sha256_hex'], self.registry
+        ))
+        self.assertEqual(dict(status_counts['v1_sha1_hex']), {'FAIL': 1})
+        self.assertEqual(dict(status_counts['v2_sha256_hex']), {'PASS': 1})
+
+
+class TestLoadResults(unittest.TestCase):
+    """Test reading results files."""
+    
+    def test_ndjson_matches_json(self):
+        """Test that an NDJSON results file loads into the JSON results layout."""
+        import json
+        import tempfile
+        from pathlib import Path
+        
+        results_data = {
+            'run': {'id': 'run1', 'branch': 'main'},
+            'implementations': [{'id': 'python'}, {'id': 'rust'}],
+            'tests': [
+                {'id': 'hello.txt', 'category': 'content', 'expected': {}, 'results': []},
+                {'id': 'empty', 'category': 'directory', 'expected': {}, 'results': []},
+            ],
+            'aggregates': {'by_implementation': {}},
+        }
+        records = [{'type': 'run_info', **results_data['run']}]
+        records += [{'type': 'implementation', **impl} for impl in results_data['implementations']]
+        records += [{'type': 'test_case', **test} for test in results_data['tests']]
+        records.append({'type': 'aggregates', **results_data['aggregates']})
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = Path(tmp) / 'results.json'
+            json_path.write_text(json.dumps(results_data))
+            ndjson_path = Path(tmp) / 'results.ndjson'
+            ndjson_path.write_text(''.join(json.dumps(r) + '\n' for r in records))
+            
+            self.assertEqual(load_results(ndjson_path), results_data)
+            self.assertEqual(load_results(json_path), results_data)
 
 if __name__ == '__main__':
     unittest.main()